@@ -0,0 +1,59 @@
+import json
+from typing import Any, AsyncIterator, Callable, Dict
+
+from fastapi.responses import StreamingResponse
+
+# Events emitted by the streaming endpoints:
+#   node   -> {"node": <name>}                    a graph node finished
+#   token  -> {"node": <name>, "delta": <text>}   token delta from a drafting node
+#   result -> same body as the matching JSON endpoint
+#   error  -> {"message": <text>}
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_graph_events(app, state: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a compiled LangGraph app and yield `node` / `token` events, finishing
+    with a `final` event carrying the last state values.
+    """
+    final_state: Dict[str, Any] = {}
+    async for mode, chunk in app.astream(state, stream_mode=["updates", "custom", "values"]):
+        if mode == "custom":
+            yield {"event": "token", "data": chunk}
+        elif mode == "updates":
+            for node in chunk:
+                yield {"event": "node", "data": {"node": node}}
+        else:
+            final_state = chunk
+    yield {"event": "final", "data": final_state}
+
+
+def sse_response(
+    events: AsyncIterator[Dict[str, Any]],
+    build_result: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> StreamingResponse:
+    """
+    Wrap agent events into an SSE response. The agent's `final` event is turned
+    into a `result` event by `build_result`; failures become an `error` event.
+    """
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for item in events:
+                if item["event"] == "final":
+                    yield format_sse("result", build_result(item["data"]))
+                else:
+                    yield format_sse(item["event"], item["data"])
+        except Exception as exc:
+            print(f"Error while streaming: {exc}")
+            yield format_sse("error", {"message": str(exc)})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,81 @@
+# test_agent_compile.py
+# Micro-benchmark: per-request overhead of compiling the graph vs reusing the compiled runnable.
+import asyncio
+import time
+
+import pytest
+
+from blog import blog_workflow_model
+from blog.agent_blog_workflow import BlogWorkflowAgent
+from news import news_workflow_model
+from news.agent_news_workflow import NewsArticleWorkflowAgent
+from youtube import youtube_script_model
+from youtube.agent_youtube_script import YoutubeScriptAgent
+
+REQUESTS = 30
+
+
+class StubSearch:
+    async def ainvoke(self, query):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def stub_llm(monkeypatch):
+    """Replace every LLM / search call with an instant stub so only graph overhead is measured."""
+
+    async def instant(prompt, *args, **kwargs):
+        return "APPROVED"
+
+    async def approve(prompt, *args, **kwargs):
+        return '{"verdict": "APPROVED", "severity": 0, "issues": []}'
+
+    for module in (blog_workflow_model, news_workflow_model, youtube_script_model):
+        monkeypatch.setattr(module, "agenerate", instant)
+        monkeypatch.setattr(module, "agenerate_research", instant)
+        monkeypatch.setattr(module, "agenerate_stream", instant)
+        monkeypatch.setattr(module, "agenerate_review", approve)
+    monkeypatch.setattr(news_workflow_model, "search_tool", StubSearch())
+
+
+def _blog_input():
+    return {"brand_name": "Acme", "prompt": "AI", "modalities": {"linkedin": 100}}
+
+
+@pytest.mark.parametrize(
+    "agent_cls",
+    [BlogWorkflowAgent, NewsArticleWorkflowAgent, YoutubeScriptAgent],
+)
+def test_compiled_app_is_reused(agent_cls):
+    agent = agent_cls()
+    app = agent.compile()
+
+    result = asyncio.run(agent.ainvoke(_blog_input()))
+
+    assert result["status"] == "success"
+    assert agent.app is app
+
+
+def test_per_request_overhead_drops():
+    agent = BlogWorkflowAgent()
+    agent.compile()
+    state = blog_workflow_model.BlogState(**_blog_input())
+
+    async def compile_each_time():
+        for _ in range(REQUESTS):
+            await blog_workflow_model.build_blog_graph().compile().ainvoke(state)
+
+    async def compiled_once():
+        for _ in range(REQUESTS):
+            await agent.app.ainvoke(state)
+
+    started = time.perf_counter()
+    asyncio.run(compile_each_time())
+    before = (time.perf_counter() - started) / REQUESTS
+
+    started = time.perf_counter()
+    asyncio.run(compiled_once())
+    after = (time.perf_counter() - started) / REQUESTS
+
+    print(f"\nper-request: compile each time {before * 1000:.2f}ms, compiled once {after * 1000:.2f}ms")
+    assert after < before
@@ -0,0 +1,73 @@
+# test_async_concurrency.py
+# /ping must stay responsive while 50 generations are in flight on one event loop.
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from llm import gateway
+from main import app
+from news import news_workflow_model
+
+LLM_DELAY = 0.2
+IN_FLIGHT = 50
+
+REQUESTS = [
+    ("/generate-blog", {"brandVoice": "Acme", "prompt": "AI", "modalities": ["linkedin"]}),
+    ("/generate-news-article", {"prompt": "AI regulation", "articleWordCount": 300}),
+    ("/generate-youtube-script", {"prompt": "AI agents in 60 seconds"}),
+]
+
+
+class StubSearch:
+    async def ainvoke(self, query):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def slow_llm(monkeypatch):
+    """Every LLM call takes LLM_DELAY seconds without blocking the loop."""
+
+    async def achat(messages, **kwargs):
+        await asyncio.sleep(LLM_DELAY)
+        if kwargs.get("response_format"):  # JSON-mode reviewers
+            return '{"verdict": "APPROVED", "severity": 0, "issues": []}'
+        return "APPROVED"
+
+    async def astream_chat(messages, **kwargs):
+        yield await achat(messages, **kwargs)
+
+    monkeypatch.setattr(gateway, "achat", achat)
+    monkeypatch.setattr(gateway, "astream_chat", astream_chat)
+    monkeypatch.setattr(news_workflow_model, "search_tool", StubSearch())
+
+
+def test_ping_stays_responsive_during_generations():
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            tasks = [
+                asyncio.create_task(client.post(path, json=payload))
+                for path, payload in (REQUESTS[i % len(REQUESTS)] for i in range(IN_FLIGHT))
+            ]
+            await asyncio.sleep(LLM_DELAY / 4)
+
+            started = time.perf_counter()
+            ping = await client.get("/ping")
+            ping_latency = time.perf_counter() - started
+            in_flight = sum(not task.done() for task in tasks)
+
+            responses = await asyncio.gather(*tasks)
+            return ping, ping_latency, in_flight, responses
+
+    started = time.perf_counter()
+    ping, ping_latency, in_flight, responses = asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    assert ping.json() == {"message": "pong"}
+    assert in_flight == IN_FLIGHT
+    assert ping_latency < LLM_DELAY
+    assert all(response.status_code == 200 for response in responses)
+    # Serial execution would need at least IN_FLIGHT * 4 * LLM_DELAY seconds.
+    assert elapsed < IN_FLIGHT * LLM_DELAY
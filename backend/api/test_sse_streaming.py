@@ -0,0 +1,107 @@
+# test_sse_streaming.py
+# Streaming endpoints emit node / token / result events; JSON endpoints are unchanged.
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from llm import gateway
+from main import app
+from news import news_workflow_model
+from youtubeBlog import agent as youtube_blog_agent
+
+TOKENS = ["Hello", " streaming", " world"]
+
+
+class StubSearch:
+    async def ainvoke(self, query):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def stub_llm(monkeypatch):
+    async def achat(messages, **kwargs):
+        if kwargs.get("response_format"):  # JSON-mode reviewers
+            return '{"verdict": "APPROVED", "severity": 0, "issues": []}'
+        return "APPROVED"
+
+    async def astream_chat(messages, **kwargs):
+        for token in TOKENS:
+            yield token
+
+    monkeypatch.setattr(gateway, "achat", achat)
+    monkeypatch.setattr(gateway, "astream_chat", astream_chat)
+    monkeypatch.setattr(news_workflow_model, "search_tool", StubSearch())
+
+
+def _post(path, payload):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=payload)
+
+    return asyncio.run(send())
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+@pytest.mark.parametrize(
+    "path, payload, drafting_node, result_key",
+    [
+        ("/generate-blog", {"brandVoice": "Acme", "prompt": "AI", "modalities": ["linkedin"]}, "draft_blog", "generated_blog"),
+        ("/generate-news-article", {"prompt": "AI regulation"}, "draft_article", "generated_article"),
+        ("/generate-youtube-script", {"prompt": "AI agents"}, "generate_script", "generated_script"),
+    ],
+)
+def test_stream_emits_nodes_tokens_and_result(path, payload, drafting_node, result_key):
+    response = _post(f"{path}/stream", payload)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    nodes = [data["node"] for event, data in events if event == "node"]
+    deltas = [data["delta"] for event, data in events if event == "token" and data["node"] == drafting_node]
+
+    assert drafting_node in nodes
+    assert deltas == TOKENS
+    assert events[-1][0] == "result"
+    assert events[-1][1]["status"] == "success"
+    assert result_key in events[-1][1]
+
+    plain = _post(path, payload).json()
+    assert plain.keys() == events[-1][1].keys()
+
+
+def test_youtube_blog_stream_emits_nodes_tokens_and_result(monkeypatch):
+    fetched = []
+
+    def fetch(video_url):
+        fetched.append(video_url)
+        return "dQw4w9WgXcQ", {"title": "Song"}, [{"text": "hello", "start": 0.0, "duration": 1.0}]
+
+    monkeypatch.setattr(youtube_blog_agent, "fetch_metadata_and_transcript", fetch)
+    monkeypatch.setattr(gateway, "chat", lambda messages, **kwargs: "".join(TOKENS))
+    payload = {"youtube_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "prompt": "Recap it"}
+
+    response = _post("/youtube-blog/stream", payload)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    nodes = [data["node"] for event, data in events if event == "node"]
+    deltas = [data["delta"] for event, data in events if event == "token" and data["node"] == "generate_blog"]
+
+    assert nodes == ["metadata", "transcript", "condense_transcript", "generate_blog", "generate_summary"]
+    assert deltas == TOKENS
+    assert events[-1][0] == "result"
+    assert events[-1][1]["blog_post"] == "".join(TOKENS)
+    assert events[-1][1]["metadata"] == {"title": "Song", "video_id": "dQw4w9WgXcQ"}
+    assert fetched == [payload["youtube_url"]]  # one shared metadata + transcript fetch
+
+    plain = _post("/youtube-blog", payload).json()
+    assert plain.keys() == events[-1][1].keys()
@@ -1,5 +1,6 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 from langgraph.graph import StateGraph
+from api.sse import stream_graph_events
 from .blog_workflow_model import BlogState, build_blog_graph
 
 
@@ -8,46 +9,55 @@ class BlogWorkflowAgent:
 
     def __init__(self):
         self.graph = None
+        self.app = None
 
     def compile(self):
-        """Build the LangGraph workflow."""
+        """Build and compile the LangGraph workflow once; the runnable is reused across requests."""
         self.graph = build_blog_graph()
+        self.app = self.graph.compile()
+        return self.app
+
+    def build_state(self, input_data: Dict[str, Any]) -> BlogState:
+        """🧠 Extract input fields from frontend."""
+        return BlogState(
+            brand_name=input_data.get("brand_name", ""),
+            brand_voice=input_data.get("brand_voice", ""),
+            prompt=input_data.get("prompt", ""),
+            tone=input_data.get("tone", ""),
+            audience=input_data.get("audience", ""),
+            modalities=input_data.get("modalities", {}),
+        )
+
+    def format_result(self, state: BlogState, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Shape the final graph state for the frontend."""
+        formatted_output = ""
+        if "social_assets" in result and result["social_assets"]:
+            for modality in state.modalities.keys():  # Only include selected modalities
+                content = result["social_assets"].get(modality, "")
+                print(f"Modality: {modality}, Content: {repr(content)}")
+                formatted_output += f"### {modality}\n{content}\n\n"
+
+            return {
+                "status": "success",
+                "data": {
+                "formatted_blog": formatted_output.strip(),  # ready for frontend
+                "raw_result": result  # optional: full workflow output
+                }
+            }
+        return None
 
     async def ainvoke(self, input_data: Dict[str, Any], thread_id: str = None):
         print("=== ainvoke received input_data ===")
         print(input_data)
 
-        """Run the workflow asynchronously (currently synchronous execution)."""
+        """Run the workflow asynchronously on the async LLM client."""
         try:
-            # 🧠 Extract input fields from frontend
-            state = BlogState(
-                brand_name=input_data.get("brand_name", ""),
-                brand_voice=input_data.get("brand_voice", ""),
-                prompt=input_data.get("prompt", ""),
-                tone=input_data.get("tone", ""),
-                audience=input_data.get("audience", ""),
-                modalities=input_data.get("modalities", {}),
-            )
+            state = self.build_state(input_data)
 
             # ⚙️ Run the LangGraph workflow
-            graph = self.graph or build_blog_graph()
-            app = graph.compile()
-            result = app.invoke(state)
-
-            formatted_output = ""
-            if "social_assets" in result and result["social_assets"]:
-                for modality in state.modalities.keys():  # Only include selected modalities
-                    content = result["social_assets"].get(modality, "")
-                    print(f"Modality: {modality}, Content: {repr(content)}")
-                    formatted_output += f"### {modality}\n{content}\n\n"
-
-                return {
-                    "status": "success",
-                    "data": {
-                    "formatted_blog": formatted_output.strip(),  # ready for frontend
-                    "raw_result": result  # optional: full workflow output
-                    }
-                }
+            app = self.app or self.compile()
+            result = await app.ainvoke(state)
+            return self.format_result(state, result)
 
         except Exception as e:
             print(f"Error in BlogWorkflowAgent: {e}")
@@ -55,3 +65,12 @@ class BlogWorkflowAgent:
                 "status": "error",
                 "message": str(e)
             }
+
+    async def astream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run the workflow yielding node / token events, then a `final` event with the formatted result."""
+        state = self.build_state(input_data)
+        app = self.app or self.compile()
+        async for item in stream_graph_events(app, state):
+            if item["event"] == "final":
+                item = {"event": "final", "data": self.format_result(state, item["data"]) or {}}
+            yield item
@@ -1,40 +1,62 @@
-from typing import Dict, Any
+import asyncio
+import json
+import os
+from typing import Dict, Any, List
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel, Field
-from groq import Groq
-from dotenv import load_dotenv
-
-load_dotenv()
+from editing import (
+    ReviewVerdict,
+    areview,
+    format_review,
+    number_sections,
+    review_json_instructions,
+    revise_sections,
+    section_max_tokens,
+    split_sections,
+)
+from llm import (
+    FAST_MODEL,
+    PRIMARY_MODEL,
+    agenerate,
+    agenerate_research,
+    agenerate_review,
+    agenerate_stream,
+    gateway,
+)
+from .brand_profile_store import brand_profiles
+
+# Max social posts generated at once per request
+SOCIAL_ASSET_CONCURRENCY = int(os.environ.get("BLOG_SOCIAL_ASSET_CONCURRENCY", "6"))
 
 # -------------------------------
-# Initialize Groq client
+# LLM helpers (shared pooled gateway)
 # -------------------------------
-client = Groq()  # Uses GROQ_API_KEY from environment
-research_client = Groq()  # Smaller agent for research (llama-3.1-8b-instant)
-
-def generate(prompt: str, max_tokens=512, temperature=0.7) -> str:
+def generate(prompt: str, max_tokens=512, temperature=0.7, cache=False) -> str:
     """Use Groq API to generate text from prompt."""
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+    return gateway.complete(
+        prompt, model=PRIMARY_MODEL, max_tokens=max_tokens, temperature=temperature, cache=cache
     )
-    return completion.choices[0].message.content.strip()
 
 def generate_research(prompt: str, max_tokens=512, temperature=0.7) -> str:
     """Secondary agent for topic research."""
-    completion = research_client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
+    return gateway.complete(
+        prompt, model=FAST_MODEL, max_tokens=max_tokens, temperature=temperature, cache=True
+    )
+
+async def agenerate_json(prompt: str, max_tokens=1024, temperature=0.7) -> Dict:
+    """Main model with JSON mode for structured output."""
+    content = await gateway.acomplete(
+        prompt,
+        model=PRIMARY_MODEL,
+        max_tokens=max_tokens,
         temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+        response_format={"type": "json_object"},
     )
-    return completion.choices[0].message.content.strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        print("Error: Failed to decode JSON from model response.")
+        return {}
 
 # -------------------------------
 # State Schema
@@ -53,6 +75,7 @@ class BlogState(BaseModel):
     research_notes: str | None = None
     blog_draft: str | None = None
     compliance_report: str | None = None
+    review: ReviewVerdict | None = None  # Typed verdict of the compliance review; drives revision
     revision_notes: str | None = None
     social_assets: Dict[str, str] | None = None
     revision_count: int = 0
@@ -62,12 +85,12 @@ class BlogState(BaseModel):
 # Nodes
 # -------------------------------
 
-def brand_context_research(state: BlogState) -> Dict[str, Any]:
-    """Step 1: Research brand history and tone context."""
+async def research_brand(brand_name: str) -> str:
+    """Ask the main model for a brand profile."""
     prompt = f"""
 You are a Brand Analyst.
 
-Research and summarize the brand **{state.brand_name}**.
+Research and summarize the brand **{brand_name}**.
 
 Return sections:
 - Brand Voice Summary
@@ -76,10 +99,37 @@ Return sections:
 - Tone & Audience Insights
 - Alignment Recommendations
 """
-    return {"brand_history": generate(prompt, 512)}
+    # Not cached by the gateway: `brand_profiles` is the memo layer, and must be able to invalidate it
+    return await agenerate(prompt, 512)
+
+
+async def brand_context_research(state: BlogState) -> Dict[str, Any]:
+    """Step 1 (parallel): Research brand history and tone context (memoized per brand)."""
+    cached = brand_profiles.get(state.brand_name, state.brand_voice)
+    if cached is not None:
+        return {"brand_history": cached}
 
+    profile = await research_brand(state.brand_name)
+    brand_profiles.set(state.brand_name, state.brand_voice, profile)
+    return {"brand_history": profile}
 
-def topic_research(state: BlogState) -> Dict[str, Any]:
+
+async def warm_up_brand_profiles(brands: List[Dict[str, str]]) -> int:
+    """Pre-compute profiles for known brands ({"brand_name", "brand_voice"}); returns how many were researched."""
+    missing = [
+        brand for brand in brands
+        if brand_profiles.get(brand.get("brand_name", ""), brand.get("brand_voice", "")) is None
+    ]
+    profiles = await asyncio.gather(
+        *(research_brand(brand.get("brand_name", "")) for brand in missing)
+    )
+    for brand, profile in zip(missing, profiles):
+        brand_profiles.set(brand.get("brand_name", ""), brand.get("brand_voice", ""), profile)
+    return len(missing)
+
+
+async def topic_research(state: BlogState) -> Dict[str, Any]:
+    """Step 2 (parallel): Gather findings for the topic with the fast model."""
     prompt = f"""
 You are a Research Strategist.
 
@@ -88,10 +138,10 @@ List 3–4 credible findings, trends, or statistics related to the topic:
 
 Each item should include a short source-style attribution.
 """
-    return {"research_notes": generate_research(prompt, 512)}
+    return {"research_notes": await agenerate_research(prompt, 512)}
 
 
-def draft_blog(state: BlogState) -> Dict[str, Any]:
+async def draft_blog(state: BlogState) -> Dict[str, Any]:
     """Step 3: Generate the main blog draft aligned with brand voice and history."""
     medium_word_count = state.modalities.get("medium", 600)
 
@@ -119,11 +169,12 @@ Guidelines:
 - Use Markdown formatting with headings.
 - Structure: Introduction, 3 core sections, and a conclusion.
 """
-    return {"blog_draft": generate(prompt, 1024)}
+    return {"blog_draft": await agenerate_stream(prompt, "draft_blog", 1024)}
 
 
-def compliance_review(state: BlogState) -> Dict[str, Any]:
+async def compliance_review(state: BlogState) -> Dict[str, Any]:
     """Step 4: Check compliance for tone, factual accuracy, and brand alignment."""
+    sections = split_sections(state.blog_draft or "")
     prompt = f"""
 You are the Brand Compliance Reviewer.
 
@@ -133,22 +184,57 @@ Check the following blog for:
 - Ethical and factual soundness
 - Readability for {state.audience}
 
-Blog:
-{state.blog_draft}
+Blog (split into numbered sections):
+{number_sections(sections)}
 
-Return a report (in plain English) that includes:
-- Verdict: APPROVED or REVISION_NEEDED
-- Key observations
-- If revisions needed, list what to improve
+{review_json_instructions()}
 """
-    return {"compliance_report": generate(prompt, 512)}
+    review = await areview(agenerate_review, prompt, len(sections))
+    return {"compliance_report": format_review(review), "review": review}
 
 
-def revision_step(state: BlogState) -> Dict[str, Any]:
-    """Step 5: Revise the blog if compliance suggests improvement."""
-    if not state.compliance_report or "APPROVED" in state.compliance_report.upper():
+async def revision_step(state: BlogState) -> Dict[str, Any]:
+    """
+    Step 5: Revise the blog if compliance suggests improvement.
+    Section-addressed issues rewrite just those sections; anything broader
+    falls back to one full rewrite.
+    """
+    if not (state.review and state.review.needs_revision()):
         return {"revision_notes": "No revision required."}
 
+    async def rewrite_section(section: str, issues: List[str]) -> str:
+        notes = "\n".join(f"- {issue}" for issue in issues)
+        prompt = f"""
+You are an Editor revising one section of a blog based on compliance feedback.
+
+Brand: {state.brand_name}
+Brand Voice:
+{state.brand_voice}
+
+Section to revise:
+{section}
+
+Compliance Feedback for this section:
+{notes}
+
+Task:
+Rewrite ONLY this section to address the feedback while preserving the brand voice,
+its heading (if any) and roughly its length. Return only the revised section in Markdown, with no commentary.
+"""
+        return await agenerate(prompt, section_max_tokens(section))
+
+    targeted = await revise_sections(state.blog_draft or "", state.review.issues, rewrite_section)
+    if targeted is not None:
+        revised_blog, revised = targeted
+        changes = "\n".join(
+            f"- Section {issue.section}: {issue.issue}" for issue in state.review.issues
+        )
+        return {
+            "revision_notes": f"Revised sections {', '.join(map(str, revised))} only:\n{changes}",
+            "revision_count": state.revision_count + 1,
+            "blog_draft": revised_blog,
+        }
+
     prompt = f"""
 You are an Editor revising a blog based on compliance feedback.
 
@@ -160,21 +246,35 @@ Compliance Feedback:
 
 Task:
 Revise the blog to address the feedback while preserving the brand voice.
+
+Return a JSON object with two string keys:
+- "revised_blog": the full revised blog in Markdown
+- "revision_notes": a short bulleted summary of what you changed and why
 """
+    # One call returns both the revised draft and the notes.
+    revision = await agenerate_json(prompt, 1536)
+    revised_blog = revision.get("revised_blog")
+    if not isinstance(revised_blog, str) or not revised_blog.strip():
+        return {
+            "revision_notes": "Revision failed: model returned no draft.",
+            "revision_count": state.revision_count + 1,
+        }
+
     return {
-        "revision_notes": generate(prompt, 512),
+        "revision_notes": str(revision.get("revision_notes") or "Revised based on compliance."),
         "revision_count": state.revision_count + 1,
-        "blog_draft": generate(prompt, 1024)
+        "blog_draft": revised_blog.strip(),
     }
 
 
-def repurpose_social_assets(state: BlogState) -> Dict[str, Any]:
-    """Generate social media versions per selected modality."""
+async def repurpose_social_assets(state: BlogState) -> Dict[str, Any]:
+    """Generate social media versions per selected modality, concurrently (bounded)."""
     if not state.modalities:
         return {"social_assets": {}}
 
-    assets = {}
-    for platform, word_count in state.modalities.items():
+    semaphore = asyncio.Semaphore(max(1, SOCIAL_ASSET_CONCURRENCY))
+
+    async def generate_for(platform: str, word_count: int) -> str:
         prompt = f"""
 You are a Social Media Strategist.
 
@@ -186,9 +286,15 @@ Create a post for **{platform}** (~{word_count} words) that:
 - Is consistent with the brand's values and history
 - Feels native to that platform
 """
-        generated_text = generate(prompt, 512)
-        # Key is modality name, value is generated text
-        assets[platform] = generated_text
+        async with semaphore:
+            return await agenerate(prompt, 512)
+
+    platforms = list(state.modalities.items())
+    generated = await asyncio.gather(
+        *(generate_for(platform, word_count) for platform, word_count in platforms)
+    )
+    # Key is modality name, value is generated text (selection order preserved)
+    assets = {platform: text for (platform, _), text in zip(platforms, generated)}
 
     # Optional: format as a single string to display in frontend
     formatted_output = "\n\n".join(
@@ -218,9 +324,11 @@ def build_blog_graph() -> StateGraph:
     graph.add_node("repurpose_social_assets", repurpose_social_assets)
     graph.add_node("finalize_package", finalize_package)
 
+    # Brand and topic research are independent: fan out from START and
+    # join before drafting so only the slower of the two is on the critical path.
     graph.add_edge(START, "brand_context_research")
-    graph.add_edge("brand_context_research", "topic_research")
-    graph.add_edge("topic_research", "draft_blog")
+    graph.add_edge(START, "topic_research")
+    graph.add_edge(["brand_context_research", "topic_research"], "draft_blog")
     graph.add_edge("draft_blog", "compliance_review")
     graph.add_edge("compliance_review", "revision_step")
     graph.add_edge("revision_step", "repurpose_social_assets")
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Brand research is essentially static, so profiles live for a day by default
+BRAND_PROFILE_TTL = float(os.environ.get("BLOG_BRAND_PROFILE_TTL", "86400"))
+BRAND_PROFILE_MAX_ENTRIES = int(os.environ.get("BLOG_BRAND_PROFILE_MAX_ENTRIES", "1024"))
+
+
+def normalize(text: str) -> str:
+    """Case- and whitespace-insensitive form used for keys."""
+    return " ".join((text or "").lower().split())
+
+
+class BrandProfileStore:
+    """
+    In-memory LRU of `brand_context_research` output keyed by brand name +
+    brand voice; at most `max_entries` profiles are kept.
+    """
+
+    def __init__(self, ttl: float = BRAND_PROFILE_TTL, max_entries: int = BRAND_PROFILE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(brand_name: str, brand_voice: str = "") -> Tuple[str, str]:
+        voice_digest = hashlib.sha1(normalize(brand_voice).encode("utf-8")).hexdigest()
+        return normalize(brand_name), voice_digest
+
+    def get(self, brand_name: str, brand_voice: str = "") -> Optional[str]:
+        key = self.key(brand_name, brand_voice)
+        with self._lock:
+            entry = self._profiles.get(key)
+            if entry and time.time() - entry[0] <= self.ttl:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._profiles[key]
+            self.misses += 1
+            return None
+
+    def set(self, brand_name: str, brand_voice: str, profile: str) -> None:
+        key = self.key(brand_name, brand_voice)
+        with self._lock:
+            self._profiles[key] = (time.time(), profile)
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, brand_name: str, brand_voice: Optional[str] = None) -> int:
+        """Drop one profile, or every voice variant of the brand when `brand_voice` is None."""
+        with self._lock:
+            if brand_voice is not None:
+                return 1 if self._profiles.pop(self.key(brand_name, brand_voice), None) else 0
+            name = normalize(brand_name)
+            stale = [key for key in self._profiles if key[0] == name]
+            for key in stale:
+                del self._profiles[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "profiles": len(self._profiles),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global instance shared by the blog workflow and router
+brand_profiles = BrandProfileStore()
@@ -1,10 +1,16 @@
 import uuid
 
+from typing import List, Optional
+
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from api.sse import sse_response
+from jobs import job_queue
+
 from .agent_blog_workflow import BlogWorkflowAgent
-from .blog_workflow_model import generate
+from .blog_workflow_model import generate, warm_up_brand_profiles
+from .brand_profile_store import brand_profiles
 
 # -------------------------------
 # Normalize frontend input
@@ -52,33 +58,77 @@ class ImagePromptRequest(BaseModel):
     audience: str = ""
 
 
+class KnownBrand(BaseModel):
+    brand_name: str
+    brand_voice: str = ""
+
+
+class BrandWarmUpRequest(BaseModel):
+    brands: List[KnownBrand]
+
+
+async def prepare_request(request: Request) -> tuple:
+    """Read the frontend JSON, mint a threadId and normalize it."""
+    payload = await request.json()
+    print("Received payload:", payload)  # Debug log
+
+    thread_id = str(uuid.uuid4())
+    payload["threadId"] = thread_id
+
+    normalized_payload = normalize_input(payload)
+    normalized_payload["threadId"] = payload["threadId"]
+    print("Normalized payload:", normalized_payload)  # Debug log
+    return thread_id, normalized_payload
+
+
+def build_response(thread_id: str, result: dict, normalized_payload: dict) -> dict:
+    return {
+        "status": "success",
+        "threadId": thread_id,
+        "generated_blog": result.get("data", {}).get(
+            "formatted_blog", "No draft generated"
+        ),
+        "received_data": normalized_payload,
+    }
+
+
 @router.post("/generate-blog")
 async def generate_blog(request: Request):
     """Receives frontend JSON, normalizes it, and runs the blog workflow."""
     try:
-        payload = await request.json()
-        print("Received payload:", payload)  # Debug log
+        thread_id, normalized_payload = await prepare_request(request)
+        result = await agent.ainvoke(normalized_payload)
+        return build_response(thread_id, result, normalized_payload)
 
-        thread_id = str(uuid.uuid4())
-        payload["threadId"] = thread_id
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        normalized_payload = normalize_input(payload)
-        normalized_payload["threadId"] = payload["threadId"]
-        print("Normalized payload:", normalized_payload)  # Debug log
 
-        result = await agent.ainvoke(normalized_payload)
+async def run_blog_job(payload: dict, thread_id: str) -> dict:
+    """Background-job runner for the blog workflow (see jobs.router)."""
+    normalized_payload = normalize_input(payload)
+    normalized_payload["threadId"] = thread_id
+    result = await agent.ainvoke(normalized_payload)
+    if not result or result.get("status") == "error":
+        raise RuntimeError((result or {}).get("message", "Blog workflow produced no output"))
+    return build_response(thread_id, result, normalized_payload)
+
 
-        return {
-            "status": "success",
-            "threadId": thread_id,
-            "generated_blog": result.get("data", {}).get(
-                "formatted_blog", "No draft generated"
-            ),
-            "received_data": normalized_payload,
-        }
+job_queue.register("blog", run_blog_job)
 
+
+@router.post("/generate-blog/stream")
+async def generate_blog_stream(request: Request):
+    """Same workflow as /generate-blog, streamed as Server-Sent Events (node, token, result)."""
+    try:
+        thread_id, normalized_payload = await prepare_request(request)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return sse_response(
+        agent.astream(normalized_payload),
+        lambda result: build_response(thread_id, result, normalized_payload),
+    )
 
 
 @router.post("/image-prompt")
@@ -103,7 +153,25 @@ def craft_image_prompt(payload: ImagePromptRequest):
         Write a single paragraph prompt describing the imagery, camera details, mood, lighting, and colors.
         Do not exceed 120 words. Avoid mentioning 'prompt' or referencing the instructions.
     """
-        prompt_text = generate(template, max_tokens=256, temperature=0.6)
+        # Same draft and brief, same image prompt: reuse it instead of paying for another call
+        prompt_text = generate(template, max_tokens=256, temperature=0.6, cache=True)
         return {"image_prompt": prompt_text.strip()}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.post("/brand-profiles/warm-up")
+async def warm_up_brands(payload: BrandWarmUpRequest):
+    """Research and store profiles for known brands ahead of blog requests."""
+    try:
+        researched = await warm_up_brand_profiles([brand.model_dump() for brand in payload.brands])
+        return {"status": "success", "researched": researched, **brand_profiles.stats()}
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.delete("/brand-profiles/{brand_name}")
+def invalidate_brand(brand_name: str, brand_voice: Optional[str] = None):
+    """Drop a stored brand profile (all voice variants unless `brand_voice` is given)."""
+    removed = brand_profiles.invalidate(brand_name, brand_voice)
+    return {"status": "success", "removed": removed}
@@ -0,0 +1,212 @@
+# test_blog_graph.py
+# Timed-stub tests for the blog workflow graph (no network calls).
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from blog import blog_workflow_model
+from blog.blog_workflow_model import BlogState, build_blog_graph
+from blog.brand_profile_store import BrandProfileStore, brand_profiles
+from editing import ReviewIssue, ReviewVerdict
+from llm import CompletionCache, gateway
+
+RESEARCH_DELAY = 0.3
+STEP_DELAY = 0.05
+
+
+@pytest.fixture(autouse=True)
+def empty_brand_profiles():
+    brand_profiles.clear()
+    yield
+    brand_profiles.clear()
+
+
+@pytest.fixture
+def timed_llm(monkeypatch):
+    """Stub both LLM helpers; research prompts are slow, the rest are quick."""
+    calls = []
+
+    async def stub(prompt, max_tokens=512, temperature=0.7, **kwargs):
+        started = time.perf_counter()
+        research = "Brand Analyst" in prompt or "Research Strategist" in prompt
+        await asyncio.sleep(RESEARCH_DELAY if research else STEP_DELAY)
+        calls.append((prompt, started, time.perf_counter()))
+        return "APPROVED"
+
+    async def stream_stub(prompt, node, max_tokens=512, temperature=0.7):
+        return await stub(prompt, max_tokens, temperature)
+
+    async def review_stub(prompt, *args, **kwargs):
+        await stub(prompt, *args, **kwargs)
+        return '{"verdict": "APPROVED", "severity": 0, "issues": []}'
+
+    monkeypatch.setattr(blog_workflow_model, "agenerate", stub)
+    monkeypatch.setattr(blog_workflow_model, "agenerate_research", stub)
+    monkeypatch.setattr(blog_workflow_model, "agenerate_review", review_stub)
+    monkeypatch.setattr(blog_workflow_model, "agenerate_stream", stream_stub)
+    return calls
+
+
+def _run(state: BlogState) -> tuple:
+    app = build_blog_graph().compile()
+    started = time.perf_counter()
+    result = asyncio.run(app.ainvoke(state))
+    return result, time.perf_counter() - started
+
+
+def test_brand_and_topic_research_run_in_parallel(timed_llm):
+    state = BlogState(brand_name="Acme", prompt="AI in healthcare", modalities={})
+
+    result, elapsed = _run(state)
+
+    brand = next(c for c in timed_llm if "Brand Analyst" in c[0])
+    topic = next(c for c in timed_llm if "Research Strategist" in c[0])
+    assert brand[1] < topic[2] and topic[1] < brand[2]  # call windows overlap
+
+    sequential_critical_path = 2 * RESEARCH_DELAY + 2 * STEP_DELAY
+    print(f"\ncritical path: sequential >= {sequential_critical_path:.2f}s, parallel {elapsed:.2f}s")
+    assert elapsed < sequential_critical_path - RESEARCH_DELAY / 2
+    assert result["brand_history"] and result["research_notes"]
+
+
+def test_social_assets_scale_with_slowest_platform(timed_llm):
+    modalities = {"medium": 600, "linkedin": 200, "twitter": 100, "facebook": 150, "threads": 150, "instagram": 100}
+    state = BlogState(blog_draft="# Draft", modalities=modalities)
+
+    started = time.perf_counter()
+    result = asyncio.run(blog_workflow_model.repurpose_social_assets(state))
+    elapsed = time.perf_counter() - started
+
+    assert list(result["social_assets"]) == list(modalities)
+    assert elapsed < 2 * STEP_DELAY  # sequential would be 6 * STEP_DELAY
+
+
+def test_social_assets_respect_concurrency_limit(monkeypatch):
+    active = peak = 0
+
+    async def stub(prompt, max_tokens=512, temperature=0.7):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(STEP_DELAY)
+        active -= 1
+        return "post"
+
+    monkeypatch.setattr(blog_workflow_model, "agenerate", stub)
+    monkeypatch.setattr(blog_workflow_model, "SOCIAL_ASSET_CONCURRENCY", 2)
+    state = BlogState(blog_draft="# Draft", modalities={f"p{i}": 100 for i in range(6)})
+
+    asyncio.run(blog_workflow_model.repurpose_social_assets(state))
+
+    assert peak == 2
+
+
+def test_revision_step_makes_a_single_llm_call(monkeypatch):
+    calls = []
+
+    async def text_stub(prompt, *args, **kwargs):
+        calls.append(prompt)
+        return "unused"
+
+    async def json_stub(prompt, *args, **kwargs):
+        calls.append(prompt)
+        return {"revised_blog": "# Revised", "revision_notes": "- tightened intro"}
+
+    monkeypatch.setattr(blog_workflow_model, "agenerate", text_stub)
+    monkeypatch.setattr(blog_workflow_model, "agenerate_json", json_stub)
+    review = ReviewVerdict(verdict="REVISION_NEEDED", severity=3, issues=[ReviewIssue(issue="Tighten the intro.")])
+    state = BlogState(blog_draft="# Draft", review=review)
+
+    result = asyncio.run(blog_workflow_model.revision_step(state))
+
+    assert len(calls) == 1
+    assert result == {
+        "revision_notes": "- tightened intro",
+        "revision_count": 1,
+        "blog_draft": "# Revised",
+    }
+
+
+def test_revision_step_rewrites_only_flagged_sections(monkeypatch):
+    body = "Sentence about the topic. " * 60
+    draft = "\n\n".join(f"## Part {n}\n\n{body}" for n in range(1, 6))
+    calls = []
+
+    async def text_stub(prompt, max_tokens=512, temperature=0.7):
+        calls.append((prompt, max_tokens))
+        return "## Part 4\n\nTightened part four."
+
+    async def json_stub(prompt, *args, **kwargs):
+        raise AssertionError("full rewrite not expected")
+
+    monkeypatch.setattr(blog_workflow_model, "agenerate", text_stub)
+    monkeypatch.setattr(blog_workflow_model, "agenerate_json", json_stub)
+    state = BlogState(
+        blog_draft=draft,
+        review=ReviewVerdict(
+            verdict="REVISION_NEEDED", severity=3, issues=[ReviewIssue(section=4, issue="Cut the repetition.")]
+        ),
+    )
+
+    result = asyncio.run(blog_workflow_model.revision_step(state))
+
+    assert len(calls) == 1
+    prompt, max_tokens = calls[0]
+    assert "## Part 4" in prompt and "## Part 3" not in prompt
+    assert max_tokens < 1536 / 2
+    assert result["blog_draft"].split("\n\n")[6:8] == ["## Part 4", "Tightened part four."]
+    assert result["blog_draft"].count(body.strip()) == 4
+    assert result["revision_notes"].startswith("Revised sections 4 only")
+
+
+def test_brand_profile_is_memoized_per_brand_and_voice(monkeypatch):
+    # Real gateway and completion cache, stubbed transport: a stale cached completion would show here
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content=f"profile v{len(calls)}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    completions = SimpleNamespace(create=create)
+    monkeypatch.setattr(gateway, "cache", CompletionCache())
+    monkeypatch.setattr(gateway, "_async_client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    first = BlogState(brand_name="Acme Corp", brand_voice="Friendly")
+    repeat = BlogState(brand_name="  acme   CORP ", brand_voice="friendly")
+    other_voice = BlogState(brand_name="Acme Corp", brand_voice="Formal")
+
+    asyncio.run(blog_workflow_model.brand_context_research(first))
+    result = asyncio.run(blog_workflow_model.brand_context_research(repeat))
+    assert len(calls) == 1
+    assert result == {"brand_history": "profile v1"}
+
+    asyncio.run(blog_workflow_model.brand_context_research(other_voice))
+    assert len(calls) == 2
+
+    assert brand_profiles.invalidate("ACME corp") == 2
+    result = asyncio.run(blog_workflow_model.brand_context_research(first))
+    assert len(calls) == 3
+    assert result == {"brand_history": "profile v3"}
+
+
+def test_warm_up_skips_known_brands(timed_llm):
+    brands = [{"brand_name": "Acme"}, {"brand_name": "Globex", "brand_voice": "Bold"}]
+
+    assert asyncio.run(blog_workflow_model.warm_up_brand_profiles(brands)) == 2
+    assert asyncio.run(blog_workflow_model.warm_up_brand_profiles(brands)) == 0
+    assert brand_profiles.get("globex", "bold") == "APPROVED"
+
+
+def test_brand_profile_store_evicts_least_recently_used():
+    store = BrandProfileStore(max_entries=2)
+    store.set("Acme", "", "acme")
+    store.set("Globex", "", "globex")
+    assert store.get("acme") == "acme"  # Acme is now the most recent
+
+    store.set("Initech", "", "initech")
+
+    assert store.get("globex") is None
+    assert store.get("acme") == "acme" and store.get("initech") == "initech"
+    assert store.stats()["evictions"] == 1
@@ -0,0 +1,5 @@
+import os
+
+# Workflow modules build their Tavily tools at import time; tests never hit the network.
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("TAVILY_API_KEY", "test-key")
@@ -2,43 +2,31 @@ import json
 from typing import Dict, Any, List
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel, Field
-from groq import Groq
-from dotenv import load_dotenv
+from llm import FAST_MODEL, gateway
 
-load_dotenv()
 
 # -------------------------------
-# Initialize Groq client
+# LLM helpers (shared pooled gateway)
 # -------------------------------
-client = Groq()  # Uses GROQ_API_KEY from environment
-
-
 def generate_fast_response(prompt: str, max_tokens=1024, temperature=0.2) -> str:
-    """Uses the fast Groq model for simple generation tasks."""
-    completion = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+    """Uses the fast Groq model for simple generation tasks (low temperature, so cached)."""
+    return gateway.complete(
+        prompt, model=FAST_MODEL, max_tokens=max_tokens, temperature=temperature, cache=True
     )
-    return completion.choices[0].message.content.strip()
 
 
 def generate_json_response(prompt: str, max_tokens=1024, temperature=0.1) -> Dict:
-    """Uses the fast Groq model with JSON mode for structured output."""
-    completion = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
+    """Uses the fast Groq model with JSON mode for structured output (cached)."""
+    content = gateway.complete(
+        prompt,
+        model=FAST_MODEL,
+        max_tokens=max_tokens,
         temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
         response_format={"type": "json_object"},
+        cache=True,
     )
     try:
-        return json.loads(completion.choices[0].message.content.strip())
+        return json.loads(content)
     except json.JSONDecodeError:
         print("Error: Failed to decode JSON from model response.")
         return {}
@@ -0,0 +1,45 @@
+"""
+Shared review and section-level editing used by the compliance and revision nodes.
+
+Reviewers return a typed `ReviewVerdict` (JSON mode, validated by Pydantic)
+whose issues are addressed to numbered Markdown sections; revisions rewrite
+only the flagged sections before splicing them back into the draft.
+"""
+
+from .review import (
+    REVIEW_MIN_SEVERITY,
+    ReviewIssue,
+    ReviewParseError,
+    ReviewVerdict,
+    areview,
+    format_review,
+    parse_review,
+    read_review,
+    review_json_instructions,
+)
+from .sections import (
+    join_sections,
+    number_sections,
+    plan_targeted_revision,
+    revise_sections,
+    section_max_tokens,
+    split_sections,
+)
+
+__all__ = [
+    "REVIEW_MIN_SEVERITY",
+    "ReviewIssue",
+    "ReviewParseError",
+    "ReviewVerdict",
+    "areview",
+    "format_review",
+    "join_sections",
+    "number_sections",
+    "parse_review",
+    "plan_targeted_revision",
+    "read_review",
+    "review_json_instructions",
+    "revise_sections",
+    "section_max_tokens",
+    "split_sections",
+]
@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Any, Awaitable, Callable, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+# Reviews below this severity (0-5) are not worth a revision pass, whatever the verdict
+REVIEW_MIN_SEVERITY = int(os.environ.get("REVIEW_MIN_SEVERITY", "2"))
+
+
+class ReviewIssue(BaseModel):
+    section: Optional[int] = None  # [[Section N]] the issue concerns; None for the whole piece
+    issue: str
+
+
+class ReviewVerdict(BaseModel):
+    """Structured reviewer output; routing reads these fields, never the report text."""
+
+    verdict: Literal["APPROVED", "REVISION_NEEDED"]
+    severity: int = Field(0, ge=0, le=5)  # 0 none, 1 cosmetic, 3 noticeable, 5 blocking
+    issues: List[ReviewIssue] = Field(default_factory=list)
+
+    def needs_revision(self, min_severity: Optional[int] = None) -> bool:
+        """
+        Revise for a REVISION_NEEDED verdict of sufficient severity. An empty
+        issue list does not cancel it: that is a whole-piece revision.
+        """
+        threshold = REVIEW_MIN_SEVERITY if min_severity is None else min_severity
+        return self.verdict == "REVISION_NEEDED" and self.severity >= threshold
+
+
+class ReviewParseError(ValueError):
+    """Raised by `read_review` when a reviewer response is not a valid review."""
+
+
+def review_json_instructions(sectioned: bool = True) -> str:
+    """Output contract appended to every reviewer prompt (used with JSON mode)."""
+    section = (
+        '"section": <the [[Section N]] number it concerns, or 0 for the whole piece>, '
+        if sectioned
+        else ""
+    )
+    addressing = (
+        "Address each issue to the single section that needs the change; use 0 only for problems "
+        "that span the whole piece.\n"
+        if sectioned
+        else ""
+    )
+    return f"""Return ONLY a JSON object of this shape:
+{{"verdict": "APPROVED" or "REVISION_NEEDED",
+ "severity": <0-5: 0 no problems, 1 cosmetic, 3 noticeable to readers, 5 inaccurate or unpublishable>,
+ "issues": [{{{section}"issue": "<the specific change to make>"}}]}}
+{addressing}Use an empty "issues" list and severity 0 when the verdict is APPROVED."""
+
+
+def _section_number(value: Any, section_count: int) -> Optional[int]:
+    try:
+        number = int(str(value).strip().lstrip("#§").split()[-1])
+    except (ValueError, IndexError):
+        return None
+    return number if 1 <= number <= section_count else None
+
+
+def _verdict(value: Any) -> Optional[str]:
+    text = str(value or "").strip().upper().replace(" ", "_")
+    return text if text in ("APPROVED", "REVISION_NEEDED") else None
+
+
+def read_review(raw: str, section_count: int = 0) -> ReviewVerdict:
+    """
+    Validate a reviewer's JSON response into a `ReviewVerdict`, raising
+    `ReviewParseError` when it is not a valid review. Section numbers the draft
+    does not have become whole-piece issues, a missing or malformed severity
+    defaults to 3 for REVISION_NEEDED, and a REVISION_NEEDED verdict without
+    issues gets one whole-piece issue so the revision has something to act on.
+    """
+    text = (raw or "").strip()
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        data = json.loads(text[start : end + 1]) if start != -1 and end > start else None
+    except json.JSONDecodeError as e:
+        raise ReviewParseError(f"invalid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ReviewParseError("no JSON object")
+
+    issues = []
+    for item in data.get("issues") or []:
+        if isinstance(item, str):
+            item = {"issue": item}
+        if not isinstance(item, dict):
+            continue
+        issue = str(item.get("issue") or item.get("fix") or item.get("problem") or "").strip()
+        if issue:
+            issues.append({"section": _section_number(item.get("section"), section_count), "issue": issue})
+
+    verdict = _verdict(data.get("verdict"))
+    if verdict is None:
+        raise ReviewParseError(f"unknown verdict {data.get('verdict')!r}")
+    try:
+        severity = min(5, max(0, int(data["severity"])))
+    except (KeyError, ValueError, TypeError):
+        severity = 3 if verdict == "REVISION_NEEDED" else 0
+    if verdict == "REVISION_NEEDED" and not issues:
+        issues.append({
+            "section": None,
+            "issue": "The reviewer found problems without listing them; re-check the whole piece "
+            "for accuracy, tone and clarity.",
+        })
+    try:
+        return ReviewVerdict(verdict=verdict, severity=severity, issues=issues)
+    except ValidationError as e:
+        raise ReviewParseError(str(e)) from e
+
+
+def parse_review(raw: str, section_count: int = 0) -> ReviewVerdict:
+    """
+    Like `read_review`, but fails closed: a response that is not a valid
+    review becomes a whole-piece REVISION_NEEDED, never an approval. The
+    workflows' revision caps bound the resulting loop.
+    """
+    try:
+        return read_review(raw, section_count)
+    except ReviewParseError as e:
+        print(f"Unreadable review, requesting a revision: {e}")
+        return ReviewVerdict(
+            verdict="REVISION_NEEDED",
+            severity=3,
+            issues=[ReviewIssue(issue="The automated review could not be read; re-check the whole piece "
+                                "for accuracy, tone and clarity.")],
+        )
+
+
+async def areview(
+    generate: Callable[..., Awaitable[str]], prompt: str, section_count: int = 0, max_tokens: int = 512
+) -> ReviewVerdict:
+    """
+    Run a reviewer (`generate(prompt, max_tokens, cache=...)`) and validate its
+    answer. An unreadable answer is retried once, bypassing the completion
+    cache; if that fails too the review fails closed (see `parse_review`).
+    """
+    try:
+        return read_review(await generate(prompt, max_tokens), section_count)
+    except ReviewParseError as e:
+        print(f"Unreadable review, retrying once: {e}")
+    return parse_review(await generate(prompt, max_tokens, cache=False), section_count)
+
+
+def format_review(review: ReviewVerdict) -> str:
+    """Readable report stored as `compliance_report` and shown to the revision prompts."""
+    header = f"Verdict: {review.verdict} (severity {review.severity}/5)"
+    if not review.issues:
+        return f"{header}\nNo issues."
+    lines = [
+        f"- [{f'Section {issue.section}' if issue.section else 'Whole piece'}] {issue.issue}"
+        for issue in review.issues
+    ]
+    return f"{header}\nIssues:\n" + "\n".join(lines)
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .review import ReviewIssue
+
+# Above this share of flagged sections a full rewrite is cheaper than many small ones
+TARGETED_MAX_FRACTION = float(os.environ.get("REVISION_TARGETED_MAX_FRACTION", "0.6"))
+# Drafts splitting into fewer heading sections than this are addressed by paragraph
+MIN_SECTIONS = 3
+
+_HEADING = re.compile(r"^#{1,6}\s+\S")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_FENCE = re.compile(r"^```[\w-]*\s*\n(.*?)\n```$", re.DOTALL)
+
+
+# -------------------------------
+# Sections
+# -------------------------------
+def split_sections(markdown: str) -> List[str]:
+    """
+    Split a Markdown draft into addressable sections: one per heading (text
+    before the first heading is its own section). Drafts with fewer than
+    `MIN_SECTIONS` heading sections (e.g. a headline plus body copy) are split
+    into paragraphs instead, each heading staying with the paragraph after it.
+    """
+    lines = (markdown or "").strip().splitlines()
+    sections: List[List[str]] = [[]]
+    for line in lines:
+        if _HEADING.match(line) and any(part.strip() for part in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    by_heading = [text for text in ("\n".join(part).strip() for part in sections) if text]
+    if len(by_heading) >= MIN_SECTIONS:
+        return by_heading
+
+    paragraphs: List[str] = []
+    pending = ""
+    for block in _BLANK_LINES.split((markdown or "").strip()):
+        block = block.strip()
+        if not block:
+            continue
+        if all(_HEADING.match(line) for line in block.splitlines()):
+            pending = f"{pending}\n{block}".strip()
+            continue
+        paragraphs.append(f"{pending}\n\n{block}" if pending else block)
+        pending = ""
+    if pending:
+        paragraphs.append(pending)
+    return paragraphs
+
+
+def join_sections(sections: List[str]) -> str:
+    return "\n\n".join(section.strip() for section in sections)
+
+
+def number_sections(sections: List[str]) -> str:
+    """The draft as reviewers see it, every section prefixed with its `[[Section N]]` marker."""
+    return "\n\n".join(f"[[Section {index}]]\n{text}" for index, text in enumerate(sections, 1))
+
+
+def section_max_tokens(section: str) -> int:
+    """Output budget for rewriting one section: its own size plus room to grow."""
+    return max(128, int(len(section) / 4 * 1.5) + 64)
+
+
+# -------------------------------
+# Targeted revision
+# -------------------------------
+def plan_targeted_revision(
+    sections: List[str],
+    issues: List[ReviewIssue],
+    max_fraction: float = TARGETED_MAX_FRACTION,
+) -> Optional[Dict[int, List[str]]]:
+    """
+    Issues grouped by section number, or None when only a full rewrite will
+    do: no section-addressed issues, any whole-piece issue, or more than
+    `max_fraction` of the sections flagged.
+    """
+    if not issues or any(issue.section is None for issue in issues):
+        return None
+    plan: Dict[int, List[str]] = {}
+    for issue in issues:
+        if not 1 <= issue.section <= len(sections):
+            return None
+        plan.setdefault(issue.section, []).append(issue.issue)
+    if len(plan) > max(1, int(max_fraction * len(sections))):
+        return None
+    return dict(sorted(plan.items()))
+
+
+def _clean_rewrite(rewrite: str, original: str) -> str:
+    text = (rewrite or "").strip()
+    fenced = _FENCE.match(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    text = re.sub(r"^\[\[Section \d+\]\]\s*", "", text)
+    if not text:
+        return original
+    heading = original.splitlines()[0]
+    if _HEADING.match(heading) and not _HEADING.match(text.splitlines()[0]):
+        text = f"{heading}\n\n{text}"
+    return text
+
+
+async def revise_sections(
+    draft: str,
+    issues: List[ReviewIssue],
+    rewrite: Callable[[str, List[str]], Awaitable[str]],
+    max_fraction: float = TARGETED_MAX_FRACTION,
+) -> Optional[Tuple[str, List[int]]]:
+    """
+    Rewrite only the flagged sections of `draft` (concurrently, one
+    `rewrite(section, issues)` call each) and splice them back in place.
+    Returns the revised draft and the section numbers rewritten, or None when
+    the issues call for a full rewrite (see `plan_targeted_revision`).
+    """
+    sections = split_sections(draft)
+    plan = plan_targeted_revision(sections, issues, max_fraction)
+    if plan is None:
+        return None
+    rewrites = await asyncio.gather(
+        *(rewrite(sections[number - 1], notes) for number, notes in plan.items())
+    )
+    for number, text in zip(plan, rewrites):
+        sections[number - 1] = _clean_rewrite(text, sections[number - 1])
+    return join_sections(sections), list(plan)
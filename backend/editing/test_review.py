@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from editing import ReviewVerdict, areview, format_review, parse_review
+
+
+def test_parse_review_validates_and_normalizes():
+    raw = (
+        'Sure: {"verdict": "revision needed", "severity": 4, "issues": ['
+        '{"section": 2, "issue": "Soften the claim."}, {"section": "Section 9", "issue": "Out of range."},'
+        '{"section": 0, "issue": "Too long overall."}, "Plain string issue", {"section": 3}]}'
+    )
+    review = parse_review(raw, 4)
+
+    assert review.verdict == "REVISION_NEEDED" and review.severity == 4
+    assert [(issue.section, issue.issue) for issue in review.issues] == [
+        (2, "Soften the claim."),
+        (None, "Out of range."),
+        (None, "Too long overall."),
+        (None, "Plain string issue"),
+    ]
+    report = format_review(review)
+    assert report.startswith("Verdict: REVISION_NEEDED (severity 4/5)")
+    assert "- [Section 2] Soften the claim." in report
+    assert "- [Whole piece] Too long overall." in report
+
+
+@pytest.mark.parametrize(
+    "raw, verdict, severity",
+    [
+        ('{"verdict": "APPROVED", "issues": []}', "APPROVED", 0),
+        ('{"verdict": "REVISION_NEEDED", "issues": [{"issue": "x"}]}', "REVISION_NEEDED", 3),
+        ('{"verdict": "REVISION_NEEDED", "severity": "high", "issues": [{"issue": "x"}]}', "REVISION_NEEDED", 3),
+        ('{"verdict": "REVISION_NEEDED", "severity": 9, "issues": [{"issue": "x"}]}', "REVISION_NEEDED", 5),
+        # Free text and unknown verdicts are unreadable: fail closed, never approve
+        ("The draft is not APPROVED yet.", "REVISION_NEEDED", 3),
+        ('{"verdict": "MAYBE", "issues": [{"issue": "x"}]}', "REVISION_NEEDED", 3),
+    ],
+)
+def test_parse_review_defaults(raw, verdict, severity):
+    review = parse_review(raw)
+
+    assert (review.verdict, review.severity) == (verdict, severity)
+    assert review.needs_revision() == (verdict == "REVISION_NEEDED")
+
+
+def test_needs_revision_requires_severe_revision_verdict():
+    issues = [{"issue": "Fix the date."}]
+
+    assert ReviewVerdict(verdict="REVISION_NEEDED", severity=3, issues=issues).needs_revision()
+    assert not ReviewVerdict(verdict="REVISION_NEEDED", severity=1, issues=issues).needs_revision()
+    # No listed issues at high severity is a whole-piece revision, not an approval
+    assert ReviewVerdict(verdict="REVISION_NEEDED", severity=5).needs_revision()
+    review = parse_review('{"verdict": "REVISION_NEEDED", "severity": 5, "issues": []}', 3)
+    assert review.needs_revision() and review.issues[0].section is None
+    assert not ReviewVerdict(verdict="APPROVED", severity=5, issues=issues).needs_revision()
+    assert ReviewVerdict(verdict="REVISION_NEEDED", severity=1, issues=issues).needs_revision(min_severity=1)
+
+
+def test_areview_retries_an_unreadable_answer_once_uncached():
+    answers = iter(["Sorry, here is my review: APPROVED", '{"verdict": "APPROVED", "issues": []}'])
+    calls = []
+
+    async def generate(prompt, max_tokens=512, cache=True):
+        calls.append(cache)
+        return next(answers)
+
+    review = asyncio.run(areview(generate, "review this"))
+
+    assert review.verdict == "APPROVED"
+    assert calls == [True, False]
+
+
+def test_areview_fails_closed_after_the_retry():
+    async def generate(prompt, max_tokens=512, cache=True):
+        return "not json"
+
+    review = asyncio.run(areview(generate, "review this", 3))
+
+    assert review.verdict == "REVISION_NEEDED" and review.needs_revision()
+    assert review.issues[0].section is None
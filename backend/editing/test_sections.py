@@ -0,0 +1,80 @@
+import asyncio
+
+from editing import (
+    ReviewIssue,
+    join_sections,
+    number_sections,
+    plan_targeted_revision,
+    revise_sections,
+    section_max_tokens,
+    split_sections,
+)
+
+BLOG = """# Title
+
+Intro paragraph.
+
+## Why it matters
+
+Body one.
+
+More body one.
+
+## How it works
+
+Body two.
+
+## Conclusion
+
+Wrap up."""
+
+
+def test_split_by_headings_round_trips():
+    sections = split_sections(BLOG)
+
+    assert [s.splitlines()[0] for s in sections] == ["# Title", "## Why it matters", "## How it works", "## Conclusion"]
+    assert "More body one." in sections[1]
+    assert join_sections(sections) == BLOG
+    assert number_sections(sections).startswith("[[Section 1]]\n# Title")
+
+
+def test_split_falls_back_to_paragraphs():
+    article = "# Headline\n\nLede sentence.\n\nSecond paragraph.\n\nThird paragraph."
+
+    assert split_sections(article) == [
+        "# Headline\n\nLede sentence.",
+        "Second paragraph.",
+        "Third paragraph.",
+    ]
+
+
+def test_plan_falls_back_to_full_rewrite():
+    sections = split_sections(BLOG)
+    one = [ReviewIssue(section=2, issue="a"), ReviewIssue(section=2, issue="b")]
+
+    assert plan_targeted_revision(sections, one) == {2: ["a", "b"]}
+    assert plan_targeted_revision(sections, one + [ReviewIssue(issue="c")]) is None
+    assert plan_targeted_revision(sections, [ReviewIssue(section=n, issue="x") for n in (1, 2, 3)]) is None
+    assert plan_targeted_revision(sections, []) is None
+
+
+def test_revise_sections_splices_only_flagged_sections():
+    calls = []
+
+    async def rewrite(section, issues):
+        calls.append((section, issues))
+        # Models sometimes fence the answer and drop the heading
+        return "```markdown\nBody two, rewritten.\n```"
+
+    revised, numbers = asyncio.run(
+        revise_sections(BLOG, [ReviewIssue(section=3, issue="Clarify.")], rewrite)
+    )
+
+    assert numbers == [3]
+    assert calls == [("## How it works\n\nBody two.", ["Clarify."])]
+    assert revised == BLOG.replace("Body two.", "Body two, rewritten.")
+
+
+def test_section_budget_scales_with_section_size():
+    assert section_max_tokens("short") == 128
+    assert section_max_tokens("word " * 400) == int(2000 / 4 * 1.5) + 64
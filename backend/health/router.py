@@ -1,5 +1,12 @@
 from fastapi import APIRouter
 
+from llm import gateway
+from news.citations import review_metrics
+from search import search_cache
+from visualPostGenerator.caption_cache import caption_cache
+from visualPostGenerator.image_preprocess import vision_upload_metrics
+from visualPostGenerator.vision_client import vision_client
+
 router = APIRouter(tags=["Health"])
 
 
@@ -13,3 +20,31 @@ def ping():
 def health():
     """Basic readiness endpoint."""
     return {"status": "ok"}
+
+
+@router.get("/metrics/llm")
+def llm_metrics():
+    """Per-model call metrics and completion cache counters from the shared LLM gateway."""
+    return {"models": gateway.metrics(), "cache": gateway.cache_stats()}
+
+
+@router.get("/metrics/vision")
+def vision_metrics():
+    """Caption cache, upload preprocessing and vision client counters for the visual post generator."""
+    return {
+        "caption_cache": caption_cache.stats(),
+        "uploads": vision_upload_metrics.snapshot(),
+        "client": vision_client.stats(),
+    }
+
+
+@router.get("/metrics/search")
+def search_metrics():
+    """Web-search cache counters (hits, misses, coalesced in-flight queries)."""
+    return {"cache": search_cache.stats() if search_cache else None}
+
+
+@router.get("/metrics/news-review")
+def news_review_metrics():
+    """How news compliance reviews were decided, and how many LLM reviews the local checks avoided."""
+    return review_metrics.snapshot()
@@ -0,0 +1,10 @@
+"""
+Background job subsystem for the heavy generation workflows.
+
+Workflow routers register a runner with `job_queue`; the `/jobs` router lets
+clients submit work, get a threadId back immediately, and poll for the result.
+"""
+
+from .queue import Job, JobQueue, LocalJobQueue, QueueFullError, UnknownWorkflowError, job_queue
+
+__all__ = ["Job", "JobQueue", "LocalJobQueue", "QueueFullError", "UnknownWorkflowError", "job_queue"]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_MAX_QUEUE_DEPTH = int(os.environ.get("JOB_MAX_QUEUE_DEPTH", "100"))
+JOB_MAX_RETAINED = int(os.environ.get("JOB_MAX_RETAINED", "1000"))
+
+# A runner receives the raw request payload plus the threadId and returns the
+# same body the synchronous endpoint would have returned.
+JobRunner = Callable[[Dict[str, Any], str], Awaitable[Dict[str, Any]]]
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at its depth limit."""
+
+
+class UnknownWorkflowError(ValueError):
+    """Raised when no runner is registered for the requested workflow."""
+
+
+class Job(BaseModel):
+    thread_id: str
+    workflow: str
+    status: str = "queued"  # queued | running | succeeded | failed
+    submitted_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def summary(self) -> Dict[str, Any]:
+        """Status view without the (potentially large) result body."""
+        return self.model_dump(exclude={"result"})
+
+
+class JobQueue(ABC):
+    """Interface every job backend implements."""
+
+    @abstractmethod
+    def register(self, workflow: str, runner: JobRunner) -> None:
+        """Make `runner` available to jobs submitted for `workflow`."""
+
+    @abstractmethod
+    async def submit(self, workflow: str, payload: Dict[str, Any], thread_id: str) -> Job:
+        """Enqueue a job (or return the existing one for `thread_id`)."""
+
+    @abstractmethod
+    def get(self, thread_id: str) -> Optional[Job]:
+        """The job submitted under `thread_id`, if any."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, worker and job counters."""
+
+
+class LocalJobQueue(JobQueue):
+    """
+    In-process backend: a bounded asyncio queue drained by a fixed pool of
+    worker tasks on the server's event loop. Jobs are keyed by threadId, so a
+    client retry with the same threadId never starts the workflow twice.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = JOB_WORKERS,
+        max_queue_depth: int = JOB_MAX_QUEUE_DEPTH,
+        max_retained: int = JOB_MAX_RETAINED,
+    ) -> None:
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self.max_retained = max_retained
+        self._runners: Dict[str, JobRunner] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register(self, workflow: str, runner: JobRunner) -> None:
+        self._runners[workflow] = runner
+
+    @property
+    def workflows(self) -> List[str]:
+        return sorted(self._runners)
+
+    async def submit(self, workflow: str, payload: Dict[str, Any], thread_id: str) -> Job:
+        if workflow not in self._runners:
+            raise UnknownWorkflowError(f"Unknown workflow: {workflow}")
+
+        existing = self._jobs.get(thread_id)
+        if existing is not None and existing.status != "failed":
+            return existing
+
+        self._ensure_workers()
+        job = Job(thread_id=thread_id, workflow=workflow)
+        try:
+            self._queue.put_nowait(thread_id)
+        except asyncio.QueueFull as exc:
+            raise QueueFullError(
+                f"Job queue is full ({self.max_queue_depth} pending); retry later."
+            ) from exc
+
+        self._jobs[thread_id] = job
+        self._jobs.move_to_end(thread_id)
+        self._payloads[thread_id] = payload
+        self._prune()
+        return job
+
+    def get(self, thread_id: str) -> Optional[Job]:
+        return self._jobs.get(thread_id)
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "jobs": counts,
+        }
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed (used by tests)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    # ------------------------------------------------------------------ #
+    # Workers
+    # ------------------------------------------------------------------ #
+    def _ensure_workers(self) -> None:
+        """Start the pool on the running loop (restarting if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._queue is not None:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._worker_tasks = [
+            loop.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            thread_id = await queue.get()
+            try:
+                await self._run(thread_id)
+            finally:
+                queue.task_done()
+
+    async def _run(self, thread_id: str) -> None:
+        job = self._jobs.get(thread_id)
+        payload = self._payloads.pop(thread_id, None)
+        if job is None or payload is None:
+            return
+
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = await self._runners[job.workflow](payload, thread_id)
+            job.status = "succeeded"
+        except Exception as exc:
+            print(f"Job {thread_id} ({job.workflow}) failed: {exc}")
+            traceback.print_exc()
+            job.error = str(exc)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit."""
+        overflow = len(self._jobs) - self.max_retained
+        if overflow <= 0:
+            return
+        for thread_id in [tid for tid, job in self._jobs.items() if job.done][:overflow]:
+            del self._jobs[thread_id]
+
+
+# Global instance (importable anywhere)
+job_queue = LocalJobQueue()
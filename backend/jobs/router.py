@@ -0,0 +1,58 @@
+import uuid
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from .queue import QueueFullError, UnknownWorkflowError, job_queue
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("")
+def queue_stats():
+    """Queue depth, worker count and job counts per status."""
+    return {"workflows": job_queue.workflows, **job_queue.stats()}
+
+
+@router.post("/{workflow}", status_code=202)
+async def submit_job(workflow: str, request: Request):
+    """
+    Queue a workflow run and return its threadId immediately.
+
+    The body is the same payload the synchronous endpoint accepts. Sending an
+    existing `threadId` returns the job already registered under it instead of
+    running the workflow again.
+    """
+    payload = await request.json()
+    thread_id = payload.get("threadId") or str(uuid.uuid4())
+    payload["threadId"] = thread_id
+
+    try:
+        job = await job_queue.submit(workflow, payload, thread_id)
+    except UnknownWorkflowError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+
+    return {"status": job.status, "threadId": thread_id, "workflow": workflow}
+
+
+@router.get("/{thread_id}")
+def job_status(thread_id: str):
+    job = job_queue.get(thread_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown threadId")
+    return job.summary()
+
+
+@router.get("/{thread_id}/result")
+def job_result(thread_id: str, response: Response):
+    """The workflow's response body once finished; 202 with the status while pending."""
+    job = job_queue.get(thread_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown threadId")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if not job.done:
+        response.status_code = 202
+        return job.summary()
+    return job.result
@@ -0,0 +1,115 @@
+# test_job_queue.py
+# Local in-process job backend and the /jobs endpoints.
+import asyncio
+
+import httpx
+import pytest
+
+from jobs import JobQueue, LocalJobQueue, QueueFullError, UnknownWorkflowError, job_queue
+from main import app
+
+
+def _queue(**kwargs):
+    queue = LocalJobQueue(**kwargs)
+    runs = []
+
+    async def echo(payload, thread_id):
+        runs.append(thread_id)
+        await asyncio.sleep(payload.get("delay", 0))
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return {"status": "success", "threadId": thread_id}
+
+    queue.register("echo", echo)
+    return queue, runs
+
+
+def test_job_queue_is_abstract():
+    with pytest.raises(TypeError):
+        JobQueue()
+
+
+def test_submit_returns_before_the_workflow_runs():
+    queue, runs = _queue()
+
+    async def scenario():
+        job = await queue.submit("echo", {"delay": 0.01}, "t-1")
+        assert job.status == "queued" and runs == []
+        await queue.join()
+        return queue.get("t-1")
+
+    job = asyncio.run(scenario())
+    assert job.status == "succeeded"
+    assert job.result == {"status": "success", "threadId": "t-1"}
+
+
+def test_same_thread_id_is_not_run_twice():
+    queue, runs = _queue()
+
+    async def scenario():
+        await queue.submit("echo", {}, "t-1")
+        await queue.submit("echo", {}, "t-1")
+        await queue.join()
+
+    asyncio.run(scenario())
+    assert runs == ["t-1"]
+
+
+def test_failures_are_recorded_and_can_be_resubmitted():
+    queue, runs = _queue()
+
+    async def scenario():
+        await queue.submit("echo", {"fail": True}, "t-1")
+        await queue.join()
+        failed = queue.get("t-1").model_copy()
+        await queue.submit("echo", {}, "t-1")
+        await queue.join()
+        return failed
+
+    failed = asyncio.run(scenario())
+    assert failed.status == "failed" and failed.error == "boom"
+    assert queue.get("t-1").status == "succeeded"
+    assert runs == ["t-1", "t-1"]
+
+
+def test_queue_depth_limit_and_bounded_workers():
+    queue, runs = _queue(workers=2, max_queue_depth=3)
+
+    async def scenario():
+        for i in range(3):
+            await queue.submit("echo", {"delay": 0.05}, f"t-{i}")
+        with pytest.raises(QueueFullError):
+            await queue.submit("echo", {}, "overflow")
+        with pytest.raises(UnknownWorkflowError):
+            await queue.submit("missing", {}, "t-x")
+        await asyncio.sleep(0.01)
+        running = queue.stats()["jobs"].get("running", 0)
+        await queue.join()
+        return running
+
+    assert asyncio.run(scenario()) == 2
+    assert len(runs) == 3
+
+
+def test_jobs_endpoints_round_trip(monkeypatch):
+    async def runner(payload, thread_id):
+        return {"status": "success", "threadId": thread_id, "echo": payload["prompt"]}
+
+    monkeypatch.setitem(job_queue._runners, "blog", runner)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            submitted = await client.post("/jobs/blog", json={"prompt": "AI"})
+            thread_id = submitted.json()["threadId"]
+            await job_queue.join()
+            status = await client.get(f"/jobs/{thread_id}")
+            result = await client.get(f"/jobs/{thread_id}/result")
+            missing = await client.get("/jobs/nope")
+            return submitted, status, result, missing
+
+    submitted, status, result, missing = asyncio.run(scenario())
+    assert submitted.status_code == 202
+    assert status.json()["status"] == "succeeded"
+    assert result.json()["echo"] == "AI"
+    assert missing.status_code == 404
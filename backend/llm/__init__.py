@@ -0,0 +1,24 @@
+"""
+Shared LLM gateway used by every workflow.
+
+Owns the single pooled Groq client, the completion cache and the per-model
+call metrics, plus the async generation helpers shared by the workflow graphs.
+"""
+
+from .cache import CompletionCache, cache_key
+from .gateway import FAST_MODEL, PRIMARY_MODEL, LLMGateway, build_messages, gateway
+from .helpers import agenerate, agenerate_research, agenerate_review, agenerate_stream
+
+__all__ = [
+    "LLMGateway",
+    "CompletionCache",
+    "cache_key",
+    "gateway",
+    "build_messages",
+    "PRIMARY_MODEL",
+    "FAST_MODEL",
+    "agenerate",
+    "agenerate_research",
+    "agenerate_review",
+    "agenerate_stream",
+]
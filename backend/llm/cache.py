@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# The disk tier is trimmed to this share of its limit, so the directory scan
+# runs once per ~10% of `max_disk_entries` new writes rather than on every write
+DISK_LOW_WATER = 0.9
+
+
+def cache_key(
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    top_p: float = 1,
+    response_format: Optional[Dict[str, str]] = None,
+) -> str:
+    """Content address of a completion request."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p,
+            "response_format": response_format,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    Two-tier completion cache: an in-memory LRU in front of an optional
+    on-disk store. Entries expire after `ttl` seconds in both tiers.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        ttl: float = 3600,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = 5000,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_entries = 0
+        self._evicting = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_entries = sum(1 for _ in self.disk_dir.glob("*/*.json"))
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+        disk_entry = self._disk_get(key, now)
+        with self._lock:
+            if disk_entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._memory_put(key, *disk_entry)
+        return disk_entry[1]
+
+    def set(self, key: str, value: str) -> None:
+        created = time.time()
+        with self._lock:
+            self._memory_put(key, created, value)
+        self._disk_put(key, created, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+            self._disk_entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    # ------------------------------------------------------------------ #
+    # Memory tier (caller holds the lock)
+    # ------------------------------------------------------------------ #
+    def _memory_put(self, key: str, created: float, value: str) -> None:
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # ------------------------------------------------------------------ #
+    # Disk tier
+    # ------------------------------------------------------------------ #
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if now - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_entries = max(0, self._disk_entries - 1)
+            return None
+        return entry["created"], entry["value"]
+
+    def _disk_put(self, key: str, created: float, value: str) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        is_new = not path.exists()
+        tmp_path = None
+        try:
+            path.parent.mkdir(exist_ok=True)
+            # A private temp file per writer: concurrent misses on one key must not share it
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, suffix=".tmp", delete=False, encoding="utf-8"
+            ) as tmp:
+                tmp_path = tmp.name
+                tmp.write(json.dumps({"created": created, "value": value}))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the completion itself already succeeded
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            return
+        with self._lock:
+            if is_new:
+                self._disk_entries += 1
+            # One writer trims at a time; the others keep writing meanwhile
+            evict = self._disk_entries > self.max_disk_entries and not self._evicting
+            if evict:
+                self._evicting = True
+        if evict:
+            try:
+                self._evict_disk()
+            finally:
+                with self._lock:
+                    self._evicting = False
+
+    def _evict_disk(self) -> None:
+        """Drop the oldest files until the disk tier is down to its low-water mark."""
+        files = []
+        for path in self.disk_dir.glob("*/*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:  # removed by a concurrent expiry
+                continue
+        files.sort(key=lambda item: item[0])
+        target = int(self.max_disk_entries * DISK_LOW_WATER)
+        overflow = max(0, len(files) - target)
+        for _, path in files[:overflow]:
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self.evictions += overflow
+            self._disk_entries = len(files) - overflow
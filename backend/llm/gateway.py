@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+from groq import AsyncGroq, Groq
+
+from .cache import CompletionCache, cache_key
+
+load_dotenv()
+
+# -------------------------------
+# Models & pool configuration
+# -------------------------------
+PRIMARY_MODEL = "llama-3.3-70b-versatile"
+FAST_MODEL = "llama-3.1-8b-instant"
+
+MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.environ.get("LLM_KEEPALIVE_EXPIRY", "60"))
+REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", "120"))
+
+CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "512"))
+CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", "3600"))
+CACHE_DIR = os.environ.get("LLM_CACHE_DIR")  # enables the on-disk tier when set
+CACHE_MAX_DISK_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_DISK_ENTRIES", "5000"))
+
+
+class ModelMetrics:
+    """Running counters for a single model."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_latency = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_latency_s": round(self.total_latency, 4),
+            "avg_latency_s": round(self.total_latency / self.calls, 4) if self.calls else 0.0,
+        }
+
+
+class LLMGateway:
+    """
+    Single entry-point for every Groq chat completion in the backend.
+
+    All agents share one HTTP connection pool (with keep-alive) instead of
+    instantiating their own `Groq()` clients, and every call is recorded in
+    per-model metrics. Calls that pass `cache=True` (deterministic work such
+    as research, reviews and brand profiles) are served from the completion
+    cache; creative generations are never cached so users can regenerate.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        timeout: float = REQUEST_TIMEOUT,
+        cache: Optional[CompletionCache] = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.cache = cache
+        self._client: Optional[Groq] = None
+        self._async_client: Optional[AsyncGroq] = None
+        self._client_lock = threading.Lock()
+        self._metrics: Dict[str, ModelMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Clients
+    # ------------------------------------------------------------------ #
+    @property
+    def client(self) -> Groq:
+        """Lazily build the pooled Groq client (uses GROQ_API_KEY from environment)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    http_client = httpx.Client(limits=self.limits, timeout=self.timeout)
+                    self._client = Groq(http_client=http_client, timeout=self.timeout)
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncGroq:
+        """Lazily build the pooled async Groq client used by the async workflows."""
+        if self._async_client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    http_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+                    self._async_client = AsyncGroq(http_client=http_client, timeout=self.timeout)
+        return self._async_client
+
+    def close(self) -> None:
+        """Release pooled connections of the sync client."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Release pooled connections of both clients."""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    # ------------------------------------------------------------------ #
+    # Completions
+    # ------------------------------------------------------------------ #
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: str = PRIMARY_MODEL,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        top_p: float = 1,
+        response_format: Optional[Dict[str, str]] = None,
+        cache: bool = False,
+    ) -> str:
+        """Run a chat completion and return the stripped message content."""
+        kwargs = _completion_kwargs(
+            messages, model, temperature, max_tokens, top_p, response_format
+        )
+        key = self._cache_key(kwargs) if cache else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            completion = self.client.chat.completions.create(**kwargs)
+        except Exception:
+            self._record(model, time.perf_counter() - started, error=True)
+            raise
+        self._record(model, time.perf_counter() - started, usage=completion.usage)
+        return self._cache_set(key, _content(completion))
+
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: str = PRIMARY_MODEL,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        top_p: float = 1,
+        response_format: Optional[Dict[str, str]] = None,
+        cache: bool = False,
+    ) -> str:
+        """Async variant of `chat`; never blocks the event loop."""
+        kwargs = _completion_kwargs(
+            messages, model, temperature, max_tokens, top_p, response_format
+        )
+        key = self._cache_key(kwargs) if cache else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            completion = await self.async_client.chat.completions.create(**kwargs)
+        except Exception:
+            self._record(model, time.perf_counter() - started, error=True)
+            raise
+        self._record(model, time.perf_counter() - started, usage=completion.usage)
+        return self._cache_set(key, _content(completion))
+
+    async def astream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: str = PRIMARY_MODEL,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        top_p: float = 1,
+        cache: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion as content deltas (a cache hit arrives as one delta)."""
+        kwargs = _completion_kwargs(messages, model, temperature, max_tokens, top_p, None)
+        key = self._cache_key(kwargs) if cache else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        kwargs["stream"] = True
+        parts: List[str] = []
+        usage = None
+        started = time.perf_counter()
+        try:
+            stream = await self.async_client.chat.completions.create(**kwargs)
+            async for chunk in stream:
+                x_groq = getattr(chunk, "x_groq", None)
+                if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                    usage = x_groq.usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception:
+            self._record(model, time.perf_counter() - started, error=True)
+            raise
+        self._record(model, time.perf_counter() - started, usage=usage)
+        self._cache_set(key, "".join(parts).strip())
+
+    def complete(
+        self,
+        prompt: str,
+        *,
+        model: str = PRIMARY_MODEL,
+        system: Optional[str] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Convenience wrapper for single-prompt calls."""
+        return self.chat(build_messages(prompt, system), model=model, **kwargs)
+
+    async def acomplete(
+        self,
+        prompt: str,
+        *,
+        model: str = PRIMARY_MODEL,
+        system: Optional[str] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Async convenience wrapper for single-prompt calls."""
+        return await self.achat(build_messages(prompt, system), model=model, **kwargs)
+
+    def astream_complete(
+        self,
+        prompt: str,
+        *,
+        model: str = PRIMARY_MODEL,
+        system: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """Streaming convenience wrapper for single-prompt calls."""
+        return self.astream_chat(build_messages(prompt, system), model=model, **kwargs)
+
+    # ------------------------------------------------------------------ #
+    # Completion cache
+    # ------------------------------------------------------------------ #
+    def _cache_key(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return cache_key(
+            model=kwargs["model"],
+            messages=kwargs["messages"],
+            temperature=kwargs["temperature"],
+            max_tokens=kwargs["max_completion_tokens"],
+            top_p=kwargs["top_p"],
+            response_format=kwargs.get("response_format"),
+        )
+
+    def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        return self.cache.get(key)
+
+    def _cache_set(self, key: Optional[str], content: str) -> str:
+        if key is not None and content:
+            self.cache.set(key, content)
+        return content
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the completion cache."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    # ------------------------------------------------------------------ #
+    # Metrics
+    # ------------------------------------------------------------------ #
+    def _record(
+        self,
+        model: str,
+        latency: float,
+        *,
+        usage: Any = None,
+        error: bool = False,
+    ) -> None:
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(model, ModelMetrics())
+            stats.calls += 1
+            stats.total_latency += latency
+            if error:
+                stats.errors += 1
+            if usage is not None:
+                stats.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+                stats.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of per-model call metrics."""
+        with self._metrics_lock:
+            return {model: stats.as_dict() for model, stats in self._metrics.items()}
+
+    def reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self._metrics.clear()
+
+
+def _completion_kwargs(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    top_p: float,
+    response_format: Optional[Dict[str, str]],
+) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_completion_tokens": max_tokens,
+        "top_p": top_p,
+        "stream": False,
+    }
+    if response_format:
+        kwargs["response_format"] = response_format
+    return kwargs
+
+
+def _content(completion: Any) -> str:
+    content = completion.choices[0].message.content
+    return content.strip() if content else ""
+
+
+def build_messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+    messages: List[Dict[str, str]] = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+# Global instance (importable anywhere)
+gateway = LLMGateway(
+    cache=CompletionCache(
+        max_entries=CACHE_MAX_ENTRIES,
+        ttl=CACHE_TTL,
+        disk_dir=CACHE_DIR,
+        max_disk_entries=CACHE_MAX_DISK_ENTRIES,
+    )
+    if CACHE_ENABLED
+    else None
+)
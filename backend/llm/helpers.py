@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import List
+
+from langgraph.config import get_stream_writer
+
+from .gateway import FAST_MODEL, PRIMARY_MODEL, gateway
+
+
+# -------------------------------
+# Async helpers for the graph nodes of the blog, news and YouTube script workflows
+# -------------------------------
+async def agenerate(
+    prompt: str, max_tokens=512, temperature=0.7, cache: bool = False, *, model: str = PRIMARY_MODEL
+) -> str:
+    """Generate text from a prompt (creative output, so uncached unless asked)."""
+    return await gateway.acomplete(
+        prompt, model=model, max_tokens=max_tokens, temperature=temperature, cache=cache
+    )
+
+
+async def agenerate_research(
+    prompt: str, max_tokens=512, temperature=0.7, *, model: str = FAST_MODEL
+) -> str:
+    """Research notes on the cheaper model; reference material, so repeats are cached."""
+    return await gateway.acomplete(
+        prompt, model=model, max_tokens=max_tokens, temperature=temperature, cache=True
+    )
+
+
+async def agenerate_review(
+    prompt: str, max_tokens=512, temperature=0.3, cache: bool = True, *, model: str = PRIMARY_MODEL
+) -> str:
+    """Reviewer call in JSON mode; validated by `editing.areview`."""
+    return await gateway.acomplete(
+        prompt,
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        response_format={"type": "json_object"},
+        cache=cache,
+    )
+
+
+async def agenerate_stream(
+    prompt: str, node: str, max_tokens=512, temperature=0.7, *, model: str = PRIMARY_MODEL
+) -> str:
+    """Like `agenerate`, but forwards token deltas to the graph's custom stream."""
+    writer = get_stream_writer()
+    parts: List[str] = []
+    async for delta in gateway.astream_complete(
+        prompt, model=model, max_tokens=max_tokens, temperature=temperature
+    ):
+        parts.append(delta)
+        writer({"node": node, "delta": delta})
+    return "".join(parts).strip()
@@ -0,0 +1,139 @@
+# test_cache.py
+# Completion cache tiers and gateway integration (Groq client is stubbed).
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from llm import CompletionCache, LLMGateway, cache_key
+
+KEY_ARGS = dict(model="m", messages=[{"role": "user", "content": "hi"}], temperature=0.2, max_tokens=64)
+
+
+class StubCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f"answer {self.calls}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def _gateway(cache):
+    gateway = LLMGateway(cache=cache)
+    completions = StubCompletions()
+    gateway._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return gateway, completions
+
+
+def test_key_depends_on_every_sampling_parameter():
+    base = cache_key(**KEY_ARGS)
+    assert base == cache_key(**KEY_ARGS)
+    assert base != cache_key(**{**KEY_ARGS, "temperature": 0.3})
+    assert base != cache_key(**{**KEY_ARGS, "max_tokens": 65})
+    assert base != cache_key(**{**KEY_ARGS, "model": "other"})
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = CompletionCache(max_entries=2, ttl=10)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    clock = [0.0]
+    monkeypatch.setattr("llm.cache.time.time", lambda: clock[0])
+    cache.set("d", "4")
+    clock[0] = 11
+    assert cache.get("d") is None
+    assert cache.stats()["evictions"] == 2  # "c" was pushed out by "d" as well
+
+
+def test_disk_tier_survives_new_memory_tier(tmp_path):
+    CompletionCache(disk_dir=str(tmp_path)).set("k" * 64, "stored")
+
+    fresh = CompletionCache(disk_dir=str(tmp_path))
+
+    assert fresh.get("k" * 64) == "stored"
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_is_size_bounded(tmp_path, monkeypatch):
+    cache = CompletionCache(disk_dir=str(tmp_path), max_disk_entries=20)
+    scans = []
+    evict = cache._evict_disk
+    monkeypatch.setattr(cache, "_evict_disk", lambda: (scans.append(1), evict()))
+    for i in range(40):
+        cache.set(f"{i:064d}", str(i))
+
+    files = list(tmp_path.glob("*/*.json"))
+    assert len(files) <= 20
+    assert cache.stats()["disk_entries"] == len(files)
+    # Trimming to the low-water mark (18) means one scan per three writes past the limit, not per write
+    assert len(scans) == 7
+
+
+def test_concurrent_disk_writes_of_one_key_do_not_collide(tmp_path):
+    cache = CompletionCache(disk_dir=str(tmp_path))
+    key, created = "c" * 64, time.time()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache._disk_put(key, created, f"value {i}" * 1000), range(32)))
+
+    assert [path.name for path in tmp_path.glob("*/*")] == [f"{key}.json"]  # no stray temp files
+    assert CompletionCache(disk_dir=str(tmp_path)).get(key).startswith("value ")
+
+
+def test_disk_write_failures_are_swallowed(tmp_path, monkeypatch):
+    cache = CompletionCache(disk_dir=str(tmp_path))
+
+    def fail(src, dst):
+        raise PermissionError("read-only cache dir")
+
+    monkeypatch.setattr("llm.cache.os.replace", fail)
+    cache.set("d" * 64, "kept in memory")
+
+    assert cache.get("d" * 64) == "kept in memory"
+    assert list(tmp_path.glob("*/*")) == []
+
+
+def test_gateway_serves_repeats_from_cache():
+    gateway, completions = _gateway(CompletionCache())
+
+    first = gateway.complete("hello", temperature=0.2, cache=True)
+    second = gateway.complete("hello", temperature=0.2, cache=True)
+
+    assert first == second == "answer 1"
+    assert completions.calls == 1
+    assert gateway.cache_stats()["memory_hits"] == 1
+    assert gateway.metrics()["llama-3.3-70b-versatile"]["calls"] == 1
+
+
+def test_gateway_does_not_cache_by_default():
+    gateway, completions = _gateway(CompletionCache())
+
+    # Creative generations must differ on regenerate
+    gateway.complete("hello", temperature=0.9)
+    gateway.complete("hello", temperature=0.9)
+
+    assert completions.calls == 2
+    assert gateway.cache_stats()["misses"] == 0
+
+
+def test_async_calls_share_the_cache():
+    gateway, completions = _gateway(CompletionCache())
+    gateway.complete("hello", cache=True)
+
+    async_completions = SimpleNamespace(create=None)
+
+    async def create(**kwargs):
+        raise AssertionError("cache hit expected")
+
+    async_completions.create = create
+    gateway._async_client = SimpleNamespace(chat=SimpleNamespace(completions=async_completions))
+
+    assert asyncio.run(gateway.acomplete("hello", cache=True)) == "answer 1"
@@ -4,6 +4,7 @@ from contentRepurposer.router import router as contentRepurposer_router
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from health.router import router as health_router
+from jobs.router import router as jobs_router
 from news.router import router as news_router
 from visualPostGenerator.router import router as caption_router
 from x_post.router import router as xpost_router
@@ -40,3 +41,4 @@ app.include_router(health_router)
 app.include_router(caption_router)
 app.include_router(youtube_route)
 app.include_router(xpost_router)
+app.include_router(jobs_router)
@@ -1,5 +1,6 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 from langgraph.graph import StateGraph
+from api.sse import stream_graph_events
 from .news_workflow_model import NewsArticleState, build_news_article_graph
 
 
@@ -8,54 +9,65 @@ class NewsArticleWorkflowAgent:
 
     def __init__(self):
         self.graph = None
+        self.app = None
 
     def compile(self):
-        """Build the LangGraph workflow."""
+        """Build and compile the LangGraph workflow once; the runnable is reused across requests."""
         self.graph = build_news_article_graph()
+        self.app = self.graph.compile()
+        return self.app
+
+    def build_state(self, input_data: Dict[str, Any]) -> NewsArticleState:
+        """🧠 Extract input fields from frontend."""
+        # These keys match the output of your 'normalize_news_input' function
+        return NewsArticleState(
+            prompt=input_data.get("prompt", ""),
+            additional_context=input_data.get("additional_context", ""),
+            word_count=input_data.get("word_count", 800),
+            tone=input_data.get("tone", ""),
+            audience=input_data.get("audience", ""),
+
+            # Ensure other keys required by NewsArticleState have defaults
+            # (based on the model file we just wrote)
+            research_notes="",
+            sources=[],
+            compact_research="",
+            article_draft="",
+            compliance_report="",
+            review_source="",
+            llm_reviewed=False,
+            review=None,
+            revision_count=0,
+            final_response="",
+        )
+
+    def format_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the final article from the final state."""
+        article = result.get("article_draft", "No article was generated by the agent.")
+
+        return {
+            "status": "success",
+            "data": {
+                # This is the key your news_router.py is looking for
+                "article_draft": article,
+                "raw_result": result  # optional: full workflow output
+            }
+        }
 
     async def ainvoke(self, input_data: Dict[str, Any], thread_id: str = None):
-        """Run the workflow asynchronously (currently synchronous execution)."""
+        """Run the workflow asynchronously on the async LLM client."""
         print("=== ainvoke (NEWS) received input_data ===")
         print(input_data)
 
-        """Run the workflow asynchronously (currently synchronous execution)."""
         try:
-            # 🧠 Extract input fields from frontend
-            # These keys match the output of your 'normalize_news_input' function
-            state = NewsArticleState(
-                prompt=input_data.get("prompt", ""),
-                additional_context=input_data.get("additional_context", ""),
-                word_count=input_data.get("word_count", 800),
-                tone=input_data.get("tone", ""),
-                audience=input_data.get("audience", ""),
-                
-                # Ensure other keys required by NewsArticleState have defaults
-                # (based on the model file we just wrote)
-                research_notes="",
-                article_draft="",
-                compliance_report="",
-                revision_count=0,
-                final_response="",
-            )
+            state = self.build_state(input_data)
 
             # ⚙️ Run the LangGraph workflow
-            graph = self.graph or build_news_article_graph()
-            app = graph.compile()
-            
-            # 'result' will be the final state dictionary after the graph finishes
-            result = app.invoke(state) 
+            app = self.app or self.compile()
 
-            # Extract the final article from the final state
-            article = result.get("article_draft", "No article was generated by the agent.")
-
-            return {
-                "status": "success",
-                "data": {
-                    # This is the key your news_router.py is looking for
-                    "article_draft": article,
-                    "raw_result": result  # optional: full workflow output
-                }
-            }
+            # 'result' will be the final state dictionary after the graph finishes
+            result = await app.ainvoke(state)
+            return self.format_result(result)
 
         except Exception as e:
             print(f"Error in NewsArticleWorkflowAgent: {e}")
@@ -63,3 +75,12 @@ class NewsArticleWorkflowAgent:
                 "status": "error",
                 "message": str(e)
             }
+
+    async def astream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run the workflow yielding node / token events, then a `final` event with the formatted result."""
+        state = self.build_state(input_data)
+        app = self.app or self.compile()
+        async for item in stream_graph_events(app, state):
+            if item["event"] == "final":
+                item = {"event": "final", "data": self.format_result(item["data"])}
+            yield item
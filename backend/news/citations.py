@@ -0,0 +1,170 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List
+
+from editing import ReviewVerdict, split_sections
+
+# Drafts more than this fraction away from the requested length are sent back
+WORD_COUNT_TOLERANCE = float(os.environ.get("NEWS_WORD_COUNT_TOLERANCE", "0.25"))
+# Approve drafts that pass every local check without asking the LLM reviewer
+APPROVE_CLEAN_DRAFTS = os.environ.get("NEWS_APPROVE_CLEAN_DRAFTS", "0") == "1"
+# Paragraphs at least this long that state figures or quotes must cite a source
+UNCITED_PARAGRAPH_WORDS = 25
+
+_CITATION_GROUP = re.compile(r"\[(S\d+(?:\s*[,;]\s*S?\d+)*)\]")
+_CITATION_ID = re.compile(r"S?(\d+)")
+_WORD = re.compile(r"[A-Za-z0-9][\w'’-]*")
+_FACTUAL = re.compile(r"\d|[\"“”]")
+
+
+def cited_ids(text: str) -> List[str]:
+    """Every source id cited in `text` (`[S1]`, `[S1, S3]`, `[S2; 4]`), in order of first use."""
+    ids: List[str] = []
+    for group in _CITATION_GROUP.findall(text or ""):
+        for number in _CITATION_ID.findall(group):
+            source_id = f"S{int(number)}"
+            if source_id not in ids:
+                ids.append(source_id)
+    return ids
+
+
+def count_words(text: str) -> int:
+    """Words of the article body, ignoring Markdown markup and citation markers."""
+    return len(_WORD.findall(_CITATION_GROUP.sub(" ", text or "")))
+
+
+def check_article(
+    draft: str,
+    source_ids: List[str],
+    target_words: int,
+    tolerance: float = WORD_COUNT_TOLERANCE,
+) -> Dict[str, Any]:
+    """
+    Deterministic pre-review of a news draft: citations must point at real
+    sources, fact-bearing paragraphs must cite something, and the length must
+    be within `tolerance` of the target. Returns the findings plus precise
+    fixes (`issues`) addressed to the draft's sections (see `split_sections`);
+    an empty list means every mechanical check passed.
+    """
+    issues: List[Dict[str, Any]] = []
+    cited = cited_ids(draft)
+    known = set(source_ids)
+    unknown = [source_id for source_id in cited if source_id not in known]
+    valid = ", ".join(source_ids) if source_ids else "none (no web research is available)"
+    uncited_paragraphs = 0
+
+    for number, section in enumerate(split_sections(draft), 1):
+        bad = [source_id for source_id in cited_ids(section) if source_id not in known]
+        if bad:
+            issues.append({
+                "section": number,
+                "severity": 4,
+                "issue": f"Remove or correct citations of non-existent sources: {', '.join(bad)}. "
+                f"Valid source ids: {valid}.",
+            })
+        if not source_ids:
+            continue
+        for paragraph in re.split(r"\n\s*\n", section):
+            text = paragraph.strip()
+            if not text or text.startswith("#"):
+                continue
+            if (
+                count_words(text) >= UNCITED_PARAGRAPH_WORDS
+                and _FACTUAL.search(_CITATION_GROUP.sub(" ", text))
+                and not cited_ids(text)
+            ):
+                uncited_paragraphs += 1
+                opening = " ".join(text.split()[:8]) + " ..."
+                issues.append({
+                    "section": number,
+                    "severity": 3,
+                    "issue": f'Add [S#] citations to the paragraph starting "{opening}" (it states figures or quotes).',
+                })
+
+    if source_ids and not [source_id for source_id in cited if source_id in known]:
+        issues.append({
+            "section": None,
+            "severity": 4,
+            "issue": "The article cites no sources. Attribute facts inline with [S#] markers from the research.",
+        })
+
+    words = count_words(draft)
+    low, high = int(target_words * (1 - tolerance)), int(target_words * (1 + tolerance))
+    if words < low:
+        issues.append({
+            "section": None,
+            "severity": 2,
+            "issue": f"The article is {words} words; expand it by about {target_words - words} words (target {target_words}).",
+        })
+    elif words > high:
+        issues.append({
+            "section": None,
+            "severity": 2,
+            "issue": f"The article is {words} words; trim it by about {words - target_words} words (target {target_words}).",
+        })
+
+    return {
+        "word_count": words,
+        "cited": cited,
+        "unknown_citations": unknown,
+        "uncited_paragraphs": uncited_paragraphs,
+        "issues": issues,
+    }
+
+
+def local_review(check: Dict[str, Any]) -> ReviewVerdict:
+    """The check as a `ReviewVerdict`, as severe as its worst issue, so routing and revision treat both alike."""
+    if not check["issues"]:
+        return ReviewVerdict(verdict="APPROVED")
+    return ReviewVerdict(
+        verdict="REVISION_NEEDED",
+        severity=max(issue["severity"] for issue in check["issues"]),
+        issues=check["issues"],
+    )
+
+
+class ReviewMetrics:
+    """Counts how each compliance review was decided, to show how often the LLM call was avoided."""
+
+    OUTCOMES = ("local_revision", "local_approval", "llm_review")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = {outcome: 0 for outcome in self.OUTCOMES}
+
+    def record(self, outcome: str, check: Dict[str, Any]) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+        print(
+            json.dumps(
+                {
+                    "event": "news_compliance_review",
+                    "outcome": outcome,
+                    "issues": len(check["issues"]),
+                    "word_count": check["word_count"],
+                    "unknown_citations": check["unknown_citations"],
+                    "uncited_paragraphs": check["uncited_paragraphs"],
+                }
+            )
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.counts.values())
+            avoided = total - self.counts["llm_review"]
+            return {
+                **self.counts,
+                "reviews": total,
+                "llm_reviews_avoided": avoided,
+                "avoided_rate": round(avoided / total, 3) if total else 0.0,
+            }
+
+
+# Global instance shared by the news workflow and the metrics endpoint
+review_metrics = ReviewMetrics()
@@ -1,48 +1,75 @@
-from typing import Dict, Any
+import asyncio
+from functools import partial
+from typing import Dict, Any, List
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel, Field
-from groq import Groq
 from langchain_tavily import TavilySearch
 from dotenv import load_dotenv
+from llm import (
+    FAST_MODEL,
+    PRIMARY_MODEL,
+    agenerate,
+    agenerate_research,
+    agenerate_stream,
+    gateway,
+)
+from llm import agenerate_review as _agenerate_review
+from editing import (
+    ReviewVerdict,
+    areview,
+    format_review,
+    number_sections,
+    review_json_instructions,
+    revise_sections,
+    section_max_tokens,
+    split_sections,
+)
+from search import CachedSearch, search_cache
+from .citations import (
+    APPROVE_CLEAN_DRAFTS,
+    check_article,
+    local_review,
+    review_metrics,
+)
+from .research import (
+    SUBQUERY_COUNT,
+    build_source_pack,
+    compress_source_pack,
+    estimate_tokens,
+    extract_hits,
+    format_compact_pack,
+    format_source_pack,
+    merge_hits,
+    parse_subqueries,
+    subquery_prompt,
+)
 import os
 
 load_dotenv()
 
-# -------------------------------
-# Initialize Groq client
-# -------------------------------
-client = Groq()  # Uses GROQ_API_KEY from environment
-research_client = Groq()  # Smaller agent for research (llama-3.1-8b-instant)
-
 # --- Initialize Tavily Search Tool ---
 if not os.environ.get("TAVILY_API_KEY"):
     print("WARN: TAVILY_API_KEY not set. Web research will fail.")
-search_tool = TavilySearch(max_results=5)
+search_tool = CachedSearch(TavilySearch(max_results=5), search_cache)
 
+# -------------------------------
+# LLM helpers (shared pooled gateway)
+# -------------------------------
 def generate(prompt: str, max_tokens=512, temperature=0.7) -> str:
     """Use Groq API to generate text from prompt."""
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+    return gateway.complete(
+        prompt, model=PRIMARY_MODEL, max_tokens=max_tokens, temperature=temperature
     )
-    return completion.choices[0].message.content.strip()
 
 def generate_research(prompt: str, max_tokens=512, temperature=0.7) -> str:
     """Use Groq API (fast model) for research."""
     # This is now a fallback, but we keep it
-    completion = research_client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-        max_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+    return gateway.complete(
+        prompt, model=FAST_MODEL, max_tokens=max_tokens, temperature=temperature, cache=True
     )
-    return completion.choices[0].message.content.strip()
+
+# The news reviewer runs on the fast model
+agenerate_review = partial(_agenerate_review, model=FAST_MODEL)
 
 # -------------------------------
 # State Schema
@@ -57,8 +84,13 @@ class NewsArticleState(BaseModel):
 
     # 🔄 Workflow-generated fields
     research_notes: str | None = None # This will now be filled by Tavily
+    sources: List[Dict[str, Any]] = [] # Ranked source pack; ids match the [S#] markers
+    compact_research: str | None = None # Claim-bearing sentences of `sources`, used in prompts
     article_draft: str | None = None
     compliance_report: str | None = None
+    review_source: str = "" # "local" when the citation checker decided the verdict, else "llm"
+    llm_reviewed: bool = False # Set once the LLM reviewer has judged this article
+    review: ReviewVerdict | None = None # Typed verdict of the last review; drives routing
     revision_count: int = 0
     final_response: str | None = None
 
@@ -67,43 +99,74 @@ class NewsArticleState(BaseModel):
 # Nodes
 # -------------------------------
 
-def topic_research(state: NewsArticleState) -> Dict[str, Any]:
-    """Step 1: Research the topic using Tavily web search."""
+async def topic_research(state: NewsArticleState) -> Dict[str, Any]:
+    """
+    Step 1: Research the topic using Tavily web search.
+    The prompt is expanded into sub-queries (fast model) that are searched
+    concurrently; hits are merged into a ranked, de-duplicated source pack.
+    """
     print("--- RESEARCHING TOPIC (TAVILY) ---")
     prompt = state.prompt
-    
+
     try:
-        # Use the prompt to search the web
-        results = search_tool.invoke(prompt)
-        
-        # Format the results into a clean string
-        formatted_sources = []
-        for idx, hit in enumerate(results, start=1):
-            title = hit.get("title", "")
-            snippet = hit.get("content", "")
-            url = hit.get("url", "")
-            
-            # Create a [S#] style reference
-            formatted_sources.append(
-                f"[S{idx}] {title}\n"
-                f"Snippet: {snippet}\n"
-                f"URL: {url}"
-            )
-        
-        research_summary = "\n\n".join(formatted_sources)
-        if not research_summary:
-            research_summary = "No web search results found. Relying on internal knowledge."
+        # Search the raw prompt while the sub-queries are being written
+        prompt_search = asyncio.create_task(_search_hits(prompt))
+        try:
+            expansion = await agenerate_research(subquery_prompt(prompt), 200, 0.3)
+        except Exception as e:
+            print(f"Sub-query expansion failed, using the prompt only: {e}")
+            expansion = ""
+        queries = parse_subqueries(prompt, expansion, SUBQUERY_COUNT)
+        print(f"Research queries: {queries}")
+
+        hits_per_query = await asyncio.gather(
+            prompt_search, *(_search_hits(query) for query in queries[1:])
+        )
+        sources = build_source_pack(merge_hits(hits_per_query))
+        research_summary = format_source_pack(sources)
         print(research_summary)
-            
-        return {"research_notes": research_summary}
-        
+
+        return {"research_notes": research_summary, "sources": sources}
+
     except Exception as e:
         print(f"Error in Tavily search: {e}")
         # Fallback in case of error
         return {"research_notes": "Web research failed. Relying on internal knowledge."}
 
 
-def draft_article(state: NewsArticleState) -> Dict[str, Any]:
+async def _search_hits(query: str) -> List[Dict[str, Any]]:
+    """One Tavily search; a failed sub-query only costs its own hits."""
+    try:
+        return extract_hits(await search_tool.ainvoke(query))
+    except Exception as e:
+        print(f"Tavily search failed for {query!r}: {e}")
+        return []
+
+
+def compress_research(state: NewsArticleState) -> Dict[str, Any]:
+    """
+    Step 1b: Reduce the source pack to its claim-bearing sentences (keeping the
+    [S#] ids). Drafting, review and every revision re-send the research, so
+    they all use this compact pack instead of the raw snippets.
+    """
+    print("--- COMPRESSING RESEARCH ---")
+    if not state.sources:
+        return {"compact_research": state.research_notes}
+    compact = format_compact_pack(
+        compress_source_pack(state.sources, state.prompt), fallback=state.research_notes
+    )
+    print(
+        f"Research pack: ~{estimate_tokens(state.research_notes or '')} -> "
+        f"~{estimate_tokens(compact)} tokens"
+    )
+    return {"compact_research": compact}
+
+
+def research_for_prompt(state: NewsArticleState) -> str | None:
+    return state.compact_research or state.research_notes
+
+
+async def draft_article(state: NewsArticleState) -> Dict[str, Any]:
     """Step 2: Generate the main news article, using web research."""
     print("--- DRAFTING ARTICLE ---")
     
@@ -121,7 +184,7 @@ Audience: {state.audience}
 *** CITE SOURCES INLINE USING THE [S#] MARKERS. ***
 
 Key Research Findings:
-{state.research_notes}
+{research_for_prompt(state)}
 
 Additional Context / Existing Draft (if any):
 {state.additional_context}
@@ -136,12 +199,31 @@ Guidelines:
   3. Body (Develop the story, citing sources)
   4. Conclusion (Summarize or provide outlook)
 """
-    return {"article_draft": generate(prompt, 1500)}
+    return {"article_draft": await agenerate_stream(prompt, "draft_article", 1500)}
 
 
-def compliance_review(state: NewsArticleState) -> Dict[str, Any]:
-    """Step 3: Review the draft for accuracy and tone."""
+async def compliance_review(state: NewsArticleState) -> Dict[str, Any]:
+    """
+    Step 3: Review the draft for accuracy and tone.
+    A deterministic citation/length check runs first: mechanical problems are
+    sent back as a precise fix list without an LLM call. Once the check passes
+    the LLM reviewer judges accuracy and tone, unless it already reviewed this
+    article and the latest revision only fixed mechanical problems.
+    """
     print("--- REVIEWING DRAFT ---")
+    check = check_article(
+        state.article_draft or "",
+        [source["id"] for source in state.sources],
+        state.word_count,
+    )
+    mechanical_fix_verified = state.llm_reviewed and state.review_source == "local"
+    if check["issues"] or APPROVE_CLEAN_DRAFTS or mechanical_fix_verified:
+        review_metrics.record("local_revision" if check["issues"] else "local_approval", check)
+        review = local_review(check)
+        return {"compliance_report": format_review(review), "review": review, "review_source": "local"}
+
+    sections = split_sections(state.article_draft or "")
+
     prompt = f"""
 You are a meticulous Copy Editor.
 
@@ -151,24 +233,60 @@ Review the following news article for:
 - Clarity and readability for the target {state.audience}
 - **Crucially: Ensure [S#] citations are used for claims from the research.**
 
-Article Draft:
-{state.article_draft}
+Article Draft (split into numbered sections):
+{number_sections(sections)}
 
 Research Insights:
-{state.research_notes}
+{research_for_prompt(state)}
 
-Task:
-Return a report (in plain English) with two sections:
-1. Verdict: Must be one of - APPROVED or REVISION_NEEDED
-2. Observations: If REVISION_NEEDED, provide a bulleted list of specific changes. If APPROVED, say "No issues."
+{review_json_instructions()}
 """
-    return {"compliance_report": generate_research(prompt, 512)} # Use fast model for review
+    review = await areview(agenerate_review, prompt, len(sections)) # Use fast model for review
+    review_metrics.record("llm_review", check)
+    return {
+        "compliance_report": format_review(review),
+        "review": review,
+        "review_source": "llm",
+        "llm_reviewed": True,
+    }
 
 
-def revision_step(state: NewsArticleState) -> Dict[str, Any]:
-    """Step 4 (if needed): Revise the article based on feedback."""
+async def revision_step(state: NewsArticleState) -> Dict[str, Any]:
+    """
+    Step 4 (if needed): Revise the article based on feedback.
+    When every issue is addressed to a section, only those sections are
+    rewritten and spliced back; otherwise the full article is rewritten.
+    """
     print("--- REVISING DRAFT ---")
-    
+
+    async def rewrite_section(section: str, issues: List[str]) -> str:
+        notes = "\n".join(f"- {issue}" for issue in issues)
+        prompt = f"""
+You are a Journalist revising one section of your article based on your editor's feedback.
+
+Section to revise:
+{section}
+
+Editor's Feedback for this section:
+{notes}
+
+Task:
+Rewrite ONLY this section to address the feedback, keeping its heading (if any), roughly its length,
+the {state.tone} tone and the [S#] citations of the original research.
+Return only the revised section in Markdown, with no commentary.
+
+Original Research (for reference):
+{research_for_prompt(state)}
+"""
+        return await agenerate(prompt, section_max_tokens(section))
+
+    issues = state.review.issues if state.review else []
+    targeted = await revise_sections(state.article_draft or "", issues, rewrite_section)
+    if targeted is not None:
+        draft, revised = targeted
+        print(f"Revised sections {revised} only.")
+        return {"article_draft": draft, "revision_count": state.revision_count + 1}
+
     prompt = f"""
 You are a Journalist revising an article based on your editor's feedback.
 
@@ -183,11 +301,11 @@ Rewrite the full article to address all points in the feedback.
 Ensure the new draft is {state.word_count} words, maintains the {state.tone} tone, and properly CITES the original research.
 
 Original Research (for reference):
-{state.research_notes}
+{research_for_prompt(state)}
 """
     # Overwrite the old draft with the new, revised version
     return {
-        "article_draft": generate(prompt, 1500),
+        "article_draft": await agenerate(prompt, 1500),
         "revision_count": state.revision_count + 1,
     }
 
@@ -202,15 +320,15 @@ def finalize_package(state: NewsArticleState) -> Dict[str, Any]:
 # -------------------------------
 
 def should_revise(state: NewsArticleState) -> str:
-    """Check the compliance report for a verdict."""
+    """Route on the typed review verdict and severity."""
     
     # Safety check for max revisions to avoid infinite loops
     if state.revision_count >= 2:
         print("Max revisions reached. Finalizing.")
         return "finalize"
     
-    if "REVISION_NEEDED" in state.compliance_report.upper():
-        print("Compliance check failed. Routing to revision.")
+    if state.review and state.review.needs_revision():
+        print(f"Compliance check failed (severity {state.review.severity}). Routing to revision.")
         return "revise"
     else:
         print("Compliance check APPROVED. Routing to finalize.")
@@ -226,6 +344,7 @@ def build_news_article_graph() -> StateGraph:
 
     # Add nodes
     graph.add_node("topic_research", topic_research)
+    graph.add_node("compress_research", compress_research)
     graph.add_node("draft_article", draft_article)
     graph.add_node("compliance_review", compliance_review)
     graph.add_node("revision_step", revision_step)
@@ -233,7 +352,8 @@ def build_news_article_graph() -> StateGraph:
 
     # Define the graph flow
     graph.add_edge(START, "topic_research")
-    graph.add_edge("topic_research", "draft_article")
+    graph.add_edge("topic_research", "compress_research")
+    graph.add_edge("compress_research", "draft_article")
     graph.add_edge("draft_article", "compliance_review")
 
     # Add the conditional review loop
@@ -0,0 +1,268 @@
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from search import normalize_query
+
+# -------------------------------
+# Research budgets
+# -------------------------------
+SUBQUERY_COUNT = int(os.environ.get("NEWS_RESEARCH_SUBQUERIES", "4"))
+MAX_SOURCES = int(os.environ.get("NEWS_RESEARCH_MAX_SOURCES", "8"))
+SOURCE_TOKEN_BUDGET = int(os.environ.get("NEWS_RESEARCH_TOKEN_BUDGET", "2500"))
+SNIPPET_MAX_CHARS = int(os.environ.get("NEWS_RESEARCH_SNIPPET_CHARS", "1200"))
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get("NEWS_RESEARCH_DUPLICATE_THRESHOLD", "0.7"))
+# Budget of the compact pack (claim-bearing sentences only) pasted into every prompt
+COMPACT_TOKEN_BUDGET = int(os.environ.get("NEWS_COMPACT_TOKEN_BUDGET", "900"))
+# Sentences scoring below this carry no checkable claim (see `claim_score`)
+MIN_CLAIM_SCORE = 1.5
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]?\s+(?=[\"'(\[]?[A-Z0-9])")
+_NUMBER = re.compile(r"\d")
+_QUOTE = re.compile(r"[\"\u201c\u201d]")
+_MONTH = re.compile(
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b|\b(?:monday|tuesday|wednesday|"
+    r"thursday|friday|saturday|sunday|yesterday|today)\b",
+    re.IGNORECASE,
+)
+_ATTRIBUTION = re.compile(
+    r"\b(?:said|says|announced|reported|according|confirmed|approved|rejected|stated|told|"
+    r"estimated|found|showed|revealed|plans?|will|voted|signed|launched|filed|ruled)\b",
+    re.IGNORECASE,
+)
+_BOILERPLATE = re.compile(
+    r"\b(?:subscribe|sign up|newsletter|cookies?|advertisement|click here|read more|all rights "
+    r"reserved|follow us|log in|javascript)\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+    return len(text) // 4 + 1
+
+
+def subquery_prompt(prompt: str, count: int = SUBQUERY_COUNT) -> str:
+    return f"""
+You plan web research for a news article about:
+"{prompt}"
+
+Write {count} distinct web search queries that together cover the story: the core event,
+key people/organizations, background and context, and reactions or impact.
+Return ONLY the queries, one per line, without numbering or commentary.
+"""
+
+
+def parse_subqueries(prompt: str, text: str, count: int = SUBQUERY_COUNT) -> List[str]:
+    """The original prompt followed by up to `count` model-proposed queries, de-duplicated."""
+    queries: List[str] = []
+    seen = set()
+    for line in [prompt] + (text or "").splitlines():
+        query = _LIST_MARKER.sub("", line).strip().strip('"').strip()
+        key = normalize_query(query)
+        if len(query) < 3 or key in seen:
+            continue
+        seen.add(key)
+        queries.append(query)
+        if len(queries) > count:
+            break
+    return queries
+
+
+def extract_hits(results: Any) -> List[Dict[str, Any]]:
+    """Search hits from either Tavily tool (`TavilySearch` returns a dict, the older tool a list)."""
+    if isinstance(results, dict):
+        results = results.get("results") or []
+    if not isinstance(results, list):
+        return []
+    return [hit for hit in results if isinstance(hit, dict) and hit.get("url")]
+
+
+def canonical_url(url: str) -> str:
+    """URL identity for de-duplication: no scheme, `www.`, fragment, tracking params or trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode(
+        sorted((k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_"))
+    )
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def merge_hits(
+    hits_per_query: Iterable[List[Dict[str, Any]]],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Merge hits from every sub-query into ranked, de-duplicated sources.
+
+    Hits with the same canonical URL, or whose content is a near-duplicate
+    (word-shingle Jaccard >= `threshold`, e.g. syndicated wire copy), collapse
+    into one source that remembers how many queries found it. Sources are
+    ranked by Tavily score plus a bonus per extra query that surfaced them,
+    ties broken by URL so the order is deterministic.
+    """
+    sources: List[Dict[str, Any]] = []
+    by_url: Dict[str, Dict[str, Any]] = {}
+    for hits in hits_per_query:
+        for hit in hits:
+            content = (hit.get("content") or "").strip()
+            url_key = canonical_url(hit["url"])
+            source = by_url.get(url_key)
+            if source is None:
+                shingles = _shingles(content)
+                source = next(
+                    (s for s in sources if _similarity(shingles, s["_shingles"]) >= threshold),
+                    None,
+                )
+                if source is None:
+                    source = {
+                        "title": (hit.get("title") or "").strip(),
+                        "url": hit["url"],
+                        "content": content,
+                        "score": 0.0,
+                        "matches": 0,
+                        "_shingles": shingles,
+                    }
+                    sources.append(source)
+                by_url[url_key] = source
+            source["matches"] += 1
+            source["score"] = max(source["score"], float(hit.get("score") or 0.0))
+            if len(content) > len(source["content"]):
+                source["content"] = content
+
+    ranked = sorted(sources, key=lambda s: (-(s["score"] + 0.1 * (s["matches"] - 1)), s["url"]))
+    for source in ranked:
+        del source["_shingles"]
+    return ranked
+
+
+def build_source_pack(
+    sources: List[Dict[str, Any]],
+    *,
+    max_sources: int = MAX_SOURCES,
+    token_budget: int = SOURCE_TOKEN_BUDGET,
+    snippet_chars: int = SNIPPET_MAX_CHARS,
+) -> List[Dict[str, Any]]:
+    """
+    Take ranked sources in order until `max_sources` or the token budget is
+    reached, numbering them S1..Sn. The ids never change afterwards, so
+    drafts, reviews and revisions all cite the same [S#].
+    """
+    pack: List[Dict[str, Any]] = []
+    used = 0
+    for source in sources:
+        if len(pack) >= max_sources:
+            break
+        content = source["content"]
+        if len(content) > snippet_chars:
+            content = content[:snippet_chars].rsplit(" ", 1)[0] + " ..."
+        entry = {**source, "id": f"S{len(pack) + 1}", "content": content}
+        cost = estimate_tokens(format_source(entry))
+        if pack and used + cost > token_budget:
+            break
+        used += cost
+        pack.append(entry)
+    return pack
+
+
+def format_source(source: Dict[str, Any]) -> str:
+    return f"[{source['id']}] {source['title']}\nSnippet: {source['content']}\nURL: {source['url']}"
+
+
+def format_source_pack(pack: List[Dict[str, Any]], fallback: Optional[str] = None) -> str:
+    if not pack:
+        return fallback or "No web search results found. Relying on internal knowledge."
+    return "\n\n".join(format_source(source) for source in pack)
+
+
+# -------------------------------
+# Compact pack (claim extraction)
+# -------------------------------
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text or "") if sentence.strip()]
+
+
+def claim_score(sentence: str, topic_words: set) -> float:
+    """
+    How claim-bearing a sentence is: figures, dates, quotes, attributions,
+    named entities and overlap with the topic. Boilerplate scores zero.
+    """
+    words = _WORD.findall(sentence)
+    if len(words) < 5 or _BOILERPLATE.search(sentence):
+        return 0.0
+    score = 0.0
+    score += 2.0 if _NUMBER.search(sentence) else 0.0
+    score += 1.5 if _QUOTE.search(sentence) else 0.0
+    score += 1.0 if _ATTRIBUTION.search(sentence) else 0.0
+    score += 0.5 if _MONTH.search(sentence) else 0.0
+    score += min(1.5, 0.5 * sum(1 for word in words[1:] if word[:1].isupper()))
+    overlap = len({word.lower() for word in words} & topic_words)
+    score += min(2.0, 0.5 * overlap)
+    return score
+
+
+def extract_claims(content: str, topic: str, token_budget: int) -> List[str]:
+    """Best claim-bearing sentences of `content` that fit `token_budget`, in original order."""
+    topic_words = set(normalize_query(topic).split())
+    # Snippets often repeat sentences (teasers, pull quotes); keep the first occurrence
+    sentences = list(dict.fromkeys(split_sentences(content)))
+    ranked = sorted(
+        ((claim_score(sentence, topic_words), index) for index, sentence in enumerate(sentences)),
+        key=lambda item: (-item[0], item[1]),
+    )
+    chosen, used = [], 0
+    for score, index in ranked:
+        if score < MIN_CLAIM_SCORE:
+            break
+        cost = estimate_tokens(sentences[index])
+        if chosen and used + cost > token_budget:
+            continue
+        chosen.append(index)
+        used += cost
+    return [sentences[index] for index in sorted(chosen)]
+
+
+def compress_source_pack(
+    pack: List[Dict[str, Any]], topic: str, token_budget: int = COMPACT_TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """
+    Reduce every source to its claim-bearing sentences, sharing `token_budget`
+    evenly across sources. Ids, titles and URLs are kept so [S#] citations
+    still resolve; sources with no claims are dropped.
+    """
+    if not pack:
+        return []
+    per_source = max(40, token_budget // len(pack))
+    compact = []
+    for source in pack:
+        claims = extract_claims(source["content"], f"{topic} {source['title']}", per_source)
+        if claims:
+            compact.append({"id": source["id"], "title": source["title"], "url": source["url"], "claims": claims})
+    return compact
+
+
+def format_compact_pack(compact: List[Dict[str, Any]], fallback: Optional[str] = None) -> str:
+    if not compact:
+        return fallback or "No web search results found. Relying on internal knowledge."
+    blocks = []
+    for source in compact:
+        domain = urlsplit(source["url"]).netloc.removeprefix("www.")
+        claims = "\n".join(f"- {claim}" for claim in source["claims"])
+        blocks.append(f"[{source['id']}] {source['title']} ({domain})\n{claims}")
+    return "\n\n".join(blocks)
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, HTTPException, Request
+from api.sse import sse_response
+from jobs import job_queue
 from .agent_news_workflow import NewsArticleWorkflowAgent
 import uuid
 
@@ -27,19 +29,35 @@ agent.compile()
 # -------------------------------
 # News Article Generation Endpoint
 # -------------------------------
+async def prepare_request(request: Request) -> tuple:
+    """Read the frontend JSON, resolve the threadId and normalize it."""
+    payload = await request.json()
+    print("Received news payload:", payload)  # Debug log
+
+    # Use thread_id from payload if provided, else create a new one
+    thread_id = payload.get("threadId") or str(uuid.uuid4())
+
+    normalized_payload = normalize_news_input(payload)
+    normalized_payload["threadId"] = thread_id # Pass thread_id to the agent
+    print("Normalized news payload:", normalized_payload)  # Debug log
+    return thread_id, normalized_payload
+
+
+def build_response(thread_id: str, result: dict, normalized_payload: dict) -> dict:
+    # Return the 'generated_article' key, as expected by the frontend
+    return {
+        "status": "success",
+        "threadId": thread_id,
+        "generated_article": result.get("data", {}).get("article_draft", "No article generated"),
+        "received_data": normalized_payload
+    }
+
+
 @router.post("/generate-news-article")
 async def generate_news_article(request: Request):
     """Receives frontend JSON, normalizes it, and runs the news article workflow."""
     try:
-        payload = await request.json()
-        print("Received news payload:", payload)  # Debug log
-
-        # Use thread_id from payload if provided, else create a new one
-        thread_id = payload.get("threadId") or str(uuid.uuid4())
-        
-        normalized_payload = normalize_news_input(payload)
-        normalized_payload["threadId"] = thread_id # Pass thread_id to the agent
-        print("Normalized news payload:", normalized_payload)  # Debug log
+        thread_id, normalized_payload = await prepare_request(request)
 
         # Call the news agent
         result = await agent.ainvoke(normalized_payload, thread_id=thread_id)
@@ -48,14 +66,35 @@ async def generate_news_article(request: Request):
         if result.get("status") == "error":
              raise Exception(result.get("message", "Unknown agent error"))
 
-        # Return the 'generated_article' key, as expected by the frontend
-        return {
-            "status": "success",
-            "threadId": thread_id,
-            "generated_article": result.get("data", {}).get("article_draft", "No article generated"),
-            "received_data": normalized_payload
-        }
+        return build_response(thread_id, result, normalized_payload)
 
     except Exception as e:
         print(f"Error in /generate-news-article: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def run_news_job(payload: dict, thread_id: str) -> dict:
+    """Background-job runner for the news article workflow (see jobs.router)."""
+    normalized_payload = normalize_news_input(payload)
+    normalized_payload["threadId"] = thread_id
+    result = await agent.ainvoke(normalized_payload, thread_id=thread_id)
+    if result.get("status") == "error":
+        raise RuntimeError(result.get("message", "Unknown agent error"))
+    return build_response(thread_id, result, normalized_payload)
+
+
+job_queue.register("news", run_news_job)
+
+
+@router.post("/generate-news-article/stream")
+async def generate_news_article_stream(request: Request):
+    """Same workflow as /generate-news-article, streamed as Server-Sent Events (node, token, result)."""
+    try:
+        thread_id, normalized_payload = await prepare_request(request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return sse_response(
+        agent.astream(normalized_payload),
+        lambda result: build_response(thread_id, result, normalized_payload),
+    )
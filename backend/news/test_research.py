@@ -0,0 +1,156 @@
+# test_research.py
+# Multi-query news research: sub-query expansion, concurrent search, de-duplication, [S#] pack.
+import asyncio
+
+from news import news_workflow_model as model
+from news.research import (
+    build_source_pack,
+    canonical_url,
+    compress_source_pack,
+    estimate_tokens,
+    format_compact_pack,
+    format_source_pack,
+    merge_hits,
+    parse_subqueries,
+)
+
+WIRE_STORY = (
+    "The European Parliament approved the AI Act on Wednesday, setting the first comprehensive "
+    "rules for artificial intelligence, with fines of up to seven percent of global turnover."
+)
+
+
+def hit(url, content, score=0.5, title="Title"):
+    return {"url": url, "content": content, "score": score, "title": title}
+
+
+def test_parse_subqueries_strips_markers_and_duplicates():
+    text = '1. EU AI Act vote results\n- "AI Act fines"\n\n* ai act fines\n2) Reactions from tech companies'
+
+    queries = parse_subqueries("EU AI Act", text, count=4)
+
+    assert queries == ["EU AI Act", "EU AI Act vote results", "AI Act fines", "Reactions from tech companies"]
+    assert parse_subqueries("EU AI Act", "", count=4) == ["EU AI Act"]
+
+
+def test_canonical_url_ignores_tracking_and_cosmetics():
+    assert canonical_url("https://www.Example.com/news/ai/?utm_source=x#top") == canonical_url(
+        "http://example.com/news/ai"
+    )
+
+
+def test_merge_collapses_url_and_near_duplicates_and_ranks():
+    merged = merge_hits(
+        [
+            [hit("https://reuters.com/ai-act", WIRE_STORY, 0.6), hit("https://blog.example/opinion", "An opinion piece.", 0.9)],
+            [
+                hit("https://www.reuters.com/ai-act/?utm_medium=rss", WIRE_STORY, 0.5),
+                hit("https://news.example/syndicated", WIRE_STORY + " Reporting by staff.", 0.4),
+            ],
+        ]
+    )
+
+    assert [source["url"] for source in merged] == ["https://blog.example/opinion", "https://reuters.com/ai-act"]
+    assert merged[1]["matches"] == 3
+    assert merged[1]["content"].endswith("Reporting by staff.")
+
+
+def test_source_pack_respects_budget_and_numbers_sources():
+    sources = merge_hits([[hit(f"https://site{i}.com", f"unique story {i} " * 50, 1 - i / 10) for i in range(6)]])
+
+    pack = build_source_pack(sources, max_sources=5, token_budget=400, snippet_chars=300)
+
+    assert [source["id"] for source in pack] == [f"S{i}" for i in range(1, len(pack) + 1)]
+    assert 1 < len(pack) < 5
+    assert all(len(source["content"]) <= 304 for source in pack)
+    assert format_source_pack(pack).startswith("[S1] Title\nSnippet: unique story 0")
+
+
+class StubSearch:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.queries = []
+
+    async def ainvoke(self, query):
+        self.queries.append(query)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        slug = query.lower().replace(" ", "-")
+        # TavilySearch returns a dict with a "results" list
+        return {"results": [hit(f"https://example.com/{slug}", f"Coverage of {query} " * 5), hit("https://reuters.com/ai-act", WIRE_STORY, 0.9)]}
+
+
+def test_topic_research_runs_subqueries_concurrently(monkeypatch):
+    search = StubSearch()
+
+    async def expand(prompt, *args, **kwargs):
+        await asyncio.sleep(0.05)
+        return "AI Act vote\nAI Act fines\nAI Act industry reaction"
+
+    monkeypatch.setattr(model, "search_tool", search)
+    monkeypatch.setattr(model, "agenerate_research", expand)
+
+    update = asyncio.run(model.topic_research(model.NewsArticleState(prompt="EU AI Act")))
+
+    assert search.queries[0] == "EU AI Act"  # searched while the sub-queries were written
+    assert len(search.queries) == 4
+    assert search.peak >= 3
+    sources = update["sources"]
+    assert [s["url"] for s in sources].count("https://reuters.com/ai-act") == 1
+    assert sources[0]["id"] == "S1" and sources[0]["url"] == "https://reuters.com/ai-act"
+    assert update["research_notes"].startswith("[S1] Title")
+
+
+ARTICLE = (
+    "Sign up for our newsletter to get the latest updates. "
+    "The European Parliament approved the AI Act on Wednesday by 523 votes to 46. "
+    "It was a long day in Strasbourg and the weather was cold. "
+    '"This is a historic moment," said Internal Market Commissioner Thierry Breton. '
+    "Companies that break the rules face fines of up to 7% of global turnover. "
+    "Many people have opinions about technology and the future. "
+    "Click here to read more stories like this one. "
+) * 3
+
+
+def test_compact_pack_keeps_claims_and_ids_under_budget():
+    pack = build_source_pack(merge_hits([[hit("https://reuters.com/ai-act", ARTICLE, 0.9, "AI Act passes")]]))
+
+    compact = compress_source_pack(pack, "EU AI Act vote", token_budget=120)
+    text = format_compact_pack(compact)
+
+    assert compact[0]["id"] == "S1"
+    assert text.startswith("[S1] AI Act passes (reuters.com)\n- ")
+    assert "523 votes" in text and "7% of global turnover" in text
+    assert "newsletter" not in text and "weather" not in text and "Click here" not in text
+    assert estimate_tokens(text) <= 120 + 20
+    assert estimate_tokens(text) < estimate_tokens(format_source_pack(pack)) / 3
+
+
+def test_prompts_use_the_compact_pack(monkeypatch):
+    prompts = []
+
+    async def record(prompt, *args, **kwargs):
+        prompts.append(prompt)
+        return '{"verdict": "APPROVED", "issues": []}'
+
+    monkeypatch.setattr(model, "agenerate_stream", record)
+    monkeypatch.setattr(model, "agenerate_review", record)
+    pack = build_source_pack(merge_hits([[hit("https://reuters.com/ai-act", ARTICLE, 0.9)]]))
+    state = model.NewsArticleState(
+        prompt="EU AI Act", research_notes=format_source_pack(pack), sources=pack
+    )
+    state = state.model_copy(update=model.compress_research(state))
+
+    asyncio.run(model.draft_article(state))
+    # One-word target so the local citation/length check passes and the LLM reviewer runs
+    asyncio.run(
+        model.compliance_review(state.model_copy(update={"article_draft": "Draft [S1]", "word_count": 1}))
+    )
+
+    assert len(prompts) == 2
+    for prompt in prompts:
+        assert state.compact_research in prompt
+        assert "Sign up for our newsletter" not in prompt
@@ -0,0 +1,15 @@
+"""
+Shared web-search layer used by the research nodes.
+
+Wraps the Tavily LangChain tools with a short-lived result cache keyed by the
+normalized query, coalescing identical in-flight searches.
+"""
+
+from .cache import CachedSearch, SearchCache, normalize_query, search_cache
+
+__all__ = [
+    "CachedSearch",
+    "SearchCache",
+    "normalize_query",
+    "search_cache",
+]
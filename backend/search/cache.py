@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+# News goes stale quickly, so search results are only reused for a few minutes
+SEARCH_CACHE_ENABLED = os.environ.get("SEARCH_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", "600"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+
+# Interrogatives are deliberately kept: "why was X fired" and "when was X fired"
+# ask different questions and must not share a cache entry
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from in is it of on or the this to with about into over
+    than that these those was were will
+    """.split()
+)
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, collapse whitespace/punctuation and drop stopwords, keeping word order."""
+    words = _WORD.findall((query or "").lower())
+    content = [word for word in words if word not in STOPWORDS]
+    return " ".join(content or words)
+
+
+def is_error_result(results: Any) -> bool:
+    """
+    The Tavily tools report API failures (rate limits, 5xx) as results instead
+    of raising: `TavilySearch` returns `{"error": ...}`, `TavilySearchResults`
+    an error string. Those must reach the caller but never be cached.
+    """
+    return isinstance(results, str) or (isinstance(results, dict) and "error" in results)
+
+
+class SearchCache:
+    """In-memory LRU of search results with a short TTL."""
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES, ttl: float = SEARCH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, copy.deepcopy(entry[1])
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: str, results: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_coalesced(self) -> None:
+        """Count a lookup that joined an identical in-flight search (wrappers may share one cache)."""
+        with self._lock:
+            self.coalesced += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class CachedSearch:
+    """
+    Drop-in wrapper around a LangChain search tool (`TavilySearch`,
+    `TavilySearchResults`) exposing the same `invoke` / `ainvoke`. Results are
+    cached per normalized query, and identical queries already in flight share
+    a single upstream call. Failures, raised or returned as error payloads,
+    reach every waiter but are never cached.
+    """
+
+    def __init__(self, tool: Any, cache: Optional[SearchCache] = None, namespace: Optional[str] = None):
+        self.tool = tool
+        self.cache = cache
+        # Different tools / result counts return different shapes
+        self.namespace = namespace or f"{type(tool).__name__}:{getattr(tool, 'max_results', '')}"
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._sync_inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def key(self, query: str) -> str:
+        return f"{self.namespace}|{normalize_query(query)}"
+
+    async def ainvoke(self, query: str) -> Any:
+        if self.cache is None:
+            return await self.tool.ainvoke(query)
+        key = self.key(query)
+        found, results = self.cache.get(key)
+        if found:
+            return results
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is not None and inflight[0] is loop:
+                self.cache.record_coalesced()
+                future = inflight[1]
+                leader = False
+            else:
+                future = loop.create_future()
+                self._inflight[key] = (loop, future)
+                leader = True
+
+        if not leader:
+            return copy.deepcopy(await asyncio.shield(future))
+
+        try:
+            results = await self.tool.ainvoke(query)
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody else was waiting
+            else:  # cancelled: waiters must not hang on the abandoned call
+                future.cancel()
+            raise
+        else:
+            if not is_error_result(results):
+                self.cache.set(key, results)
+            future.set_result(results)
+            return results
+        finally:
+            with self._lock:
+                if self._inflight.get(key, (None, None))[1] is future:
+                    del self._inflight[key]
+
+    def invoke(self, query: str) -> Any:
+        if self.cache is None:
+            return self.tool.invoke(query)
+        key = self.key(query)
+        found, results = self.cache.get(key)
+        if found:
+            return results
+
+        with self._lock:
+            future = self._sync_inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._sync_inflight[key] = Future()
+            else:
+                self.cache.record_coalesced()
+
+        if not leader:
+            # Another thread is fetching this query; reuse its result (or failure) once it lands
+            return copy.deepcopy(future.result())
+
+        try:
+            results = self.tool.invoke(query)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            if not is_error_result(results):
+                self.cache.set(key, results)
+            future.set_result(results)
+            return results
+        finally:
+            with self._lock:
+                self._sync_inflight.pop(key, None)
+
+
+# Shared by every workflow that searches the web
+search_cache = SearchCache() if SEARCH_CACHE_ENABLED else None
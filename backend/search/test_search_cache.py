@@ -0,0 +1,163 @@
+# test_search_cache.py
+# Search result cache: query normalization, TTL, and coalescing of in-flight identical queries.
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from search import CachedSearch, SearchCache, normalize_query
+
+class StubTool:
+    def __init__(self, delay=0.05, fail=False, error=None):
+        self.delay = delay
+        self.fail = fail
+        self.error = error  # payload returned instead of raising, like the Tavily tools
+        self.max_results = 5
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def _result(self, query):
+        with self._lock:
+            self.queries.append(query)
+        if self.fail:
+            raise RuntimeError("tavily down")
+        if self.error is not None:
+            return self.error
+        return {"query": query, "results": [{"url": "https://example.com", "content": "x"}]}
+
+    async def ainvoke(self, query):
+        await asyncio.sleep(self.delay)
+        return self._result(query)
+
+    def invoke(self, query):
+        time.sleep(self.delay)
+        return self._result(query)
+
+def test_normalize_query():
+    assert normalize_query("  Latest   LinkedIn trends for AI! ") == "latest linkedin trends ai"
+    assert normalize_query("latest linkedin TRENDS for the AI") == "latest linkedin trends ai"
+    assert normalize_query("is it the") == "is it the"  # only stopwords: keep them
+
+
+def test_interrogatives_keep_queries_apart():
+    assert normalize_query("Why was the CEO fired") == "why ceo fired"
+    assert normalize_query("Why was the CEO fired") != normalize_query("When was the CEO fired")
+
+    tool = StubTool(delay=0)
+    search = CachedSearch(tool, SearchCache())
+    asyncio.run(search.ainvoke("Why was the CEO fired"))
+    asyncio.run(search.ainvoke("When was the CEO fired"))
+
+    assert len(tool.queries) == 2
+
+def test_normalized_variants_share_one_entry():
+    tool = StubTool(delay=0)
+    search = CachedSearch(tool, SearchCache())
+
+    first = asyncio.run(search.ainvoke("Latest LinkedIn trends for AI"))
+    second = asyncio.run(search.ainvoke("latest  linkedin trends for the ai"))
+
+    assert first == second
+    assert len(tool.queries) == 1
+    assert search.cache.stats()["hits"] == 1
+
+def test_identical_in_flight_queries_are_coalesced():
+    tool = StubTool()
+    search = CachedSearch(tool, SearchCache())
+
+    async def burst():
+        return await asyncio.gather(*(search.ainvoke("AI regulation news") for _ in range(10)))
+
+    results = asyncio.run(burst())
+
+    assert len(tool.queries) == 1
+    assert all(result == results[0] for result in results)
+    assert search.cache.stats()["coalesced"] == 9
+
+def test_failures_reach_waiters_and_are_not_cached():
+    tool = StubTool(fail=True)
+    search = CachedSearch(tool, SearchCache())
+
+    async def burst():
+        return await asyncio.gather(*(search.ainvoke("q") for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(burst()))
+    tool.fail = False
+    assert asyncio.run(search.ainvoke("q"))["query"] == "q"
+    assert len(tool.queries) == 2
+
+def test_error_payloads_reach_waiters_and_are_not_cached():
+    # TavilySearch returns {"error": e}, TavilySearchResults repr(e), instead of raising
+    for payload in ({"error": RuntimeError("429 rate limited")}, "HTTPError('503 Service Unavailable')"):
+        tool = StubTool(error=payload)
+        search = CachedSearch(tool, SearchCache())
+
+        async def burst():
+            return await asyncio.gather(*(search.ainvoke("q") for _ in range(3)))
+
+        assert [repr(result) for result in asyncio.run(burst())] == [repr(payload)] * 3
+        assert len(tool.queries) == 1  # waiters shared the failed call
+        assert repr(search.invoke("q")) == repr(payload)
+        assert len(tool.queries) == 2
+
+        tool.error = None
+        assert search.invoke("q")["query"] == "q"
+        assert len(tool.queries) == 3
+
+def test_entries_expire_after_ttl():
+    tool = StubTool(delay=0)
+    search = CachedSearch(tool, SearchCache(ttl=0.05))
+
+    search.invoke("q")
+    time.sleep(0.1)
+    search.invoke("q")
+
+    assert len(tool.queries) == 2
+
+def test_sync_invoke_coalesces_across_threads():
+    tool = StubTool()
+    search = CachedSearch(tool, SearchCache())
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(search.invoke, ["Trends for X"] * 8))
+
+    assert len(tool.queries) == 1
+    assert all(result == results[0] for result in results)
+
+def test_sync_waiters_share_a_failed_call():
+    tool = StubTool(error="HTTPError('429 Too Many Requests')")
+    search = CachedSearch(tool, SearchCache())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(search.invoke, ["q"] * 4))
+
+    assert results == [tool.error] * 4
+    assert len(tool.queries) == 1
+    assert search.cache.stats()["entries"] == 0
+
+def test_tools_with_different_shapes_do_not_share_entries():
+    cache = SearchCache()
+    news, trends = StubTool(delay=0), StubTool(delay=0)
+    trends.max_results = 3
+
+    asyncio.run(CachedSearch(news, cache).ainvoke("q"))
+    asyncio.run(CachedSearch(trends, cache).ainvoke("q"))
+
+    assert len(news.queries) == len(trends.queries) == 1
+
+def test_wrappers_sharing_a_cache_count_every_coalesced_lookup():
+    cache = SearchCache()
+    news, trends = CachedSearch(StubTool(), cache), CachedSearch(StubTool(), cache, namespace="trends")
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda search: search.invoke("q"), [news, trends] * 8))
+
+    stats = cache.stats()
+    assert stats["coalesced"] + stats["hits"] == 14  # one upstream call per wrapper, no lost counts
+
+def test_cached_results_are_isolated_copies():
+    search = CachedSearch(StubTool(delay=0), SearchCache())
+
+    search.invoke("q")["results"].clear()
+
+    assert search.invoke("q")["results"]
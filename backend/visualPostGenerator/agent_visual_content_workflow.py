@@ -1,12 +1,30 @@
-from typing import Dict, Any
-from pydantic import BaseModel
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, model_validator
 from .visual_content_workflow_model import build_visual_content_graph, VisualPostState
+from .vision_client import VisionError
 
 # Pydantic model to validate the input from the frontend
 class VisualPostInput(BaseModel):
     image_base64: str
     context: str
-    platform: str
+    platform: Optional[str] = None
+    # Several platforms in one request share a single caption
+    platforms: List[str] = []
+
+    @model_validator(mode="after")
+    def check_platforms(self) -> "VisualPostInput":
+        if not self.target_platforms():
+            raise ValueError("Provide a platform or a list of platforms.")
+        return self
+
+    def target_platforms(self) -> List[str]:
+        """`platform` followed by `platforms`, de-duplicated case-insensitively."""
+        targets: List[str] = []
+        for name in ([self.platform] if self.platform else []) + self.platforms:
+            name = name.strip()
+            if name and name.lower() not in (t.lower() for t in targets):
+                targets.append(name)
+        return targets
 
 class VisualContentAgent:
     """
@@ -20,7 +38,7 @@ class VisualContentAgent:
         """
         self.graph = build_visual_content_graph()
 
-    def invoke(self, data: VisualPostInput) -> Dict[str, Any]:
+    async def ainvoke(self, data: VisualPostInput) -> Dict[str, Any]:
         """
         Runs the visual content workflow.
 
@@ -28,31 +46,39 @@ class VisualContentAgent:
             data: A VisualPostInput object from the frontend.
 
         Returns:
-            A dictionary containing the 'generated_post'.
+            A dictionary containing 'generated_posts' (platform -> post) and
+            'generated_post' (the post for the first platform).
         """
         try:
             # 1. Prepare the initial state
             # The keys must match the VisualPostState model
+            platforms = data.target_platforms()
             initial_state: VisualPostState = {
                 "image_base64": data.image_base64,
                 "context": data.context,
-                "platform": data.platform,
+                "platforms": platforms,
                 "image_caption": None, # Will be filled by Node 1
-                "final_post": None,    # Will be filled by Node 2
+                "final_posts": {},     # Will be filled by Node 2
             }
 
             # 2. Run the graph
-            # This will execute the full chain: BLIP -> Groq
-            final_state = self.graph.invoke(initial_state)
+            # This will execute the full chain: vision -> (Tavily per platform) -> Groq per platform
+            final_state = await self.graph.ainvoke(initial_state)
 
-            # 3. Extract the final post
-            generated_post = final_state.get("final_post")
-            if generated_post is None:
-                raise Exception("Workflow finished but final_post was not generated.")
+            # 3. Extract the final posts
+            generated_posts = final_state.get("final_posts") or {}
+            if not generated_posts:
+                raise Exception("Workflow finished but no posts were generated.")
 
             # 4. Return the response in the format the frontend expects
-            return {"generated_post": generated_post}
+            return {
+                "generated_post": generated_posts.get(platforms[0]),
+                "generated_posts": generated_posts,
+            }
 
+        except VisionError:
+            # Let the router report the vision endpoint as unavailable
+            raise
         except Exception as e:
             print(f"Error during visual content workflow: {e}")
             # Return an error key so the router can catch it
@@ -0,0 +1,150 @@
+import base64
+import binascii
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+CAPTION_CACHE_MAX_ENTRIES = int(os.environ.get("VISUAL_CAPTION_CACHE_MAX_ENTRIES", "512"))
+CAPTION_CACHE_TTL = float(os.environ.get("VISUAL_CAPTION_CACHE_TTL", "86400"))
+# Perceptual tier: also match re-encoded / resized copies of a cached image
+CAPTION_CACHE_PERCEPTUAL = os.environ.get("VISUAL_CAPTION_CACHE_PERCEPTUAL", "0") == "1"
+CAPTION_CACHE_MAX_DISTANCE = int(os.environ.get("VISUAL_CAPTION_CACHE_MAX_DISTANCE", "4"))
+
+
+def split_data_url(image_base64: str) -> str:
+    """Strip a `data:image/...;base64,` prefix, returning only the Base64 payload."""
+    header, sep, encoded = image_base64.partition(",")
+    return encoded if sep else image_base64
+
+
+def decode_image(image_base64: str) -> Optional[bytes]:
+    """Decoded image bytes of a data URL / raw Base64 string, or None if it is not valid Base64."""
+    try:
+        return base64.b64decode(split_data_url(image_base64), validate=False)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def content_hash(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def perceptual_hash(image_bytes: bytes) -> Optional[int]:
+    """64-bit difference hash (dHash); None when Pillow is missing or the bytes are not an image."""
+    try:
+        from PIL import Image
+    except ImportError:  # pragma: no cover - Pillow is optional for this tier
+        return None
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            pixels = list(image.convert("L").resize((9, 8)).getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+class CaptionCache:
+    """
+    LRU cache of vision-model captions keyed by the SHA-256 of the decoded image
+    bytes. With `perceptual=True` a miss on the exact hash falls back to the
+    closest cached dHash within `max_distance` bits.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CAPTION_CACHE_MAX_ENTRIES,
+        ttl: float = CAPTION_CACHE_TTL,
+        *,
+        perceptual: bool = CAPTION_CACHE_PERCEPTUAL,
+        max_distance: int = CAPTION_CACHE_MAX_DISTANCE,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.perceptual = perceptual
+        self.max_distance = max_distance
+        # content hash -> (stored_at, perceptual hash, caption)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[int], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.perceptual_hits = 0
+        self.misses = 0
+
+    def get(self, image_bytes: bytes) -> Optional[str]:
+        key = content_hash(image_bytes)
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                self.exact_hits += 1
+                return entry[2]
+        if self.perceptual:
+            caption = self._closest(perceptual_hash(image_bytes))
+            if caption is not None:
+                return caption
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, image_bytes: bytes, caption: str) -> None:
+        key = content_hash(image_bytes)
+        phash = perceptual_hash(image_bytes) if self.perceptual else None
+        with self._lock:
+            self._entries[key] = (time.time(), phash, caption)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.exact_hits + self.perceptual_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "perceptual_hits": self.perceptual_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _live_entry(self, key: str) -> Optional[Tuple[float, Optional[int], str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _closest(self, phash: Optional[int]) -> Optional[str]:
+        if phash is None:
+            return None
+        with self._lock:
+            best_key, best_distance = None, self.max_distance + 1
+            for key, (stored_at, other, _) in self._entries.items():
+                if other is None or time.time() - stored_at > self.ttl:
+                    continue
+                distance = bin(phash ^ other).count("1")
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+            if best_key is None:
+                return None
+            self.perceptual_hits += 1
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][2]
+
+
+# Global instance shared by the visual post workflow
+caption_cache = CaptionCache()
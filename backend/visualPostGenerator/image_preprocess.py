@@ -0,0 +1,104 @@
+import base64
+import io
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+# The captioning model works on small inputs; phone photos are downscaled to
+# this longest edge and re-encoded as JPEG before upload.
+VISION_MAX_EDGE = int(os.environ.get("VISUAL_IMAGE_MAX_EDGE", "768"))
+VISION_JPEG_QUALITY = int(os.environ.get("VISUAL_IMAGE_JPEG_QUALITY", "85"))
+VISION_PREPROCESS = os.environ.get("VISUAL_IMAGE_PREPROCESS", "1") == "1"
+
+
+def prepare_image(
+    image_bytes: bytes,
+    *,
+    max_edge: int = VISION_MAX_EDGE,
+    quality: int = VISION_JPEG_QUALITY,
+) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Downscale `image_bytes` so its longest edge is at most `max_edge` and
+    re-encode it as JPEG. The original bytes are returned unchanged when they
+    cannot be decoded or re-encoding would not make them smaller.
+    """
+    started = time.perf_counter()
+    info: Dict[str, Any] = {"original_bytes": len(image_bytes), "resized": False}
+    try:
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image = ImageOps.exif_transpose(image)
+            info["original_size"] = image.size
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, "white")
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            if max(image.size) > max_edge:
+                image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+                info["resized"] = True
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+            info["upload_size"] = image.size
+        encoded = buffer.getvalue()
+    except Exception as exc:  # not an image Pillow understands: send as-is
+        print(f"Warning: image preprocessing skipped: {exc}")
+        encoded = image_bytes
+
+    if len(encoded) >= len(image_bytes):
+        encoded = image_bytes
+    info["upload_bytes"] = len(encoded)
+    info["bytes_saved"] = len(image_bytes) - len(encoded)
+    info["preprocess_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return encoded, info
+
+
+def encode_base64(image_bytes: bytes) -> str:
+    return base64.b64encode(image_bytes).decode("ascii")
+
+
+class VisionUploadMetrics:
+    """Running totals of bytes saved by preprocessing and vision call latency."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.original_bytes = 0
+            self.upload_bytes = 0
+            self.preprocess_ms = 0.0
+            self.upload_ms = 0.0
+            self.last: Dict[str, Any] = {}
+
+    def record(self, info: Dict[str, Any], upload_ms: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.original_bytes += info["original_bytes"]
+            self.upload_bytes += info["upload_bytes"]
+            self.preprocess_ms += info["preprocess_ms"]
+            self.upload_ms += upload_ms
+            self.last = {**info, "upload_ms": round(upload_ms, 2)}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.requests or 1
+            return {
+                "requests": self.requests,
+                "original_bytes": self.original_bytes,
+                "upload_bytes": self.upload_bytes,
+                "bytes_saved": self.original_bytes - self.upload_bytes,
+                "avg_preprocess_ms": round(self.preprocess_ms / requests, 2),
+                "avg_upload_ms": round(self.upload_ms / requests, 2),
+                "last": dict(self.last),
+            }
+
+
+# Global instance shared by the visual post workflow and the metrics endpoint
+vision_upload_metrics = VisionUploadMetrics()
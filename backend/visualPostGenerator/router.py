@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from .agent_visual_content_workflow import VisualContentAgent, VisualPostInput
+from .vision_client import VisionError
 
 # -------------------------------
 # Initialize Router & Agent
@@ -23,15 +24,15 @@ except Exception as e:
 # New Visual Content Endpoint
 # -------------------------------
 @router.post("/generate-visual-post")
-def generate_visual_post(input_data: VisualPostInput):
+async def generate_visual_post(input_data: VisualPostInput):
     """
-    Receives an image (Base64), text context, and a platform.
+    Receives an image (Base64), text context, and a platform (or a list of platforms).
     Runs the full workflow:
-    1. Vision Model (Image caption)
-    2. Tavily (Trend research)
-    3. Groq (Post generation)
+    1. Vision Model (Image caption, once)
+    2. Tavily (Trend research, per platform in parallel)
+    3. Groq (Post generation, per platform in parallel)
 
-    Returns a single generated post.
+    Returns the post for the first platform plus every post keyed by platform.
     """
     if visual_agent is None:
         raise HTTPException(
@@ -41,20 +42,27 @@ def generate_visual_post(input_data: VisualPostInput):
 
     try:
         # Debug log
-        print(f"Received visual post request for platform: {input_data.platform}")
+        print(f"Received visual post request for platforms: {input_data.target_platforms()}")
 
-        # Use the synchronous 'invoke' method
-        # FastAPI will handle this in a threadpool
-        result = visual_agent.invoke(input_data)
+        result = await visual_agent.ainvoke(input_data)
 
         # The agent's invoke method returns an "error" key on failure
         if "error" in result:
             print(f"Error in /generate-visual-post: {result['error']}")
             raise HTTPException(status_code=500, detail=result["error"])
 
-        # Success: return the generated post
-        return {"status": "success", "generated_post": result.get("generated_post")}
+        # Success: return the generated post(s)
+        return {
+            "status": "success",
+            "generated_post": result.get("generated_post"),
+            "generated_posts": result.get("generated_posts"),
+        }
 
+    except HTTPException:
+        raise
+    except VisionError as e:
+        print(f"Vision endpoint error in /generate-visual-post: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         print(f"Unhandled error in /generate-visual-post: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,109 @@
+# test_caption_cache.py
+# Caption cache keyed by image content hash (+ optional perceptual tier); vision endpoint stubbed.
+import base64
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from visualPostGenerator import visual_content_workflow_model as model
+from visualPostGenerator.caption_cache import CaptionCache
+from visualPostGenerator.vision_client import VisionError
+
+
+def _image(fmt="PNG", size=(256, 192), quality=95):
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([20, 20, size[0] // 2, size[1] // 2], fill="navy")
+    draw.ellipse([size[0] // 2, size[1] // 3, size[0] - 10, size[1] - 10], fill="orange")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **({"quality": quality} if fmt == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def _reencoded(image_bytes, size, fmt="JPEG"):
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        buffer = io.BytesIO()
+        image.resize(size).save(buffer, format=fmt, quality=80)
+    return buffer.getvalue()
+
+
+def _data_url(image_bytes, mime="image/png"):
+    return f"data:{mime};base64," + base64.b64encode(image_bytes).decode()
+
+
+class StubVision:
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    def caption(self, image_base64, prompt):
+        self.calls.append(image_base64)
+        if self.error:
+            raise self.error
+        return "a navy square next to an orange circle"
+
+
+@pytest.fixture
+def vision(monkeypatch):
+    vision = StubVision()
+    monkeypatch.setattr(model, "vision_client", vision)
+    monkeypatch.setattr(model, "caption_cache", CaptionCache())
+    return vision
+
+
+def test_repeat_image_skips_vision_call(vision):
+    state = model.VisualPostState(image_base64=_data_url(_image()), context="launch", platforms=["linkedin"])
+
+    first = model.extract_image_caption(state)
+    second = model.extract_image_caption(state)
+
+    assert first == second == {"image_caption": "a navy square next to an orange circle"}
+    assert len(vision.calls) == 1
+    assert model.caption_cache.stats()["exact_hits"] == 1
+
+
+def test_failed_captions_are_not_cached(vision):
+    vision.error = VisionError("Vision endpoint returned an empty caption.")
+    state = model.VisualPostState(image_base64=_data_url(_image()), context="x", platforms=["x"])
+
+    for _ in range(2):
+        with pytest.raises(VisionError):
+            model.extract_image_caption(state)
+
+    assert len(vision.calls) == 2
+
+
+def test_exact_tier_ignores_reencoded_copies():
+    cache = CaptionCache()
+    cache.set(_image("PNG"), "caption")
+
+    assert cache.get(_image("PNG")) == "caption"
+    assert cache.get(_image("JPEG", quality=70)) is None
+
+
+def test_perceptual_tier_matches_reencoded_and_resized_copies():
+    cache = CaptionCache(perceptual=True)
+    cache.set(_image("PNG"), "caption")
+
+    assert cache.get(_image("JPEG", quality=70)) == "caption"
+    assert cache.get(_reencoded(_image("PNG"), (128, 96))) == "caption"
+    assert cache.stats()["perceptual_hits"] == 2
+
+    different = Image.new("RGB", (256, 192), "black")
+    ImageDraw.Draw(different).rectangle([150, 0, 256, 80], fill="white")
+    buffer = io.BytesIO()
+    different.save(buffer, format="PNG")
+    assert cache.get(buffer.getvalue()) is None
+
+
+def test_lru_bound_and_ttl():
+    cache = CaptionCache(max_entries=2)
+    for i in range(3):
+        cache.set(bytes([i]) * 10, f"caption {i}")
+
+    assert cache.get(bytes([0]) * 10) is None
+    assert cache.get(bytes([2]) * 10) == "caption 2"
+
+    cache.ttl = -1
+    assert cache.get(bytes([2]) * 10) is None
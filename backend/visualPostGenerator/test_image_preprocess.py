@@ -0,0 +1,78 @@
+# test_image_preprocess.py
+# Images are downscaled / re-encoded before the vision upload; metrics track bytes saved.
+import base64
+import io
+import os
+
+from PIL import Image
+
+from visualPostGenerator import visual_content_workflow_model as model
+from visualPostGenerator.caption_cache import CaptionCache
+from visualPostGenerator.image_preprocess import VisionUploadMetrics, prepare_image
+
+
+def _photo(size=(3000, 2000), fmt="PNG", mode="RGB"):
+    # Random noise keeps the file large, like a real photo
+    image = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).convert(mode)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _size(image_bytes):
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return image.size, image.format
+
+
+def test_large_photo_is_downscaled_and_reencoded():
+    original = _photo()
+
+    uploaded, info = prepare_image(original, max_edge=768)
+
+    assert _size(uploaded) == ((768, 512), "JPEG")
+    assert info["resized"] is True
+    assert info["bytes_saved"] == len(original) - len(uploaded) > len(original) * 0.8
+
+
+def test_transparent_png_is_flattened():
+    uploaded, info = prepare_image(_photo((1200, 600), mode="RGBA"), max_edge=600)
+
+    assert _size(uploaded) == ((600, 300), "JPEG")
+
+
+def test_uploads_never_grow_and_undecodable_inputs_pass_through():
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (64, 64), os.urandom(64 * 64 * 3)).save(buffer, format="JPEG", quality=20)
+    small = buffer.getvalue()
+
+    uploaded, info = prepare_image(small)
+    assert uploaded == small  # re-encoding at a higher quality would only grow it
+    assert info["bytes_saved"] == 0 and info["resized"] is False
+    assert prepare_image(b"not an image")[0] == b"not an image"
+
+
+def test_vision_node_uploads_preprocessed_image_and_records_metrics(monkeypatch):
+    uploads = []
+
+    class StubVision:
+        def caption(self, image_base64, prompt):
+            uploads.append(base64.b64decode(image_base64))
+            return "noise"
+
+    metrics = VisionUploadMetrics()
+    monkeypatch.setattr(model, "vision_client", StubVision())
+    monkeypatch.setattr(model, "caption_cache", CaptionCache())
+    monkeypatch.setattr(model, "vision_upload_metrics", metrics)
+    original = _photo((2000, 1500))
+    image_base64 = "data:image/png;base64," + base64.b64encode(original).decode()
+
+    result = model.extract_image_caption(
+        model.VisualPostState(image_base64=image_base64, context="x", platforms=["instagram"])
+    )
+
+    assert result == {"image_caption": "noise"}
+    assert max(_size(uploads[0])[0]) == model.prepare_image.__kwdefaults__["max_edge"]
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 1
+    assert snapshot["bytes_saved"] == len(original) - len(uploads[0])
+    assert snapshot["last"]["resized"] is True
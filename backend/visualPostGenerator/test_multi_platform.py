@@ -0,0 +1,94 @@
+# test_multi_platform.py
+# One visual post request fans out to several platforms: one caption, parallel research + posts.
+import asyncio
+import base64
+import time
+
+import httpx
+import pytest
+
+from llm import gateway
+from main import app
+from visualPostGenerator import visual_content_workflow_model as model
+from visualPostGenerator.caption_cache import CaptionCache
+
+DELAY = 0.1
+PLATFORMS = ["Instagram", "LinkedIn", "X"]
+
+
+class StubSearch:
+    def __init__(self):
+        self.queries = []
+
+    async def ainvoke(self, query):
+        self.queries.append(query)
+        await asyncio.sleep(DELAY)
+        return [{"content": f"trend for {query}", "url": "https://example.com"}]
+
+
+class StubVision:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def caption(self, image_base64, prompt):
+        self.calls["vision"] += 1
+        return "a laptop on a desk"
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"vision": 0, "prompts": []}
+
+    async def acomplete(prompt, **kwargs):
+        calls["prompts"].append(prompt)
+        await asyncio.sleep(DELAY)
+        return f"post #{len(calls['prompts'])}"
+
+    calls["search"] = StubSearch()
+    monkeypatch.setattr(model, "vision_client", StubVision(calls))
+    monkeypatch.setattr(model, "caption_cache", CaptionCache())
+    monkeypatch.setattr(model, "search_tool", calls["search"])
+    monkeypatch.setattr(gateway, "acomplete", acomplete)
+    return calls
+
+
+def _post(payload):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/generate-visual-post", json=payload)
+
+    return asyncio.run(send())
+
+
+def _payload(**kwargs):
+    image = "data:image/png;base64," + base64.b64encode(b"not really a png").decode()
+    return {"image_base64": image, "context": "Launching our new app", **kwargs}
+
+
+def test_platforms_share_one_caption_and_run_in_parallel(calls):
+    started = time.perf_counter()
+    response = _post(_payload(platforms=PLATFORMS))
+    elapsed = time.perf_counter() - started
+
+    body = response.json()
+    assert response.status_code == 200
+    assert list(body["generated_posts"]) == PLATFORMS
+    assert body["generated_post"] == body["generated_posts"]["Instagram"]
+    assert calls["vision"] == 1
+    assert len(calls["search"].queries) == 3
+    assert all("a laptop on a desk" in prompt for prompt in calls["prompts"])
+    assert any("trend for latest LinkedIn trends" in prompt for prompt in calls["prompts"])
+    # research and writing each take one DELAY, not one per platform
+    assert elapsed < DELAY * 2 + 0.15
+
+
+def test_single_platform_requests_keep_working(calls):
+    body = _post(_payload(platform="linkedin", platforms=["LinkedIn", "x"])).json()
+
+    assert list(body["generated_posts"]) == ["linkedin", "x"]
+    assert body["generated_post"] == body["generated_posts"]["linkedin"]
+
+
+def test_missing_platform_is_rejected(calls):
+    assert _post(_payload()).status_code == 422
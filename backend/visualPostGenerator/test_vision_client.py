@@ -0,0 +1,176 @@
+# test_vision_client.py
+# Pooled vision client against a local stub server: keep-alive, retries, circuit breaker, hedging.
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from visualPostGenerator.vision_client import (
+    CircuitBreaker,
+    VisionClient,
+    VisionError,
+    VisionUnavailableError,
+)
+
+
+class StubVisionServer(ThreadingHTTPServer):
+    """Replays a script of behaviours, one per request: a status code, ("sleep", seconds) or ("body", json)."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.script = []
+        self.requests = 0
+        self.client_ports = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/caption"
+
+    def next_action(self, port):
+        with self.lock:
+            self.requests += 1
+            self.client_ports.add(port)
+            return self.script.pop(0) if self.script else 200
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        action = self.server.next_action(self.client_address[1])
+        payload = {"caption": f"caption of {body['image_base64']}"}
+        if isinstance(action, tuple):
+            if action[0] == "sleep":
+                time.sleep(action[1])
+            else:
+                payload = action[1]
+            action = 200
+        if action != 200:
+            payload = {"error": "boom"}
+        data = json.dumps(payload).encode()
+        self.send_response(action)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StubVisionServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    options = {"retry_backoff": 0.01, "hedge_after": 0, "read_timeout": 2}
+    options.update(kwargs)
+    return VisionClient(server.url, **options)
+
+
+def test_connections_are_kept_alive(server):
+    client = _client(server)
+
+    captions = [client.caption(f"img{i}") for i in range(5)]
+
+    assert captions == [f"caption of img{i}" for i in range(5)]
+    assert server.requests == 5
+    assert len(server.client_ports) == 1
+
+
+def test_5xx_is_retried_with_backoff(server):
+    server.script = [503, 502]
+    client = _client(server)
+
+    assert client.caption("img") == "caption of img"
+    assert server.requests == 3
+    assert client.stats()["retries"] == 2
+
+
+def test_timeouts_are_retried(server):
+    server.script = [("sleep", 0.5)]
+    client = _client(server, read_timeout=0.2)
+
+    assert client.caption("img") == "caption of img"
+    assert client.stats()["retries"] == 1
+
+
+def test_client_errors_are_not_retried(server):
+    server.script = [400]
+    client = _client(server)
+
+    with pytest.raises(VisionError, match="HTTP 400"):
+        client.caption("img")
+    assert server.requests == 1
+
+
+def test_circuit_opens_after_repeated_failures_and_recovers(server):
+    server.script = [500] * 4
+    client = _client(server, max_retries=1, breaker=CircuitBreaker(failure_threshold=2, reset_after=0.2))
+
+    for _ in range(2):
+        with pytest.raises(VisionError, match="after 2 attempts"):
+            client.caption("img")
+    assert client.stats()["circuit"] == "open"
+
+    with pytest.raises(VisionUnavailableError):
+        client.caption("img")
+    assert server.requests == 4  # rejected without touching the endpoint
+
+    time.sleep(0.25)
+    assert client.stats()["circuit"] == "half_open"
+    assert client.caption("img") == "caption of img"
+    assert client.stats()["circuit"] == "closed"
+
+
+def test_slow_cold_start_is_hedged(server):
+    server.script = [("sleep", 1.5)]
+    client = _client(server, hedge_after=0.1)
+
+    started = time.perf_counter()
+    caption = client.caption("img")
+    elapsed = time.perf_counter() - started
+
+    assert caption == "caption of img"
+    assert elapsed < 1.0
+    stats = client.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+@pytest.mark.parametrize("body", [["caption"], "caption", {"caption": ["a", "b"]}])
+def test_unexpected_json_is_a_vision_error(server, body):
+    server.script = [("body", body)]
+    client = _client(server)
+
+    with pytest.raises(VisionError, match="Unexpected"):
+        client.caption("img")
+    assert client.stats()["circuit"] == "closed"
+
+
+def test_unexpected_errors_release_the_half_open_trial(server, monkeypatch):
+    server.script = [500] * 2
+    client = _client(server, max_retries=1, breaker=CircuitBreaker(failure_threshold=1, reset_after=0.1))
+    with pytest.raises(VisionError, match="after 2 attempts"):
+        client.caption("img")
+    time.sleep(0.15)
+
+    post = client._hedged_post
+    monkeypatch.setattr(client, "_hedged_post", lambda payload: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        client.caption("img")  # takes the half-open trial, then fails unexpectedly
+
+    monkeypatch.setattr(client, "_hedged_post", post)
+    assert client.caption("img") == "caption of img"
+    assert client.stats()["circuit"] == "closed"
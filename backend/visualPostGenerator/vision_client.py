@@ -0,0 +1,246 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+
+import httpx
+
+# This is your new vision model endpoint
+MODAL_VISION_ENDPOINT = os.environ.get(
+    "MODAL_VISION_ENDPOINT",
+    "https://dd1235--nn-image-caption-imagecaptionserver-caption-image.modal.run",
+)
+
+VISION_MAX_CONNECTIONS = int(os.environ.get("VISION_MAX_CONNECTIONS", "10"))
+VISION_KEEPALIVE_EXPIRY = float(os.environ.get("VISION_KEEPALIVE_EXPIRY", "120"))
+VISION_CONNECT_TIMEOUT = float(os.environ.get("VISION_CONNECT_TIMEOUT", "5"))
+VISION_READ_TIMEOUT = float(os.environ.get("VISION_READ_TIMEOUT", "30"))
+VISION_MAX_RETRIES = int(os.environ.get("VISION_MAX_RETRIES", "2"))
+VISION_RETRY_BACKOFF = float(os.environ.get("VISION_RETRY_BACKOFF", "0.5"))
+# A second, identical request is sent when the first has not answered after
+# this many seconds (Modal cold starts); 0 disables hedging.
+VISION_HEDGE_AFTER = float(os.environ.get("VISION_HEDGE_AFTER", "8"))
+VISION_BREAKER_FAILURES = int(os.environ.get("VISION_BREAKER_FAILURES", "5"))
+VISION_BREAKER_RESET = float(os.environ.get("VISION_BREAKER_RESET", "30"))
+
+
+class VisionError(RuntimeError):
+    """Raised when the vision endpoint cannot produce a caption."""
+
+
+class VisionUnavailableError(VisionError):
+    """Raised without calling the endpoint while the circuit breaker is open."""
+
+
+class _RetryableError(VisionError):
+    """5xx responses and transport errors / timeouts."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects calls
+    for `reset_after` seconds; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_after: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that failed without a verdict, so it cannot hold the half-open trial forever."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class VisionClient:
+    """
+    Captioning client for the Modal vision endpoint: one pooled keep-alive
+    HTTP client, jittered exponential retries on 5xx / timeouts, request
+    hedging for slow cold starts and a circuit breaker that fails fast while
+    the endpoint is down.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = MODAL_VISION_ENDPOINT,
+        *,
+        max_connections: int = VISION_MAX_CONNECTIONS,
+        keepalive_expiry: float = VISION_KEEPALIVE_EXPIRY,
+        connect_timeout: float = VISION_CONNECT_TIMEOUT,
+        read_timeout: float = VISION_READ_TIMEOUT,
+        max_retries: int = VISION_MAX_RETRIES,
+        retry_backoff: float = VISION_RETRY_BACKOFF,
+        hedge_after: float = VISION_HEDGE_AFTER,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker(VISION_BREAKER_FAILURES, VISION_BREAKER_RESET)
+        self._client: Optional[httpx.Client] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, max_connections), thread_name_prefix="vision"
+        )
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "failures": 0}
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(limits=self.limits, timeout=self.timeout)
+        return self._client
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def caption(self, image_base64: str, prompt: str = "a detailed photo of") -> str:
+        """Caption a raw Base64 image, raising VisionError instead of returning a placeholder."""
+        if not self.breaker.allow():
+            raise VisionUnavailableError(
+                "Vision endpoint is unavailable (circuit open); retry shortly."
+            )
+        try:
+            return self._caption({"image_base64": image_base64, "prompt": prompt})
+        except VisionError:
+            raise  # the breaker already recorded the outcome
+        except BaseException:
+            self.breaker.release()
+            raise
+
+    def _caption(self, payload: Dict[str, Any]) -> str:
+        self._count("calls")
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+                # Full jitter: sleep a random slice of the exponential backoff
+                time.sleep(random.uniform(0, self.retry_backoff * 2 ** (attempt - 1)))
+            try:
+                caption = self._hedged_post(payload)
+            except _RetryableError as exc:
+                last_error = exc
+                continue
+            except VisionError:
+                # The endpoint answered; a bad request says nothing about its health
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return caption
+
+        self._count("failures")
+        self.breaker.record_failure()
+        raise VisionError(
+            f"Vision endpoint failed after {self.max_retries + 1} attempts: {last_error}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "circuit": self.breaker.state}
+
+    # ------------------------------------------------------------------ #
+    # Requests
+    # ------------------------------------------------------------------ #
+    def _hedged_post(self, payload: Dict[str, Any]) -> str:
+        if self.hedge_after <= 0:
+            return self._post(payload)
+
+        primary = self._executor.submit(self._post, payload)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        self._count("hedges")
+        hedge = self._executor.submit(self._post, payload)
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count("hedge_wins")
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+
+    def _post(self, payload: Dict[str, Any]) -> str:
+        self._count("requests")
+        try:
+            response = self.client.post(self.endpoint, json=payload)
+        except httpx.TransportError as exc:  # connect errors and timeouts
+            raise _RetryableError(f"{type(exc).__name__}: {exc}") from exc
+
+        if response.status_code >= 500:
+            raise _RetryableError(f"HTTP {response.status_code}: {response.text[:200]}")
+        if response.status_code >= 400:
+            raise VisionError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        try:
+            body = response.json()
+        except ValueError as exc:
+            raise VisionError(f"Invalid JSON from vision endpoint: {exc}") from exc
+        if not isinstance(body, dict):
+            raise VisionError(f"Unexpected JSON from vision endpoint: {type(body).__name__}")
+        caption = body.get("caption")
+        if not caption:
+            raise VisionError("Vision endpoint returned an empty caption.")
+        if not isinstance(caption, str):
+            raise VisionError(f"Unexpected caption from vision endpoint: {type(caption).__name__}")
+        return caption
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+# Global instance shared by the visual post workflow and the metrics endpoint
+vision_client = VisionClient()
@@ -1,43 +1,54 @@
-import requests  # <-- Added
+import asyncio
+import time
 from typing import Dict, Any, List
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel
-from groq import Groq
 from dotenv import load_dotenv
 from langchain_community.tools.tavily_search import TavilySearchResults
+from llm import FAST_MODEL, gateway
+from search import CachedSearch, search_cache
+from .caption_cache import caption_cache, decode_image
+from .image_preprocess import (
+    VISION_PREPROCESS,
+    encode_base64,
+    prepare_image,
+    vision_upload_metrics,
+)
+from .vision_client import VisionError, vision_client
 
 # Removed torch, PIL, and transformers imports
 
 load_dotenv()
 
 # -------------------------------
-# 1. DEFINE SELF-HOSTED ENDPOINT
+# 1. SELF-HOSTED ENDPOINT
 # -------------------------------
-# This is your new vision model endpoint
-MODAL_VISION_ENDPOINT = (
-    "https://dd1235--nn-image-caption-imagecaptionserver-caption-image.modal.run"
-)
+# MODAL_VISION_ENDPOINT and its pooled client live in vision_client.py
 
 # -------------------------------
-# 2. INITIALIZE CLIENTS (Groq & Tavily)
+# 2. INITIALIZE CLIENTS (Tavily; Groq goes through the shared gateway)
 # -------------------------------
-client = Groq()
-# As requested, not touching Tavily
-search_tool = TavilySearchResults(max_results=3)
+# Same Tavily tool, behind the shared search cache (trend queries repeat constantly)
+search_tool = CachedSearch(TavilySearchResults(max_results=3), search_cache)
 
 
 def generate_fast_response(prompt: str, max_tokens=1024, temperature=0.7) -> str:
     """Uses the fast Groq model for creative writing."""
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_completion_tokens=max_tokens,
-            top_p=1,
-            stream=False,
+        return gateway.complete(
+            prompt, model=FAST_MODEL, max_tokens=max_tokens, temperature=temperature
+        )
+    except Exception as e:
+        print(f"Error calling Groq API: {e}")
+        raise
+
+
+async def agenerate_fast_response(prompt: str, max_tokens=1024, temperature=0.7) -> str:
+    """Async variant of generate_fast_response, used to write platform posts in parallel."""
+    try:
+        return await gateway.acomplete(
+            prompt, model=FAST_MODEL, max_tokens=max_tokens, temperature=temperature
         )
-        return completion.choices[0].message.content.strip()
     except Exception as e:
         print(f"Error calling Groq API: {e}")
         raise
@@ -51,10 +62,10 @@ def generate_fast_response(prompt: str, max_tokens=1024, temperature=0.7) -> str
 class VisualPostState(BaseModel):
     image_base64: str
     context: str
-    platform: str
+    platforms: List[str]
     image_caption: str | None = None
-    platform_trends: str | None = None
-    final_post: str | None = None
+    platform_trends: Dict[str, str] = {}  # platform -> formatted trend snippets
+    final_posts: Dict[str, str] = {}  # platform -> generated post
 
 
 # -------------------------------
@@ -69,90 +80,110 @@ def extract_image_caption(state: VisualPostState) -> Dict[str, Any]:
     """
     print("--- NODE 1 (A): CALLING SELF-HOSTED VISION MODEL (MODAL) ---")
 
+    # Users often resubmit the same image (e.g. once per platform); reuse its caption
+    image_bytes = decode_image(state.image_base64)
+    if image_bytes:
+        cached_caption = caption_cache.get(image_bytes)
+        if cached_caption is not None:
+            print("Caption cache hit; skipping vision model call.")
+            return {"image_caption": cached_caption}
+
     try:
-        # --- THIS IS THE FIX ---
-        # The 'state.image_base64' is the full Data URL from the frontend
-        # (e.g., "data:image/jpeg;base64,/9j/4AAQSkZ...")
-        # We must split it to get only the raw Base64 data,
-        # just like your app.local_entrypoint() test does.
-        
-        try:
-            # Split the string at the comma
-            header, encoded_data = state.image_base64.split(",", 1)
-        except ValueError:
-            # If the split fails, it might already be raw Base64.
-            # This makes the function more robust.
-            print("Warning: Base64 string does not appear to be a Data URL. Sending as-is.")
-            encoded_data = state.image_base64
-            
-        # --- END FIX ---
-
-        # Prepare the payload for your Modal endpoint
-        payload = {
-            "image_base64": encoded_data,  # <-- Send *only* the raw Base64 data
-            "prompt": "a detailed photo of",
-        }
-
-        # Call your Modal endpoint
-        response = requests.post(MODAL_VISION_ENDPOINT, json=payload, timeout=30)
-
-        # Raise an error if the request failed
-        response.raise_for_status()
-
-        result = response.json()
-        caption = result.get("caption")
-
-        if not caption:
-            print("Error: Modal endpoint returned empty caption.")
-            return {"image_caption": "(Image analysis failed: No caption returned.)"}
+        upload_info = None
+        if image_bytes and VISION_PREPROCESS:
+            # Full-resolution photos dominate request time; the model only needs a small image
+            upload_bytes, upload_info = prepare_image(image_bytes)
+            encoded_data = encode_base64(upload_bytes)
+        else:
+            # --- THIS IS THE FIX ---
+            # The 'state.image_base64' is the full Data URL from the frontend
+            # (e.g., "data:image/jpeg;base64,/9j/4AAQSkZ...")
+            # We must split it to get only the raw Base64 data,
+            # just like your app.local_entrypoint() test does.
+
+            try:
+                # Split the string at the comma
+                header, encoded_data = state.image_base64.split(",", 1)
+            except ValueError:
+                # If the split fails, it might already be raw Base64.
+                # This makes the function more robust.
+                print("Warning: Base64 string does not appear to be a Data URL. Sending as-is.")
+                encoded_data = state.image_base64
+
+            # --- END FIX ---
+
+        # Call your Modal endpoint (pooled client with retries, hedging and a circuit breaker)
+        started = time.perf_counter()
+        caption = vision_client.caption(encoded_data, "a detailed photo of")
+        upload_ms = (time.perf_counter() - started) * 1000
+
+        if upload_info is not None:
+            vision_upload_metrics.record(upload_info, upload_ms)
+            print(
+                f"Vision upload: {upload_info['original_bytes']} -> {upload_info['upload_bytes']} bytes "
+                f"(preprocess {upload_info['preprocess_ms']}ms, call {upload_ms:.0f}ms)"
+            )
 
         print(f"Generated Caption: {caption}")
+        if image_bytes:
+            caption_cache.set(image_bytes, caption)
         return {"image_caption": caption}
 
-    except requests.exceptions.HTTPError as http_err:
-        print(f"Error calling Modal endpoint (HTTP): {http_err}")
-        print(f"Response: {http_err.response.text}")
-        return {"image_caption": f"(Image analysis failed: {http_err})"}
-    except Exception as e:
-        print(f"Error in vision model call: {e}")
-        return {"image_caption": f"(Image analysis failed: {e})"}
+    except VisionError as e:
+        # Surface the failure instead of writing posts around a placeholder caption
+        print(f"Error calling Modal endpoint: {e}")
+        raise
 
 
-def research_platform_trends(state: VisualPostState) -> Dict[str, Any]:
+async def research_platform_trends(state: VisualPostState) -> Dict[str, Any]:
     """
     Node 2 (Branch B): (Research Agent - Tavily)
-    Searches for the latest trends for the given platform and context.
+    Searches for the latest trends for every requested platform concurrently.
     """
-    print(f"--- NODE 1 (B): RESEARCHING {state.platform.upper()} TRENDS (TAVILY) ---")
+    print(f"--- NODE 1 (B): RESEARCHING TRENDS FOR {', '.join(state.platforms).upper()} (TAVILY) ---")
+    trends = await asyncio.gather(
+        *(_research_trends(platform, state.context) for platform in state.platforms)
+    )
+    return {"platform_trends": dict(zip(state.platforms, trends))}
+
+
+async def _research_trends(platform: str, context: str) -> str:
     try:
-        query = f"latest {state.platform} trends for {state.context}"
+        query = f"latest {platform} trends for {context}"
 
         # This code still uses the old Tavily package, as requested
-        results: List[Dict] = search_tool.invoke(query)
+        results: List[Dict] = await search_tool.ainvoke(query)
 
         # This line will likely fail, but was not touched per your instruction
         formatted_trends = "\n".join(
             [f"- {r['content']} (Source: {r['url']})" for r in results]
         )
 
-        print(f"Found Trends: {formatted_trends}")
-        return {"platform_trends": formatted_trends}
+        print(f"Found Trends ({platform}): {formatted_trends}")
+        return formatted_trends
 
     except Exception as e:
-        print(f"Error in Tavily search: {e}")
-        return {"platform_trends": "No trend research available."}
+        print(f"Error in Tavily search ({platform}): {e}")
+        return "No trend research available."
 
 
-def generate_platform_post(state: VisualPostState) -> Dict[str, Any]:
+async def generate_platform_posts(state: VisualPostState) -> Dict[str, Any]:
     """
     Node 3 (Join Node): (Text Model - Groq/Llama)
-    Takes context, caption, AND trends to write the final post.
+    Takes context, the shared caption AND each platform's trends to write all posts in parallel.
     """
-    print("--- NODE 2 (JOIN): GENERATING PLATFORM POST (GROQ/LLAMA) ---")
+    print("--- NODE 2 (JOIN): GENERATING PLATFORM POSTS (GROQ/LLAMA) ---")
+    posts = await asyncio.gather(
+        *(_generate_post(state, platform) for platform in state.platforms)
+    )
+    return {"final_posts": dict(zip(state.platforms, posts))}
+
+
+async def _generate_post(state: VisualPostState, platform: str) -> str:
     try:
         # The prompt is now updated to know the trends won't have sources
         prompt = f"""
-        You are an expert social media manager and copywriter for {state.platform}.
+        You are an expert social media manager and copywriter for {platform}.
         Your task is to write a compelling, trend-aware post that combines three pieces of information.
 
         ---
@@ -163,21 +194,21 @@ def generate_platform_post(state: VisualPostState) -> Dict[str, Any]:
         {state.image_caption}
         ---
         3. Latest Platform Trends (Snippets of text):
-        {state.platform_trends}
+        {state.platform_trends.get(platform, "No trend research available.")}
         ---
 
-        Write a natural-sounding post for {state.platform}.
+        Write a natural-sounding post for {platform}.
         - **Integrate** all three pieces of information seamlessly.
         - **Use a style** that matches the latest trends (e.g., if trends mention "storytelling" or "UGC", use that).
-        - **Format** the post perfectly for {state.platform} (e.g., professional for LinkedIn, engaging with hashtags for Instagram).
+        - **Format** the post perfectly for {platform} (e.g., professional for LinkedIn, engaging with hashtags for Instagram).
         """
-        final_post = generate_fast_response(prompt)
-        print(f"Generated Post: {final_post[:100]}...")
-        return {"final_post": final_post}
+        final_post = await agenerate_fast_response(prompt)
+        print(f"Generated Post ({platform}): {final_post[:100]}...")
+        return final_post
 
     except Exception as e:
-        print(f"Error in Groq model generation: {e}")
-        return {"final_post": f"Error: Could not generate post. {e}"}
+        print(f"Error in Groq model generation ({platform}): {e}")
+        return f"Error: Could not generate post. {e}"
 
 
 # -------------------------------
@@ -191,7 +222,7 @@ def build_visual_content_graph() -> StateGraph:
     # 1. Add all the nodes
     graph.add_node("extract_image_caption", extract_image_caption)
     graph.add_node("research_platform_trends", research_platform_trends)
-    graph.add_node("generate_platform_post", generate_platform_post)
+    graph.add_node("generate_platform_posts", generate_platform_posts)
 
     # 2. Define the graph flow
     graph.add_edge(START, "extract_image_caption")
@@ -200,10 +231,10 @@ def build_visual_content_graph() -> StateGraph:
     # 3. Define the "join" point
     graph.add_edge(
         ["extract_image_caption", "research_platform_trends"],
-        "generate_platform_post",
+        "generate_platform_posts",
     )
 
     # 4. The final node ends the graph
-    graph.add_edge("generate_platform_post", END)
+    graph.add_edge("generate_platform_posts", END)
 
     return graph.compile()
\ No newline at end of file
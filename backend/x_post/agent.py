@@ -3,9 +3,10 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List, Optional
 
-from groq import Groq
 from pydantic import BaseModel, Field
 
+from llm import FAST_MODEL, PRIMARY_MODEL, build_messages, gateway
+
 
 class HumanFeedback(BaseModel):
     """Represents human feedback that can be injected into any iteration."""
@@ -82,10 +83,10 @@ class XPostAgent:
     """Runs a small LangChain-free loop across three Groq-hosted models."""
 
     def __init__(self) -> None:
-        self.client = Groq()
-        self.generator_model = "llama-3.3-70b-versatile"
-        self.evaluator_model = "llama-3.1-8b-instant"
-        self.optimizer_model = "llama-3.3-70b-versatile"
+        self.llm = gateway
+        self.generator_model = PRIMARY_MODEL
+        self.evaluator_model = FAST_MODEL
+        self.optimizer_model = PRIMARY_MODEL
         self.approval_threshold = 4
 
     def invoke(self, payload: XPostInput) -> Dict[str, Any]:
@@ -257,6 +258,7 @@ Draft to evaluate:
             user=user_prompt,
             temperature=0.2,
             max_tokens=500,
+            cache=True,  # grading the same draft twice must not cost a second call
         )
 
         try:
@@ -441,20 +443,16 @@ Constraints:
         user: str,
         temperature: float,
         max_tokens: int,
+        cache: bool = False,
     ) -> str:
-        completion = self.client.chat.completions.create(
+        return self.llm.chat(
+            build_messages(user, system),
             model=model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
             temperature=temperature,
-            max_completion_tokens=max_tokens,
+            max_tokens=max_tokens,
             top_p=0.9,
-            stream=False,
+            cache=cache,
         )
-        content = completion.choices[0].message.content
-        return content.strip() if content else ""
 
 
 __all__ = ["XPostAgent", "XPostInput", "HumanFeedback", "XPostIdeaRequest"]
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-from groq import Groq
 from pydantic import BaseModel, Field, HttpUrl
 
+from llm import FAST_MODEL, PRIMARY_MODEL, build_messages, gateway
+
 from backend.youtubeBlog.transcript_service import (
     extract_video_id,
     fetch_transcript,
@@ -30,7 +31,7 @@ class YouTubeBlogAgent:
     """Orchestrates transcript retrieval and Groq-powered writing."""
 
     def __init__(self) -> None:
-        self.client = Groq()
+        self.llm = gateway
 
     def invoke(self, payload: YouTubeBlogInput) -> Dict[str, Any]:
         video_url = str(payload.youtube_url)
@@ -90,17 +91,13 @@ class YouTubeBlogAgent:
             Transcript:
             {transcript_text}
             """
-        completion = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+        return self.llm.chat(
+            build_messages(user_prompt, system_prompt),
+            model=PRIMARY_MODEL,
             temperature=0.4,
-            max_completion_tokens=2048,
+            max_tokens=2048,
             top_p=0.9,
         )
-        return completion.choices[0].message.content.strip()
 
     def _generate_summary(self, blog_post: str, metadata: Dict[str, Any]) -> str:
         """Short summary for quick previews."""
@@ -112,10 +109,9 @@ class YouTubeBlogAgent:
             BLOG:
             {blog_post}
             """
-        completion = self.client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
+        return self.llm.complete(
+            prompt,
+            model=FAST_MODEL,
             temperature=0.3,
-            max_completion_tokens=512,
+            max_tokens=512,
         )
-        return completion.choices[0].message.content.strip()
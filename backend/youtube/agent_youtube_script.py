@@ -1,5 +1,6 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 from langgraph.graph import StateGraph
+from api.sse import stream_graph_events
 from .youtube_script_model import YoutubeScript, build_youtube_graph
 
 
@@ -8,46 +9,52 @@ class YoutubeScriptAgent:
 
     def __init__(self):
         self.graph = None
+        self.app = None
 
     def compile(self):
-        """Build the LangGraph workflow."""
+        """Build and compile the LangGraph workflow once; the runnable is reused across requests."""
         self.graph = build_youtube_graph()
+        self.app = self.graph.compile()
+        return self.app
+
+    def build_state(self, input_data: Dict[str, Any]) -> YoutubeScript:
+        """🧠 Build state object using frontend fields."""
+        return YoutubeScript(
+            channelDescription=input_data.get("channelDescription", ""),
+            prompt=input_data.get("prompt", ""),
+            subscribers=input_data.get("subscribers", ""),
+            videoType=input_data.get("videoType", "shortform"),
+            tone=input_data.get("tone", ""),
+            audience=input_data.get("audience", ""),
+            threadId=input_data.get("threadId", "e.g. session-abc123"),
+        )
+
+    def format_result(self, state: YoutubeScript, result: Dict[str, Any]) -> Dict[str, Any]:
+        """📝 Extract final script."""
+        final_script = result.get("script_draft")
+        revision_count = result.get("revision_count")
+
+        return {
+            "status": "success",
+            "data": {
+                "script": final_script,
+                "revision_count": revision_count,
+                "threadId": state.threadId,
+                "raw_result": result
+            }
+        }
 
     async def ainvoke(self, input_data: Dict[str, Any], thread_id: str = None):
         print("=== ainvoke received input_data ===")
         print(input_data)
 
         try:
-            # 🧠 Build state object using frontend fields
-            state = YoutubeScript(
-                channelDescription=input_data.get("channelDescription", ""),
-                prompt=input_data.get("prompt", ""),
-                subscribers=input_data.get("subscribers", ""),
-                videoType=input_data.get("videoType", "shortform"),
-                tone=input_data.get("tone", ""),
-                audience=input_data.get("audience", ""),
-                threadId=input_data.get("threadId", "e.g. session-abc123"),
-            )
+            state = self.build_state(input_data)
 
             # ⚙️ Build & run workflow
-            graph = self.graph or build_youtube_graph()
-            app = graph.compile()
-            result = app.invoke(state)
-
-            # 📝 Extract final script
-            final_script = result.get("script_draft")
-            revision_count = result.get("revision_count")
-
-
-            return {
-                "status": "success",
-                "data": {
-                    "script": final_script,
-                    "revision_count": revision_count,
-                    "threadId": state.threadId,
-                    "raw_result": result
-                }
-            }
+            app = self.app or self.compile()
+            result = await app.ainvoke(state)
+            return self.format_result(state, result)
 
         except Exception as e:
             print(f"Error in YoutubeScriptAgent: {e}")
@@ -55,3 +62,12 @@ class YoutubeScriptAgent:
                 "status": "error",
                 "message": str(e)
             }
+
+    async def astream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run the workflow yielding node / token events, then a `final` event with the formatted result."""
+        state = self.build_state(input_data)
+        app = self.app or self.compile()
+        async for item in stream_graph_events(app, state):
+            if item["event"] == "final":
+                item = {"event": "final", "data": self.format_result(state, item["data"])}
+            yield item
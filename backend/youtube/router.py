@@ -1,4 +1,6 @@
 from fastapi import APIRouter, HTTPException, Request
+from api.sse import sse_response
+from jobs import job_queue
 from .agent_youtube_script import YoutubeScriptAgent
 from pydantic import BaseModel
 import uuid
@@ -10,34 +12,69 @@ agent = YoutubeScriptAgent()
 agent.compile()
 
 
+async def prepare_request(request: Request) -> tuple:
+    """Read the frontend JSON and attach a fresh thread ID."""
+    payload = await request.json()
+    print("Received payload:", payload)
+
+    # Generate thread ID
+    thread_id = str(uuid.uuid4())
+    payload["threadId"] = thread_id
+
+    print("Payload passed to agent:", payload)
+    return thread_id, payload
+
+
+def build_response(thread_id: str, result: dict, payload: dict) -> dict:
+    return {
+        "status": "success",
+        "threadId": thread_id,
+        "generated_script": result.get("data", {}).get("script", "No script generated"),
+        "revision_count": result.get("data", {}).get("revision_count", 0),
+        "received_data": payload
+    }
+
+
 @router.post("/generate-youtube-script")
 async def generate_youtube_script(request: Request):
     """Receives frontend JSON and runs the YouTube script workflow."""
     try:
-        payload = await request.json()
-        print("Received payload:", payload)
-
-        # Generate thread ID
-        thread_id = str(uuid.uuid4())
-        payload["threadId"] = thread_id
-
-        print("Payload passed to agent:", payload)
+        thread_id, payload = await prepare_request(request)
 
         # Run agent
         result = await agent.ainvoke(payload)
-
-        return {
-            "status": "success",
-            "threadId": thread_id,
-            "generated_script": result.get("data", {}).get("script", "No script generated"),
-            "revision_count": result.get("data", {}).get("revision_count", 0),
-            "received_data": payload
-        }
+        return build_response(thread_id, result, payload)
 
     except Exception as e:
         print("🔥 Error:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+async def run_youtube_script_job(payload: dict, thread_id: str) -> dict:
+    """Background-job runner for the YouTube script workflow (see jobs.router)."""
+    payload["threadId"] = thread_id
+    result = await agent.ainvoke(payload)
+    if result.get("status") == "error":
+        raise RuntimeError(result.get("message", "Unknown agent error"))
+    return build_response(thread_id, result, payload)
+
+
+job_queue.register("youtube-script", run_youtube_script_job)
+
+
+@router.post("/generate-youtube-script/stream")
+async def generate_youtube_script_stream(request: Request):
+    """Same workflow as /generate-youtube-script, streamed as Server-Sent Events (node, token, result)."""
+    try:
+        thread_id, payload = await prepare_request(request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return sse_response(
+        agent.astream(payload),
+        lambda result: build_response(thread_id, result, payload),
+    )
+
 class ImagePromptRequest(BaseModel):
     channelDescription: str = ""
     prompt: str = ""              # Video topic
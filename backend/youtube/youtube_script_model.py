@@ -1,46 +1,34 @@
 from typing import Dict, Any
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel
-from groq import Groq
-from dotenv import load_dotenv
+from editing import ReviewVerdict, areview, format_review, review_json_instructions
+from llm import (
+    FAST_MODEL,
+    PRIMARY_MODEL,
+    agenerate,
+    agenerate_research,
+    agenerate_review,
+    agenerate_stream,
+    gateway,
+)
 import re
 
-load_dotenv()
-
-# -------------------------------
-# Initialize Groq client
-# -------------------------------
-client = Groq()
-research_client = Groq()
-
 
 # -------------------------------
 # Helper Functions
 # -------------------------------
 def generate(prompt: str, max_tokens=512, temperature=0.7) -> str:
     """Use Groq to generate text."""
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+    return gateway.complete(
+        prompt, model=PRIMARY_MODEL, max_tokens=max_tokens, temperature=temperature
     )
-    return completion.choices[0].message.content.strip()
 
 
 def generate_research(prompt: str, max_tokens=512, temperature=0.7) -> str:
     """Research agent using a cheaper model."""
-    completion = research_client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-        max_completion_tokens=max_tokens,
-        top_p=1,
-        stream=False,
+    return gateway.complete(
+        prompt, model=FAST_MODEL, max_tokens=max_tokens, temperature=temperature, cache=True
     )
-    return completion.choices[0].message.content.strip()
 
 
 def determine_duration(videoType: str, prompt: str) -> int:
@@ -80,6 +68,7 @@ class YoutubeScript(BaseModel):
     research_notes: str | None = None
     script_draft: str | None = None
     compliance_report: str | None = None
+    review: ReviewVerdict | None = None  # Typed verdict of the compliance review; drives revision
     revision_notes: str | None = None
     revision_count: int = 0
 
@@ -87,7 +76,7 @@ class YoutubeScript(BaseModel):
 # -------------------------------
 # Nodes
 # -------------------------------
-def topic_research(state: YoutubeScript) -> Dict[str, Any]:
+async def topic_research(state: YoutubeScript) -> Dict[str, Any]:
     """Research topic context for the YouTube script."""
     prompt = f"""
 You are a YouTube research strategist.
@@ -100,10 +89,10 @@ Return:
 - 2 trending angles
 - 2 interesting hooks
 """
-    return {"research_notes": generate_research(prompt, 512)}
+    return {"research_notes": await agenerate_research(prompt, 512)}
 
 
-def generate_script(state: YoutubeScript) -> Dict[str, Any]:
+async def generate_script(state: YoutubeScript) -> Dict[str, Any]:
     """Generate YouTube script with pacing, camera cues, structure."""
     duration = determine_duration(state.videoType, state.prompt)
 
@@ -135,10 +124,10 @@ Guidelines:
 - Use creator-friendly, conversational language.
 - {style}
 """
-    return {"script_draft": generate(prompt, 1024)}
+    return {"script_draft": await agenerate_stream(prompt, "generate_script", 1024)}
 
 
-def compliance_review(state: YoutubeScript) -> Dict[str, Any]:
+async def compliance_review(state: YoutubeScript) -> Dict[str, Any]:
     """Review script for safety, accuracy, tone, and pacing."""
     prompt = f"""
 You are a YouTube content compliance reviewer.
@@ -153,16 +142,15 @@ Review the script for:
 Script:
 {state.script_draft}
 
-Return:
-- Verdict: APPROVED or REVISION_NEEDED
-- Bullet-point notes
+{review_json_instructions(sectioned=False)}
 """
-    return {"compliance_report": generate(prompt, 512)}
+    review = await areview(agenerate_review, prompt)
+    return {"compliance_report": format_review(review), "review": review}
 
 
-def revision_step(state: YoutubeScript) -> Dict[str, Any]:
+async def revision_step(state: YoutubeScript) -> Dict[str, Any]:
     """Revise script only if needed."""
-    if "APPROVED" in (state.compliance_report or "").upper():
+    if not (state.review and state.review.needs_revision()):
         return {"revision_notes": "No revision needed."}
 
     prompt = f"""
@@ -178,7 +166,7 @@ Original Script:
 
 Make improvements but keep the style consistent.
 """
-    new_script = generate(prompt, 1024)
+    new_script = await agenerate(prompt, 1024)
 
     return {
         "revision_notes": "Revised based on compliance.",
@@ -1,18 +1,47 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import asyncio
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from groq import Groq
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
+
+from llm import FAST_MODEL, PRIMARY_MODEL, build_messages, gateway
 
 from .transcript_service import (
     extract_video_id,
-    fetch_transcript,
-    get_video_metadata,
+    fetch_metadata_and_transcript,
+    format_timestamp,
+    resolve_playlist_video_ids,
+    split_transcript_windows,
     transcript_to_text,
 )
 
 
+BLOG_SAMPLING = {"model": PRIMARY_MODEL, "temperature": 0.4, "max_tokens": 2048, "top_p": 0.9}
+SUMMARY_SAMPLING = {"model": FAST_MODEL, "temperature": 0.3, "max_tokens": 512}
+
+# Transcripts longer than one window are condensed window-by-window (map) on the
+# fast model and the notes are handed to the writer (reduce). Shorter
+# transcripts go to the writer verbatim, exactly as before.
+TRANSCRIPT_WINDOW_CHARS = int(os.environ.get("YOUTUBE_BLOG_WINDOW_CHARS", "12000"))
+TRANSCRIPT_MAX_WINDOWS = int(os.environ.get("YOUTUBE_BLOG_MAX_WINDOWS", "24"))
+WINDOW_CONCURRENCY = int(os.environ.get("YOUTUBE_BLOG_WINDOW_CONCURRENCY", "6"))
+WINDOW_NOTES_SAMPLING = {
+    "model": FAST_MODEL,
+    "temperature": 0.2,
+    "max_tokens": int(os.environ.get("YOUTUBE_BLOG_WINDOW_NOTES_TOKENS", "400")),
+}
+
+# Batch ingestion: transcripts are fetched with bounded parallelism and posts
+# are written by a fixed pool of workers.
+BATCH_MAX_VIDEOS = int(os.environ.get("YOUTUBE_BLOG_BATCH_MAX_VIDEOS", "50"))
+BATCH_FETCH_CONCURRENCY = int(os.environ.get("YOUTUBE_BLOG_BATCH_FETCH_CONCURRENCY", "4"))
+BATCH_WORKERS = int(os.environ.get("YOUTUBE_BLOG_BATCH_WORKERS", "3"))
+
+
 class YouTubeBlogInput(BaseModel):
     youtube_url: HttpUrl
     prompt: str = Field(..., description="Describe the specific angle or topic you want covered.")
@@ -24,28 +53,226 @@ class YouTubeBlogInput(BaseModel):
     )
 
 
+class YouTubeBlogBatchInput(BaseModel):
+    youtube_urls: List[HttpUrl] = Field(default_factory=list)
+    playlist_url: Optional[HttpUrl] = Field(
+        default=None, description="Playlist or channel URL; its videos are appended to youtube_urls."
+    )
+    prompt: str = Field(..., description="Angle or topic applied to every video.")
+    word_count: int = Field(default=600, ge=200, le=2000)
+    max_videos: int = Field(default=BATCH_MAX_VIDEOS, ge=1, le=BATCH_MAX_VIDEOS)
+
+    @model_validator(mode="after")
+    def check_sources(self) -> "YouTubeBlogBatchInput":
+        if not self.youtube_urls and not self.playlist_url:
+            raise ValueError("Provide youtube_urls and/or playlist_url.")
+        return self
+
+    def video_input(self, video_id: str) -> YouTubeBlogInput:
+        return YouTubeBlogInput(
+            youtube_url=f"https://www.youtube.com/watch?v={video_id}",
+            prompt=self.prompt,
+            word_count=self.word_count,
+        )
+
+
 class YouTubeBlogAgent:
     """Orchestrates transcript retrieval and Groq-powered writing."""
 
     def __init__(self) -> None:
-        self.client = Groq()
+        self.llm = gateway
 
     def invoke(self, payload: YouTubeBlogInput) -> Dict[str, Any]:
         video_url = str(payload.youtube_url)
-        video_id = extract_video_id(video_url)
-
-        metadata = get_video_metadata(video_url)
-        transcript_segments = fetch_transcript(video_id)
+        video_id, metadata, transcript_segments = fetch_metadata_and_transcript(video_url)
         transcript_text = transcript_to_text(transcript_segments)
+        source_text = self._condense_transcript(transcript_segments)
 
         blog_post = self._generate_blog(
-            transcript_text=transcript_text,
+            transcript_text=source_text,
             metadata=metadata,
             instructions=payload.prompt,
             word_count=payload.word_count,
         )
         summary = self._generate_summary(blog_post, metadata)
 
+        return self._build_result(
+            payload, video_url, video_id, metadata, transcript_text, blog_post, summary
+        )
+
+    async def ainvoke(self, payload: YouTubeBlogInput) -> Dict[str, Any]:
+        """Async counterpart of `invoke`."""
+        video_id, metadata, transcript_segments = await asyncio.to_thread(
+            fetch_metadata_and_transcript, str(payload.youtube_url)
+        )
+        return await self._agenerate_post(payload, video_id, metadata, transcript_segments)
+
+    async def astream(self, payload: YouTubeBlogInput) -> AsyncIterator[Dict[str, Any]]:
+        """Same pipeline as `invoke`, yielding node / token events and a `final` result event."""
+        video_url = str(payload.youtube_url)
+        video_id, metadata, transcript_segments = await asyncio.to_thread(
+            fetch_metadata_and_transcript, video_url
+        )
+        yield {"event": "node", "data": {"node": "metadata"}}
+        transcript_text = transcript_to_text(transcript_segments)
+        yield {"event": "node", "data": {"node": "transcript"}}
+        source_text = await self._acondense_transcript(transcript_segments)
+        yield {"event": "node", "data": {"node": "condense_transcript"}}
+
+        parts: List[str] = []
+        async for delta in self.llm.astream_chat(
+            self._blog_messages(
+                transcript_text=source_text,
+                metadata=metadata,
+                instructions=payload.prompt,
+                word_count=payload.word_count,
+            ),
+            **BLOG_SAMPLING,
+        ):
+            parts.append(delta)
+            yield {"event": "token", "data": {"node": "generate_blog", "delta": delta}}
+        blog_post = "".join(parts).strip()
+        yield {"event": "node", "data": {"node": "generate_blog"}}
+
+        summary = await self.llm.acomplete(self._summary_prompt(blog_post, metadata), **SUMMARY_SAMPLING)
+        yield {"event": "node", "data": {"node": "generate_summary"}}
+
+        yield {
+            "event": "final",
+            "data": self._build_result(
+                payload, video_url, video_id, metadata, transcript_text, blog_post, summary
+            ),
+        }
+
+    # ------------------------------------------------------------------ #
+    # Batch / playlist ingestion
+    # ------------------------------------------------------------------ #
+    def resolve_batch(self, payload: YouTubeBlogBatchInput) -> List[str]:
+        """Video ids of the batch in request order (explicit URLs first), de-duplicated."""
+        video_ids: List[str] = []
+        for url in payload.youtube_urls:
+            video_id = extract_video_id(str(url))
+            if video_id not in video_ids:
+                video_ids.append(video_id)
+        if payload.playlist_url and len(video_ids) < payload.max_videos:
+            for video_id in resolve_playlist_video_ids(str(payload.playlist_url), payload.max_videos):
+                if video_id not in video_ids:
+                    video_ids.append(video_id)
+        return video_ids[: payload.max_videos]
+
+    async def abatch(
+        self, payload: YouTubeBlogBatchInput, video_ids: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch transcripts (at most BATCH_FETCH_CONCURRENCY at a time), write the
+        posts on BATCH_WORKERS workers and yield one `video` event per video as it
+        completes, followed by a `final` summary event.
+        """
+        fetch_semaphore = asyncio.Semaphore(max(1, BATCH_FETCH_CONCURRENCY))
+        workers = max(1, BATCH_WORKERS)
+        # Bounded so fetching never runs far ahead of the writers
+        ready: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def fetch(index: int, video_id: str) -> None:
+            async with fetch_semaphore:
+                try:
+                    fetched = await asyncio.to_thread(
+                        fetch_metadata_and_transcript, f"https://www.youtube.com/watch?v={video_id}"
+                    )
+                except Exception as exc:
+                    await done.put(self._batch_event(index, video_id, error=exc))
+                    return
+            await ready.put((index, fetched))
+
+        async def produce() -> None:
+            await asyncio.gather(*(fetch(index, video_id) for index, video_id in enumerate(video_ids)))
+            for _ in range(workers):
+                await ready.put(None)
+
+        async def write() -> None:
+            while (item := await ready.get()) is not None:
+                index, (video_id, metadata, segments) = item
+                try:
+                    result = await self._agenerate_post(
+                        payload.video_input(video_id), video_id, metadata, segments
+                    )
+                except Exception as exc:
+                    await done.put(self._batch_event(index, video_id, error=exc))
+                else:
+                    await done.put(self._batch_event(index, video_id, result=result))
+
+        tasks = [asyncio.create_task(produce())] + [
+            asyncio.create_task(write()) for _ in range(workers)
+        ]
+        succeeded = 0
+        try:
+            for _ in video_ids:
+                event = await done.get()
+                succeeded += event["data"]["status"] == "success"
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "event": "final",
+            "data": {
+                "status": "success",
+                "videos": len(video_ids),
+                "succeeded": succeeded,
+                "failed": len(video_ids) - succeeded,
+            },
+        }
+
+    def _batch_event(
+        self,
+        index: int,
+        video_id: str,
+        *,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"index": index, "video_id": video_id}
+        if error is not None:
+            data.update(status="error", error=str(error))
+        else:
+            data.update(status="success", result=result)
+        return {"event": "video", "data": data}
+
+    async def _agenerate_post(
+        self,
+        payload: YouTubeBlogInput,
+        video_id: str,
+        metadata: Dict[str, Any],
+        transcript_segments: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        transcript_text = transcript_to_text(transcript_segments)
+        source_text = await self._acondense_transcript(transcript_segments)
+        blog_post = await self.llm.achat(
+            self._blog_messages(
+                transcript_text=source_text,
+                metadata=metadata,
+                instructions=payload.prompt,
+                word_count=payload.word_count,
+            ),
+            **BLOG_SAMPLING,
+        )
+        summary = await self.llm.acomplete(self._summary_prompt(blog_post, metadata), **SUMMARY_SAMPLING)
+        return self._build_result(
+            payload, str(payload.youtube_url), video_id, metadata, transcript_text, blog_post, summary
+        )
+
+    def _build_result(
+        self,
+        payload: YouTubeBlogInput,
+        video_url: str,
+        video_id: str,
+        metadata: Dict[str, Any],
+        transcript_text: str,
+        blog_post: str,
+        summary: str,
+    ) -> Dict[str, Any]:
         return {
             "status": "success",
             "video_url": video_url,
@@ -57,6 +284,68 @@ class YouTubeBlogAgent:
             "transcript_characters": len(transcript_text),
         }
 
+    # ------------------------------------------------------------------ #
+    # Long transcripts (map-reduce)
+    # ------------------------------------------------------------------ #
+    def _transcript_windows(self, transcript_segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Timestamped windows to condense; empty when the transcript fits in one window."""
+        full_text = transcript_to_text(transcript_segments, max_chars=0)
+        if len(full_text) <= TRANSCRIPT_WINDOW_CHARS:
+            return []
+        # Grow the windows rather than exceed the window cap on very long videos; packing on
+        # segment boundaries can still spill over, so the cap is enforced by merging the tail
+        max_windows = max(1, TRANSCRIPT_MAX_WINDOWS)
+        window_chars = max(TRANSCRIPT_WINDOW_CHARS, math.ceil(len(full_text) / max_windows))
+        return split_transcript_windows(transcript_segments, window_chars, max_windows)
+
+    def _condense_transcript(self, transcript_segments: List[Dict[str, Any]]) -> str:
+        windows = self._transcript_windows(transcript_segments)
+        if not windows:
+            return transcript_to_text(transcript_segments, max_chars=TRANSCRIPT_WINDOW_CHARS)
+        with ThreadPoolExecutor(max_workers=max(1, WINDOW_CONCURRENCY)) as pool:
+            notes = list(
+                pool.map(
+                    lambda window: self.llm.complete(
+                        self._window_prompt(window), **WINDOW_NOTES_SAMPLING
+                    ),
+                    windows,
+                )
+            )
+        return self._join_window_notes(windows, notes)
+
+    async def _acondense_transcript(self, transcript_segments: List[Dict[str, Any]]) -> str:
+        windows = self._transcript_windows(transcript_segments)
+        if not windows:
+            return transcript_to_text(transcript_segments, max_chars=TRANSCRIPT_WINDOW_CHARS)
+        semaphore = asyncio.Semaphore(max(1, WINDOW_CONCURRENCY))
+
+        async def summarize(window: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self.llm.acomplete(self._window_prompt(window), **WINDOW_NOTES_SAMPLING)
+
+        notes = await asyncio.gather(*(summarize(window) for window in windows))
+        return self._join_window_notes(windows, notes)
+
+    def _window_prompt(self, window: Dict[str, Any]) -> str:
+        return f"""
+Condense this section of a video transcript into dense notes for a writer.
+Keep every distinct point, example, figure and name; keep memorable quotes verbatim.
+Use short bullet points and do not add anything that is not in the text.
+
+TRANSCRIPT SECTION ({format_timestamp(window['start'])}-{format_timestamp(window['end'])}):
+{window['text']}
+"""
+
+    def _join_window_notes(self, windows: List[Dict[str, Any]], notes: List[str]) -> str:
+        sections = [
+            f"[{format_timestamp(window['start'])}-{format_timestamp(window['end'])}]\n{note.strip()}"
+            for window, note in zip(windows, notes)
+        ]
+        return (
+            f"Condensed notes from {len(windows)} timestamped sections of the full transcript:\n\n"
+            + "\n\n".join(sections)
+        )
+
     def _generate_blog(
         self,
         *,
@@ -66,6 +355,24 @@ class YouTubeBlogAgent:
         word_count: int,
     ) -> str:
         """Use Groq to craft a markdown blog post based on transcript and prompt."""
+        return self.llm.chat(
+            self._blog_messages(
+                transcript_text=transcript_text,
+                metadata=metadata,
+                instructions=instructions,
+                word_count=word_count,
+            ),
+            **BLOG_SAMPLING,
+        )
+
+    def _blog_messages(
+        self,
+        *,
+        transcript_text: str,
+        metadata: Dict[str, Any],
+        instructions: str,
+        word_count: int,
+    ) -> List[Dict[str, str]]:
         system_prompt = (
             "You are an editorial assistant who turns transcripts into structured, "
             "engaging long-form articles."
@@ -89,21 +396,14 @@ Keep quotes accurate, avoid hallucinations, and ground everything in the transcr
 Transcript:
 {transcript_text}
 """
-        completion = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.4,
-            max_completion_tokens=2048,
-            top_p=0.9,
-        )
-        return completion.choices[0].message.content.strip()
+        return build_messages(user_prompt, system_prompt)
 
     def _generate_summary(self, blog_post: str, metadata: Dict[str, Any]) -> str:
         """Short summary for quick previews."""
-        prompt = f"""
+        return self.llm.complete(self._summary_prompt(blog_post, metadata), **SUMMARY_SAMPLING)
+
+    def _summary_prompt(self, blog_post: str, metadata: Dict[str, Any]) -> str:
+        return f"""
 Summarize the following blog draft in under 180 words.
 Return a short paragraph followed by 3 concise bullet takeaways.
 Mention the video title "{metadata.get('title') or 'this video'}" once.
@@ -111,10 +411,3 @@ Mention the video title "{metadata.get('title') or 'this video'}" once.
 BLOG:
 {blog_post}
 """
-        completion = self.client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_completion_tokens=512,
-        )
-        return completion.choices[0].message.content.strip()
@@ -1,7 +1,12 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
-from .agent import YouTubeBlogAgent, YouTubeBlogInput
-from .transcript_service import TranscriptError
+from api.sse import sse_response
+from jobs import job_queue
+
+from .agent import YouTubeBlogAgent, YouTubeBlogBatchInput, YouTubeBlogInput
+from .transcript_service import TranscriptError, extract_video_id
 
 router = APIRouter(tags=["YouTube Blog"])
 
@@ -21,3 +26,55 @@ def generate_youtube_blog(input_data: YouTubeBlogInput):
         raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:  # pragma: no cover - surfacing runtime issues
         raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.post("/youtube-blog/stream")
+async def stream_youtube_blog(input_data: YouTubeBlogInput):
+    """
+    Same pipeline as /youtube-blog, streamed as Server-Sent Events (node, token, result).
+    """
+    try:
+        extract_video_id(str(input_data.youtube_url))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return sse_response(agent.astream(input_data), lambda result: result)
+
+
+@router.post("/youtube-blog/batch")
+async def stream_youtube_blog_batch(input_data: YouTubeBlogBatchInput):
+    """
+    Generate one blog post per video for a list of URLs and/or a playlist, streamed as
+    Server-Sent Events: a `video` event per video as it completes, then a `result` summary.
+    """
+    try:
+        video_ids = await asyncio.to_thread(agent.resolve_batch, input_data)
+    except TranscriptError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return sse_response(agent.abatch(input_data, video_ids), lambda summary: summary)
+
+
+async def run_youtube_blog_job(payload: dict, thread_id: str) -> dict:
+    """Background-job runner for the YouTube-to-blog pipeline (see jobs.router)."""
+    input_data = YouTubeBlogInput(**payload)
+    return await asyncio.to_thread(agent.invoke, input_data)
+
+
+async def run_youtube_blog_batch_job(payload: dict, thread_id: str) -> dict:
+    """Background-job runner for batch ingestion; collects every per-video result."""
+    input_data = YouTubeBlogBatchInput(**payload)
+    video_ids = await asyncio.to_thread(agent.resolve_batch, input_data)
+    videos = []
+    async for event in agent.abatch(input_data, video_ids):
+        if event["event"] == "video":
+            videos.append(event["data"])
+        else:
+            summary = event["data"]
+    return {**summary, "results": sorted(videos, key=lambda video: video["index"])}
+
+
+job_queue.register("youtube-blog", run_youtube_blog_job)
+job_queue.register("youtube-blog-batch", run_youtube_blog_batch_job)
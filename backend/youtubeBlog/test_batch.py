@@ -0,0 +1,101 @@
+# test_batch.py
+# Batch / playlist ingestion streams one event per video with bounded fetch parallelism.
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from main import app
+from youtubeBlog import agent as agent_module
+from youtubeBlog import router as router_module
+from youtubeBlog.transcript_service import TranscriptError
+
+VIDEO_IDS = ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "ddddddddddd", "eeeeeeeeeee"]
+
+
+class StubLLM:
+    async def achat(self, messages, **kwargs):
+        await asyncio.sleep(0.01)
+        return "# Post"
+
+    async def acomplete(self, prompt, **kwargs):
+        return "Summary"
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    state = {"active": 0, "peak": 0, "calls": []}
+    lock = threading.Lock()
+
+    def fetch(video_url):
+        video_id = video_url[-11:]
+        with lock:
+            state["calls"].append(video_id)
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        if video_id == "ccccccccccc":
+            raise TranscriptError("Transcripts are disabled for this video.")
+        return video_id, {"title": video_id}, [{"text": "hello", "start": 0.0, "duration": 1.0}]
+
+    monkeypatch.setattr(agent_module, "fetch_metadata_and_transcript", fetch)
+    monkeypatch.setattr(agent_module, "BATCH_FETCH_CONCURRENCY", 2)
+    monkeypatch.setattr(agent_module, "resolve_playlist_video_ids", lambda url, limit: VIDEO_IDS[2:])
+    monkeypatch.setattr(router_module.agent, "llm", StubLLM())
+    return state
+
+
+def _post(path, payload):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=payload)
+
+    return asyncio.run(send())
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_batch_streams_a_result_per_video(fetches):
+    payload = {
+        "youtube_urls": [f"https://youtu.be/{VIDEO_IDS[0]}", f"https://www.youtube.com/watch?v={VIDEO_IDS[1]}"],
+        "playlist_url": "https://www.youtube.com/playlist?list=PL123",
+        "prompt": "Key lessons",
+    }
+
+    response = _post("/youtube-blog/batch", payload)
+    events = _events(response.text)
+
+    videos = [data for event, data in events if event == "video"]
+    assert sorted(video["video_id"] for video in videos) == VIDEO_IDS
+    failed = [video for video in videos if video["status"] == "error"]
+    assert [video["video_id"] for video in failed] == ["ccccccccccc"]
+    assert all(video["result"]["blog_post"] == "# Post" for video in videos if video["status"] == "success")
+    assert events[-1] == ("result", {"status": "success", "videos": 5, "succeeded": 4, "failed": 1})
+    assert fetches["peak"] <= 2
+
+
+def test_batch_rejects_invalid_input(fetches):
+    assert _post("/youtube-blog/batch", {"prompt": "x"}).status_code == 422
+    response = _post("/youtube-blog/batch", {"youtube_urls": ["https://example.com/video"], "prompt": "x"})
+    assert response.status_code == 400
+    assert fetches["calls"] == []
+
+
+def test_duplicate_urls_are_fetched_once(fetches):
+    url = f"https://youtu.be/{VIDEO_IDS[0]}"
+    response = _post("/youtube-blog/batch", {"youtube_urls": [url, url], "prompt": "x", "max_videos": 3})
+
+    assert [event for event, _ in _events(response.text)] == ["video", "result"]
+    assert fetches["calls"] == [VIDEO_IDS[0]]
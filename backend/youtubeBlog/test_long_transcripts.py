@@ -0,0 +1,93 @@
+# test_long_transcripts.py
+# Map-reduce condensation of long transcripts in YouTubeBlogAgent (LLM stubbed).
+import asyncio
+
+from youtubeBlog import agent as agent_module
+from youtubeBlog.agent import YouTubeBlogAgent
+from youtubeBlog.transcript_service import split_transcript_windows, transcript_to_text
+
+
+def make_segments(count, words_per_segment=20):
+    return [
+        {"text": f"segment {i} " + "word " * words_per_segment, "start": i * 5.0, "duration": 5.0}
+        for i in range(count)
+    ]
+
+
+class StubLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def complete(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return f"- note {len(self.prompts)}"
+
+    async def acomplete(self, prompt, **kwargs):
+        await asyncio.sleep(0)
+        return self.complete(prompt, **kwargs)
+
+
+def test_windows_break_between_segments_and_keep_timestamps():
+    segments = make_segments(50)
+    windows = split_transcript_windows(segments, max_chars=1000)
+
+    assert len(windows) > 1
+    assert all(len(window["text"]) <= 1000 for window in windows)
+    assert " ".join(window["text"] for window in windows).split() == transcript_to_text(
+        segments, max_chars=0
+    ).split()
+    assert windows[0]["start"] == 0.0
+    assert windows[-1]["end"] == 250.0
+
+
+def test_windows_past_the_cap_are_merged_into_the_last():
+    segments = make_segments(50)
+    uncapped = split_transcript_windows(segments, max_chars=1000)
+    windows = split_transcript_windows(segments, max_chars=1000, max_windows=3)
+
+    assert len(uncapped) > 3 and len(windows) == 3
+    assert windows[:2] == uncapped[:2]
+    assert windows[2]["start"] == uncapped[2]["start"] and windows[2]["end"] == 250.0
+
+
+def test_short_transcript_is_passed_through_unchanged():
+    segments = make_segments(10)
+    agent = YouTubeBlogAgent()
+    agent.llm = StubLLM()
+
+    assert agent._condense_transcript(segments) == transcript_to_text(segments)
+    assert agent.llm.prompts == []
+
+
+def test_long_transcript_is_condensed_per_window(monkeypatch):
+    monkeypatch.setattr(agent_module, "TRANSCRIPT_WINDOW_CHARS", 1000)
+    segments = make_segments(100)
+    agent = YouTubeBlogAgent()
+    agent.llm = StubLLM()
+
+    notes = agent._condense_transcript(segments)
+    windows = agent._transcript_windows(segments)
+
+    assert len(agent.llm.prompts) == len(windows) > 1
+    assert notes.startswith(f"Condensed notes from {len(windows)} timestamped sections")
+    assert "[00:00-" in notes
+    # every segment reached the fast model, nothing was truncated away
+    assert all(f"segment {i} " in "".join(agent.llm.prompts) for i in range(100))
+
+    async_notes = asyncio.run(agent._acondense_transcript(segments))
+    assert async_notes.count("\n[") == notes.count("\n[")
+
+
+def test_window_count_is_capped(monkeypatch):
+    monkeypatch.setattr(agent_module, "TRANSCRIPT_WINDOW_CHARS", 500)
+    monkeypatch.setattr(agent_module, "TRANSCRIPT_MAX_WINDOWS", 4)
+    agent = YouTubeBlogAgent()
+
+    segments = make_segments(200)
+    windows = agent._transcript_windows(segments)
+
+    assert len(windows) == agent_module.TRANSCRIPT_MAX_WINDOWS
+    assert " ".join(window["text"] for window in windows).split() == transcript_to_text(
+        segments, max_chars=0
+    ).split()
+    assert windows[-1]["end"] == 1000.0
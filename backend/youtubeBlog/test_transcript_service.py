@@ -0,0 +1,114 @@
+# test_transcript_service.py
+# Concurrent metadata + transcript retrieval sharing a single yt_dlp extraction (network stubbed).
+import threading
+import time
+
+import pytest
+
+from youtubeBlog import transcript_service
+from youtubeBlog.transcript_store import TranscriptStore
+
+VIDEO_ID = "dQw4w9WgXcQ"
+VIDEO_URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+VTT = """WEBVTT
+
+00:00:00.000 --> 00:00:02.500
+never gonna give you up
+"""
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    store = TranscriptStore(str(tmp_path))
+    monkeypatch.setattr(transcript_service, "transcript_store", store)
+    return store
+
+
+class FakeYoutubeDL:
+    calls = 0
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        FakeYoutubeDL.calls += 1
+        time.sleep(0.05)
+        return {
+            "title": "Song",
+            "duration": 213,
+            "description": "Classic",
+            "uploader": "Rick",
+            "automatic_captions": {"en": [{"url": "https://captions.example/en.vtt"}]},
+        }
+
+
+class FakeResponse:
+    encoding = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        yield VTT
+
+
+def test_caption_fallback_reuses_metadata_extraction(monkeypatch):
+    FakeYoutubeDL.calls = 0
+    monkeypatch.setattr(transcript_service.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.setattr(transcript_service.requests, "get", lambda url, timeout, stream: FakeResponse())
+
+    def transcripts_unavailable(video_id):
+        raise RuntimeError("transcript API blocked")
+
+    monkeypatch.setattr(
+        transcript_service.YouTubeTranscriptApi, "list_transcripts", transcripts_unavailable
+    )
+
+    video_id, metadata, segments = transcript_service.fetch_metadata_and_transcript(VIDEO_URL)
+
+    assert video_id == VIDEO_ID
+    assert metadata["title"] == "Song"
+    assert segments[0]["text"] == "never gonna give you up"
+    assert FakeYoutubeDL.calls == 1
+
+
+def test_metadata_and_transcript_run_concurrently(monkeypatch):
+    barrier = threading.Barrier(2, timeout=2)
+
+    def metadata(video_url, video_info=None):
+        barrier.wait()  # only passes if the transcript fetch is in flight too
+        return {"title": "Song"}
+
+    def transcript(video_id, video_info=None):
+        barrier.wait()
+        return [{"text": "hi", "start": 0.0, "duration": 1.0}]
+
+    monkeypatch.setattr(transcript_service, "get_video_metadata", metadata)
+    monkeypatch.setattr(transcript_service, "fetch_transcript", transcript)
+
+    _, meta, segments = transcript_service.fetch_metadata_and_transcript(VIDEO_URL)
+    assert meta == {"title": "Song"}
+    assert segments[0]["text"] == "hi"
+
+
+def test_extraction_errors_surface_as_transcript_error(monkeypatch):
+    class BrokenYoutubeDL(FakeYoutubeDL):
+        def extract_info(self, url, download=False):
+            raise RuntimeError("video unavailable")
+
+    monkeypatch.setattr(transcript_service.yt_dlp, "YoutubeDL", BrokenYoutubeDL)
+
+    with pytest.raises(transcript_service.TranscriptError, match="metadata"):
+        transcript_service.get_video_metadata(VIDEO_URL)
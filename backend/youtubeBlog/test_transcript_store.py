@@ -0,0 +1,98 @@
+# test_transcript_store.py
+# On-disk transcript / metadata store and its use in transcript_service (network stubbed).
+import os
+import time
+
+import pytest
+
+from youtubeBlog import transcript_service
+from youtubeBlog.transcript_store import TranscriptStore
+
+VIDEO_ID = "dQw4w9WgXcQ"
+SEGMENTS = [
+    {"text": "never gonna give you up", "start": 0.0, "duration": 2.5},
+    {"text": "never gonna let you down", "start": 2.5, "duration": 2.0},
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = TranscriptStore(str(tmp_path))
+    monkeypatch.setattr(transcript_service, "transcript_store", store)
+    return store
+
+
+def test_round_trip_is_compressed(store):
+    store.put_transcript(VIDEO_ID, SEGMENTS * 200)
+    store.put_metadata(VIDEO_ID, {"title": "Song"})
+
+    assert store.get_transcript(VIDEO_ID) == SEGMENTS * 200
+    assert store.get_metadata(VIDEO_ID) == {"title": "Song"}
+    raw_size = len(str(SEGMENTS * 200))
+    assert store.size() < raw_size / 10
+
+
+def test_read_survives_concurrent_eviction(store, monkeypatch):
+    store.put_transcript(VIDEO_ID, SEGMENTS)
+
+    def evicted(path, *args):
+        raise FileNotFoundError(path)
+
+    # The file is unlinked between the read and the recency update
+    monkeypatch.setattr(os, "utime", evicted)
+
+    assert store.get_transcript(VIDEO_ID) == SEGMENTS
+
+
+def test_entries_expire_after_ttl(store):
+    store.put_transcript(VIDEO_ID, SEGMENTS)
+    store.ttl = 0
+    time.sleep(0.01)
+
+    assert store.get_transcript(VIDEO_ID) is None
+    assert not list(store.root.glob("*.json.gz"))
+
+
+def test_least_recently_used_entries_are_evicted(store, monkeypatch):
+    # Same creation time for every entry, so equal segments compress to equal sizes
+    now = time.time()
+    monkeypatch.setattr("youtubeBlog.transcript_store.time.time", lambda: now)
+    store.put_transcript("aaaaaaaaaaa", SEGMENTS)
+    store.put_transcript("bbbbbbbbbbb", SEGMENTS)
+    os.utime(store._path("aaaaaaaaaaa", "transcript"), (now - 60, now - 60))
+    # Room for exactly the two entries written so far
+    store.max_bytes = sum(
+        store._path(video_id, "transcript").stat().st_size for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb")
+    )
+
+    store.put_transcript("ccccccccccc", SEGMENTS)
+
+    assert store.get_transcript("aaaaaaaaaaa") is None
+    assert store.get_transcript("bbbbbbbbbbb") == SEGMENTS
+    assert store.get_transcript("ccccccccccc") == SEGMENTS
+
+
+def test_service_checks_store_before_network(store, monkeypatch):
+    downloads = []
+
+    def download(video_id, video_info=None):
+        downloads.append(video_id)
+        return SEGMENTS
+
+    monkeypatch.setattr(transcript_service, "_download_transcript", download)
+
+    assert transcript_service.fetch_transcript(VIDEO_ID) == SEGMENTS
+    assert transcript_service.fetch_transcript(VIDEO_ID) == SEGMENTS
+    assert downloads == [VIDEO_ID]
+
+
+def test_cached_metadata_skips_yt_dlp(store, monkeypatch):
+    store.put_metadata(VIDEO_ID, {"title": "Song", "channel": "Rick"})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("yt_dlp must not be called on a cache hit")
+
+    monkeypatch.setattr(transcript_service.yt_dlp, "YoutubeDL", fail)
+
+    metadata = transcript_service.get_video_metadata(f"https://www.youtube.com/watch?v={VIDEO_ID}")
+    assert metadata == {"title": "Song", "channel": "Rick"}
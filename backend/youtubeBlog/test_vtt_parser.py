@@ -0,0 +1,111 @@
+# test_vtt_parser.py
+# Streaming WebVTT parser: tag stripping, rolling-duplicate collapse, chunked input, and a
+# benchmark on a generated multi-megabyte YouTube auto-caption file.
+import time
+
+from youtubeBlog.transcript_service import _iter_response_lines, _parse_vtt, iter_vtt_segments
+
+# Shape of a YouTube auto-caption file: each cue repeats the previous line and
+# adds the next one with word-level <c> timing tags, followed by a 10ms cue.
+AUTO_CAPTIONS = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.030 --> 00:00:02.070 align:start position:0%
+ 
+we're<00:00:00.480><c> no</c><00:00:00.810><c> strangers</c>
+
+00:00:02.070 --> 00:00:02.080 align:start position:0%
+we're no strangers
+ 
+
+00:00:02.080 --> 00:00:04.500 align:start position:0%
+we're no strangers
+to<00:00:02.600><c> love</c><00:00:03.000><c> &amp;</c><00:00:03.200><c> rules</c>
+
+00:00:04.500 --> 00:00:04.510 align:start position:0%
+to love &amp; rules
+ 
+"""
+
+
+class ChunkedResponse:
+    def __init__(self, text, size):
+        self.chunks = [text[i : i + size] for i in range(0, len(text), size)]
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        yield from self.chunks
+
+
+def test_rolling_duplicates_and_tags_are_removed():
+    segments = _parse_vtt(AUTO_CAPTIONS)
+
+    assert [s["text"] for s in segments] == ["we're no strangers", "to love & rules"]
+    assert segments[0]["start"] == 0.03
+    assert segments[1]["start"] == 2.08
+    assert round(segments[1]["duration"], 2) == 2.42
+
+
+def test_plain_cues_with_identifiers_and_short_timestamps():
+    vtt = "WEBVTT\n\n1\n00:01.000 --> 00:02.500\nHello there.\nSecond line.\n\n2\n01:00:00.000 --> 01:00:01.000\nBye.\n"
+
+    segments = _parse_vtt(vtt)
+
+    assert segments == [
+        {"text": "Hello there. Second line.", "start": 1.0, "duration": 1.5},
+        {"text": "Bye.", "start": 3600.0, "duration": 1.0},
+    ]
+
+
+def test_chunk_boundaries_do_not_change_the_result():
+    crlf = AUTO_CAPTIONS.replace("\n", "\r\n")
+    expected = _parse_vtt(AUTO_CAPTIONS)
+
+    for size in (1, 7, 64, len(crlf)):
+        lines = _iter_response_lines(ChunkedResponse(crlf, size))
+        assert list(iter_vtt_segments(lines)) == expected
+
+
+def _big_auto_caption_file(target_bytes):
+    words = "the quick brown fox jumps over the lazy dog while we keep talking".split()
+    parts = ["WEBVTT\nKind: captions\nLanguage: en\n\n"]
+    size, t, previous, i = 0, 0.0, "", 0
+    while size < target_bytes:
+        line_words = [words[(i + k) % len(words)] + str(i) for k in range(6)]
+        tagged = line_words[0] + "".join(
+            f"<{_ts(t + 0.3 * k)}><c> {w}</c>" for k, w in enumerate(line_words[1:], 1)
+        )
+        plain = " ".join(line_words)
+        block = (
+            f"{_ts(t)} --> {_ts(t + 2)} align:start position:0%\n{previous}\n{tagged}\n\n"
+            f"{_ts(t + 2)} --> {_ts(t + 2.01)} align:start position:0%\n{plain}\n \n\n"
+        )
+        parts.append(block)
+        size += len(block)
+        previous, t, i = plain, t + 2.01, i + 1
+    return "".join(parts), i
+
+
+def _ts(seconds):
+    minutes, sec = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{sec:06.3f}"
+
+
+def test_benchmark_multi_megabyte_file():
+    vtt, spoken_lines = _big_auto_caption_file(4 * 1024 * 1024)
+
+    started = time.perf_counter()
+    segments = list(iter_vtt_segments(_iter_response_lines(ChunkedResponse(vtt, 64 * 1024))))
+    elapsed = time.perf_counter() - started
+
+    text_chars = sum(len(s["text"]) for s in segments)
+    print(
+        f"\nparsed {len(vtt) / 1e6:.1f} MB in {elapsed:.2f}s "
+        f"({len(vtt) / 1e6 / elapsed:.1f} MB/s); {len(segments)} segments, "
+        f"{text_chars / 1e6:.2f} MB of text"
+    )
+    assert len(segments) == spoken_lines  # one segment per spoken line, no rolling repeats
+    assert "<c>" not in segments[-1]["text"]
+    assert text_chars < len(vtt) / 5
+    assert elapsed < 10
@@ -1,5 +1,9 @@
+import html
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
 import yt_dlp
@@ -10,14 +14,56 @@ from youtube_transcript_api import (
     YouTubeTranscriptApi,
 )
 
+from .transcript_store import transcript_store
+
 
 VIDEO_ID_PATTERN = re.compile(r"(?:v=|youtu\.be/)([\w-]{11})")
+VTT_TIMING_PATTERN = re.compile(
+    r"(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s+-->\s+(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+)
+VTT_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+YDL_OPTS = {
+    "quiet": True,
+    "skip_download": True,
+    "no_warnings": True,
+    "subtitleslangs": ["en", "en-US", "en-GB"],
+    "subtitlesformat": "vtt",
+}
 
 
 class TranscriptError(RuntimeError):
     """Custom error raised when a transcript cannot be produced."""
 
 
+class SharedVideoInfo:
+    """
+    Runs yt_dlp `extract_info` for a video at most once and shares the result,
+    so metadata and the caption fallback never extract the same video twice.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, video_url: str) -> None:
+        self.video_url = video_url
+        self.extractions = 0
+        self._lock = threading.Lock()
+        self._info: Optional[Dict[str, Any]] = None
+        self._error: Optional[Exception] = None
+
+    def get(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._info is None and self._error is None:
+                self.extractions += 1
+                try:
+                    with yt_dlp.YoutubeDL(YDL_OPTS) as ydl:
+                        self._info = ydl.extract_info(self.video_url, download=False)
+                except Exception as exc:
+                    self._error = exc
+            if self._error is not None:
+                raise self._error
+            return self._info
+
+
 def extract_video_id(youtube_url: str) -> str:
     """Extract the canonical 11-character video id from supported URLs."""
     match = VIDEO_ID_PATTERN.search(youtube_url)
@@ -26,27 +72,97 @@ def extract_video_id(youtube_url: str) -> str:
     return match.group(1)
 
 
-def get_video_metadata(video_url: str) -> Dict[str, Any]:
-    """Fetch lightweight metadata (title, duration, description) via yt_dlp."""
+def fetch_metadata_and_transcript(
+    video_url: str,
+) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Fetch metadata and transcript concurrently, sharing one yt_dlp extraction
+    between them. Returns (video_id, metadata, transcript_segments).
+    """
+    video_id = extract_video_id(video_url)
+    video_info = SharedVideoInfo(f"https://www.youtube.com/watch?v={video_id}")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        metadata_future = pool.submit(get_video_metadata, video_url, video_info)
+        transcript_future = pool.submit(fetch_transcript, video_id, video_info)
+        metadata = metadata_future.result()
+        segments = transcript_future.result()
+    return video_id, metadata, segments
+
+
+def resolve_playlist_video_ids(playlist_url: str, limit: int) -> List[str]:
+    """List the video ids of a playlist (or channel) without extracting each video."""
     ydl_opts = {
         "quiet": True,
         "skip_download": True,
         "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "playlistend": limit,
     }
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
-            return {
-                "title": info.get("title"),
-                "duration": info.get("duration"),
-                "description": info.get("description"),
-                "channel": info.get("uploader"),
-            }
+            info = ydl.extract_info(playlist_url, download=False)
+    except Exception as exc:  # pragma: no cover - surfaced to API
+        raise TranscriptError(f"Unable to resolve playlist: {exc}") from exc
+
+    video_ids: List[str] = []
+    for entry in info.get("entries") or []:
+        video_id = (entry or {}).get("id")
+        if video_id and VIDEO_ID_PATTERN.fullmatch(f"v={video_id}") and video_id not in video_ids:
+            video_ids.append(video_id)
+    if not video_ids:
+        raise TranscriptError("No videos found in playlist.")
+    return video_ids[:limit]
+
+
+def get_video_metadata(
+    video_url: str, video_info: Optional[SharedVideoInfo] = None
+) -> Dict[str, Any]:
+    """Fetch lightweight metadata (title, duration, description) via yt_dlp, cached per video id."""
+    try:
+        video_id: Optional[str] = extract_video_id(video_url)
+    except ValueError:
+        video_id = None
+    if video_id:
+        cached = transcript_store.get_metadata(video_id)
+        if cached is not None:
+            return cached
+
+    video_info = video_info or SharedVideoInfo(video_url)
+    try:
+        info = video_info.get()
+        metadata = {
+            "title": info.get("title"),
+            "duration": info.get("duration"),
+            "description": info.get("description"),
+            "channel": info.get("uploader"),
+        }
     except Exception as exc:  # pragma: no cover - surfaced to API
         raise TranscriptError(f"Unable to fetch video metadata: {exc}") from exc
 
+    if video_id:
+        transcript_store.put_metadata(video_id, metadata)
+    return metadata
+
+
+def fetch_transcript(
+    video_id: str, video_info: Optional[SharedVideoInfo] = None
+) -> List[Dict[str, Any]]:
+    """
+    Return the English transcript for a video, from the on-disk store when
+    available, otherwise from YouTube (see `_download_transcript`).
+    """
+    cached = transcript_store.get_transcript(video_id)
+    if cached is not None:
+        return cached
+
+    segments = _download_transcript(video_id, video_info)
+    transcript_store.put_transcript(video_id, segments)
+    return segments
+
 
-def fetch_transcript(video_id: str) -> List[Dict[str, Any]]:
+def _download_transcript(
+    video_id: str, video_info: Optional[SharedVideoInfo] = None
+) -> List[Dict[str, Any]]:
     """
     Attempt to fetch an English transcript.
     Falls back to automatic captions/translation when needed.
@@ -79,7 +195,7 @@ def fetch_transcript(video_id: str) -> List[Dict[str, Any]]:
         raise TranscriptError("Transcript is not translatable to English.") from exc
     except Exception as exc:  # pragma: no cover - surfaced to API
         try:
-            fallback = fetch_transcript_via_ytdlp(video_id)
+            fallback = fetch_transcript_via_ytdlp(video_id, video_info)
             if fallback:
                 return fallback
         except TranscriptError:
@@ -95,19 +211,58 @@ def transcript_to_text(transcript: List[Dict[str, Any]], max_chars: int = 12000)
     return combined
 
 
-def fetch_transcript_via_ytdlp(video_id: str) -> List[Dict[str, Any]]:
+def split_transcript_windows(
+    transcript: List[Dict[str, Any]], max_chars: int, max_windows: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Group consecutive segments into windows of at most ~`max_chars` characters,
+    breaking only between segments. Each window keeps its start/end time. With
+    `max_windows`, any windows past the cap are merged into the last one.
+    """
+    windows: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    size = 0
+    start = end = 0.0
+    for segment in transcript:
+        text = (segment.get("text") or "").strip()
+        if not text:
+            continue
+        if texts and size + len(text) + 1 > max_chars:
+            windows.append({"start": start, "end": end, "text": " ".join(texts)})
+            texts, size = [], 0
+        if not texts:
+            start = float(segment.get("start", 0.0))
+        texts.append(text)
+        size += len(text) + 1
+        end = float(segment.get("start", 0.0)) + float(segment.get("duration", 0.0))
+    if texts:
+        windows.append({"start": start, "end": end, "text": " ".join(texts)})
+    if max_windows > 0 and len(windows) > max_windows:
+        tail = windows[max_windows - 1 :]
+        windows = windows[: max_windows - 1] + [
+            {
+                "start": tail[0]["start"],
+                "end": tail[-1]["end"],
+                "text": " ".join(window["text"] for window in tail),
+            }
+        ]
+    return windows
+
+
+def format_timestamp(seconds: float) -> str:
+    """Render seconds as `h:mm:ss` (or `mm:ss` under an hour)."""
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{sec:02d}" if hours else f"{minutes:02d}:{sec:02d}"
+
+
+def fetch_transcript_via_ytdlp(
+    video_id: str, video_info: Optional[SharedVideoInfo] = None
+) -> List[Dict[str, Any]]:
     """Fallback mechanism that downloads auto captions via yt_dlp when the transcript API fails."""
-    video_url = f"https://www.youtube.com/watch?v={video_id}"
-    ydl_opts = {
-        "quiet": True,
-        "skip_download": True,
-        "no_warnings": True,
-        "subtitleslangs": ["en", "en-US", "en-GB"],
-        "subtitlesformat": "vtt",
-    }
+    video_info = video_info or SharedVideoInfo(f"https://www.youtube.com/watch?v={video_id}")
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
+        info = video_info.get()
     except Exception as exc:
         raise TranscriptError(f"yt-dlp could not fetch captions: {exc}") from exc
 
@@ -120,12 +275,13 @@ def fetch_transcript_via_ytdlp(video_id: str) -> List[Dict[str, Any]]:
         raise TranscriptError("yt-dlp did not return a usable caption URL.")
 
     try:
-        response = requests.get(subtitle_entry["url"], timeout=10)
-        response.raise_for_status()
+        with requests.get(subtitle_entry["url"], timeout=10, stream=True) as response:
+            response.raise_for_status()
+            response.encoding = "utf-8"  # WebVTT is always UTF-8
+            segments = list(iter_vtt_segments(_iter_response_lines(response)))
     except requests.RequestException as exc:
         raise TranscriptError(f"Unable to download caption file: {exc}") from exc
 
-    segments = _parse_vtt(response.text)
     if not segments:
         raise TranscriptError("Unable to parse captions returned by yt-dlp.")
     return segments
@@ -145,56 +301,67 @@ def _select_caption_entry(captions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
 
 def _parse_vtt(vtt_text: str) -> List[Dict[str, Any]]:
-    """Simplistic WebVTT parser that returns segments with start/duration/text."""
-    def parse_timestamp(timestamp: str) -> float:
-        hours, minutes, seconds = timestamp.split(":")
-        sec, _, fraction = seconds.partition(".")
-        total = int(hours) * 3600 + int(minutes) * 60 + int(sec)
-        if fraction:
-            total += float(f"0.{fraction}")
-        return total
-
-    segments: List[Dict[str, Any]] = []
-    start_time = 0.0
-    end_time = 0.0
-    buffer: List[str] = []
-
-    for raw_line in vtt_text.splitlines():
+    """Parse a complete WebVTT document (see `iter_vtt_segments`)."""
+    return list(iter_vtt_segments(vtt_text.splitlines()))
+
+
+def iter_vtt_segments(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Incremental WebVTT parser yielding segments with start/duration/text.
+
+    Inline timing/styling tags (`<00:00:01.000>`, `<c>`) are stripped and the
+    rolling-window lines YouTube auto-captions repeat from the previous cue
+    are dropped, so each spoken line appears once.
+    """
+    previous: List[str] = []
+    cue: Optional[Tuple[float, float, List[str]]] = None
+
+    def finish(cue: Tuple[float, float, List[str]]) -> Optional[Dict[str, Any]]:
+        nonlocal previous
+        start, end, cue_lines = cue
+        if not cue_lines:
+            return None
+        fresh = [line for line in cue_lines if line not in previous]
+        previous = cue_lines
+        if not fresh:
+            return None
+        return {"text": " ".join(fresh), "start": start, "duration": max(0.0, end - start)}
+
+    for raw_line in chain(lines, [""]):
         line = raw_line.strip()
-        if not line:
-            if buffer:
-                text = " ".join(buffer).strip()
-                if text:
-                    segments.append(
-                        {
-                            "text": text,
-                            "start": start_time,
-                            "duration": max(0.0, end_time - start_time),
-                        }
-                    )
-                buffer = []
+        match = VTT_TIMING_PATTERN.match(line)
+        if match:
+            segment = finish(cue) if cue else None
+            if segment:
+                yield segment
+            cue = (_vtt_seconds(*match.group(1, 2, 3, 4)), _vtt_seconds(*match.group(5, 6, 7, 8)), [])
             continue
-
-        if line.startswith("WEBVTT") or line.isdigit():
+        if cue is None:
+            continue  # header, NOTE/STYLE blocks and cue identifiers
+        if not raw_line.strip("\r\n"):
+            # Only a truly empty line ends a cue; YouTube pads cues with " " lines
+            segment = finish(cue)
+            if segment:
+                yield segment
+            cue = None
             continue
+        text = html.unescape(VTT_TAG_PATTERN.sub("", line)).strip()
+        if text:
+            cue[2].append(text)
 
-        if "-->" in line:
-            timestamps = line.split("-->")
-            if len(timestamps) == 2:
-                start_time = parse_timestamp(timestamps[0].strip())
-                end_time = parse_timestamp(timestamps[1].split(" ")[0].strip())
-            continue
 
-        buffer.append(line)
+def _vtt_seconds(hours: Optional[str], minutes: str, seconds: str, millis: str) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
 
-    if buffer:
-        text = " ".join(buffer).strip()
-        if text:
-            segments.append(
-                {
-                    "text": text,
-                    "start": start_time,
-                    "duration": max(0.0, end_time - start_time),
-                }
-            )
-    return segments
+
+def _iter_response_lines(response: requests.Response, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Split a streamed text response into lines without buffering the whole body."""
+    pending = ""
+    for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+        pending += chunk
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    if pending:
+        yield pending.rstrip("\r")
@@ -0,0 +1,119 @@
+import contextlib
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+TRANSCRIPT_CACHE_DIR = os.environ.get(
+    "TRANSCRIPT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".transcript_cache"),
+)
+TRANSCRIPT_CACHE_TTL = float(os.environ.get("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+class TranscriptStore:
+    """
+    On-disk cache of transcripts and video metadata keyed by the 11-character
+    video id. Segments are stored gzip-compressed as compact
+    `[start, duration, text]` rows; entries expire after `ttl` seconds and the
+    least recently used files are evicted once the store exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        root: str = TRANSCRIPT_CACHE_DIR,
+        *,
+        ttl: float = TRANSCRIPT_CACHE_TTL,
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Transcripts
+    # ------------------------------------------------------------------ #
+    def get_transcript(self, video_id: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self._read(self._path(video_id, "transcript"))
+        if entry is None:
+            return None
+        return [
+            {"start": start, "duration": duration, "text": text}
+            for start, duration, text in entry["segments"]
+        ]
+
+    def put_transcript(self, video_id: str, segments: List[Dict[str, Any]]) -> None:
+        rows = [
+            [segment.get("start", 0.0), segment.get("duration", 0.0), segment.get("text", "")]
+            for segment in segments
+        ]
+        self._write(self._path(video_id, "transcript"), {"segments": rows})
+
+    # ------------------------------------------------------------------ #
+    # Metadata
+    # ------------------------------------------------------------------ #
+    def get_metadata(self, video_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._read(self._path(video_id, "metadata"))
+        return entry["metadata"] if entry else None
+
+    def put_metadata(self, video_id: str, metadata: Dict[str, Any]) -> None:
+        self._write(self._path(video_id, "metadata"), {"metadata": metadata})
+
+    def invalidate(self, video_id: str) -> None:
+        for kind in ("transcript", "metadata"):
+            self._path(video_id, kind).unlink(missing_ok=True)
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.root.glob("*.json.gz"))
+
+    # ------------------------------------------------------------------ #
+    # File handling
+    # ------------------------------------------------------------------ #
+    def _path(self, video_id: str, kind: str) -> Path:
+        return self.root / f"{video_id}.{kind}.json.gz"
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError, EOFError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        # Mark as recently used for eviction; a concurrent eviction may have removed it already
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        entry = {"created": time.time(), **entry}
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+                json.dump(entry, handle, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the store fits in `max_bytes`."""
+        files = []
+        for path in self.root.glob("*.json.gz"):
+            with contextlib.suppress(OSError):  # expired entries are unlinked by readers
+                files.append((path, path.stat()))
+        total = sum(stat.st_size for _, stat in files)
+        for path, stat in sorted(files, key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+# Global instance used by transcript_service
+transcript_store = TranscriptStore()